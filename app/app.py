@@ -4,19 +4,43 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import io
+import logging
 import os
-import re
-from io import BytesIO
-from datetime import datetime, date
+import threading
+import time
 from typing import Optional
 from collections import OrderedDict
-from openpyxl import load_workbook, Workbook
-from openpyxl.styles import PatternFill, Font, Alignment
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.datavalidation import DataValidation
-from pandas.io.formats.style import Styler
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import processing.kpi
+import processing.shopee
+from processing.artifacts import artifact_stats
+from processing.daily_store import (
+    DAILY_STORE_PATH, file_digest, daily_store_clear, daily_store_find_hash, daily_store_fingerprint,
+    daily_store_generation, daily_store_index, daily_store_product_totals, daily_store_put, daily_store_remove,
+    daily_store_totals,
+)
+from processing.kpi import META_CPAS_RULES, META_WA_RULES, kpi_styler
+from processing.jobs import (
+    ACTIVE, find_job, init_job_worker, job_file, job_key, job_result, job_status, owner_jobs, start_job_runner,
+    submit_job, wake_runner,
+)
+from processing.meta import format_cell_for_preview, read_cpas_report, read_wa_report, report_filename
+from processing.pool import WORKER_MAIN_SPEC, process_pool
+from processing.profiling import (
+    PROFILE_LOGGER, new_trace, profile_session, profile_stage, profile_table, profiled, reset_in_worker,
+)
+from processing.shopee import SHOPEE_ADS_MODES, clean_shopee_link, read_analitik_file
+from processing.tiktok_fixer import read_fixer_workbook, roi_columns
+from processing.tiktok_daily import (
+    build_daily_aggregate, daily_compare_filename, daily_numeric_metrics,
+    ingest_daily_files, sort_daily_results, style_daily_aggregate,
+)
+
+# Worker process pool (forkserver/spawn) mengimpor modul __main__ induknya, dan di Streamlit itu skrip ini:
+# diarahkan ke modul entry worker yang kecil supaya app.py tidak dijalankan ulang di tiap worker (processing/pool.py)
+__spec__ = WORKER_MAIN_SPEC
 
 # Set global page config once
 st.set_page_config(page_title="Multi-Platform Excel Utilities", layout="wide")
@@ -45,6 +69,264 @@ def navbar():
             st.button(p, key=f"nav_{i}", on_click=set_page, args=(p,))
     st.markdown("---")
 
+# -----------------------------
+# CACHE STREAMLIT UNTUK PAKET processing
+# -----------------------------
+# Pengolahan data ada di paket processing (tanpa Streamlit, juga dipakai CLI: python -m processing).
+# Di sini fungsi yang mahal hanya dibungkus cache Streamlit, karena skrip ini dieksekusi ulang setiap rerun.
+
+# Matriks CSS dihitung sekali per data; preview Styler & Excel memakai hasil yang sama
+kpi_style_matrix = st.cache_data(show_spinner=False, max_entries=32)(processing.kpi.kpi_style_matrix)
+load_uploaded_csv_bytes = st.cache_data(processing.shopee.load_uploaded_csv_bytes)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def daily_store_summaries(path: str, generation: int, start=None, end=None):
+    # (total per tanggal, total per produk per tanggal); generation membuat cache basi saat store berubah
+    return daily_store_totals(start, end, path=path), daily_store_product_totals(start, end, path=path)
+
+INGEST_WORKERS = min(4, len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1)
+
+@st.cache_resource
+def ingest_pool() -> ProcessPoolExecutor:
+    # Parsing file upload (CPU-bound) di proses terpisah; worker dibuat lewat forkserver, bukan fork dari server
+    return process_pool(INGEST_WORKERS, initializer=reset_in_worker)
+
+def _parse_uploads(files: list) -> list:
+    # Dengan satu CPU pool hanya menambah biaya kirim data; pool yang rusak (worker mati) dibuat ulang sekali
+    if INGEST_WORKERS < 2: return ingest_daily_files(files)
+    try:
+        return ingest_daily_files(files, executor=ingest_pool())
+    except BrokenExecutor:
+        ingest_pool.clear()
+        return ingest_daily_files(files, executor=ingest_pool())
+
+# Hasil parse per isi file (digest) dipakai ulang lintas rerun & sesi; LRU dibatasi jumlah file & ukuran frame.
+# Hasil gagal ikut disimpan supaya file rusak tidak diparse ulang.
+INGEST_CACHE_MAX_FILES = 128
+INGEST_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+@st.cache_resource
+def _ingest_cache() -> dict:
+    return {"entries": OrderedDict(), "bytes": 0, "hits": 0, "misses": 0, "lock": threading.Lock()}
+
+def _frame_nbytes(df) -> int:
+    return int(df.memory_usage(deep=True).sum()) if df is not None else 0
+
+@profiled("parse")
+def ingest_uploads(files: list) -> list:
+    """Parse file harian [(nama, bytes, digest), ...]; isi yang sudah pernah diparse diambil dari cache.
+
+    Return hasil ingest_daily_files + "digest", diurutkan menurut tanggal laporan (gagal di akhir).
+    Frame hasil cache dipakai bersama, jadi jangan diubah in-place.
+    """
+    cache = _ingest_cache()
+    entries = cache["entries"]
+    results, missing = [None] * len(files), []
+    with cache["lock"]:
+        for i, (name, _, digest) in enumerate(files):
+            entry = entries.get(digest)
+            if entry is None:
+                missing.append(i)
+                continue
+            entries.move_to_end(digest)
+            results[i] = {**entry["result"], "name": name, "digest": digest}
+        cache["hits"] += len(files) - len(missing)
+        cache["misses"] += len(missing)
+
+    if missing:
+        parsed = _parse_uploads([files[i][:2] for i in missing])
+        with cache["lock"]:
+            for result in parsed:
+                i = missing[result["index"]]
+                digest = files[i][2]
+                results[i] = {**result, "digest": digest}
+                nbytes = _frame_nbytes(result["df"])
+                if digest in entries or nbytes > INGEST_CACHE_MAX_BYTES: continue
+                entries[digest] = {"result": {k: result[k] for k in ("date", "df", "error")}, "nbytes": nbytes}
+                cache["bytes"] += nbytes
+                while len(entries) > INGEST_CACHE_MAX_FILES or cache["bytes"] > INGEST_CACHE_MAX_BYTES:
+                    cache["bytes"] -= entries.popitem(last=False)[1]["nbytes"]
+    return sort_daily_results(results)
+
+def ingest_cache_stats():
+    # Isi & hit rate cache hasil parse upload (untuk memantau batas INGEST_CACHE_*)
+    cache = _ingest_cache()
+    with cache["lock"]:
+        lookups = cache["hits"] + cache["misses"]
+        return {
+            "files": len(cache["entries"]), "bytes": cache["bytes"], "hits": cache["hits"], "misses": cache["misses"],
+            "hit_rate": cache["hits"] / lookups if lookups else 0.0,
+        }
+
+# -----------------------------
+# ANTRIAN JOB (export berat)
+# -----------------------------
+# Export yang mahal dikerjakan worker lewat antrian SQLite (processing/jobs.py): tombol/upload hanya
+# mengajukan job dengan kunci jenis + sidik jari input + nama file hasil + opsi, jadi rerun atau perubahan
+# widget tidak mengulang pekerjaan, dan hasilnya tetap bisa diunduh lintas rerun. Hasil yang sama dari sesi
+# lain diambil dari cache hasil (processing/artifacts.py). Job terakhir per panel disimpan di
+# session_state["jobs"]; pemilik job = id sesi Streamlit, dipakai dispatcher untuk membagi worker.
+
+JOB_WORKERS = INGEST_WORKERS
+
+def _job_pool() -> ProcessPoolExecutor:
+    # Dibuat dispatcher saat job pertama diambil; seperti ingest_pool, worker lewat forkserver (processing/pool.py)
+    return process_pool(JOB_WORKERS, initializer=init_job_worker)
+
+@st.cache_resource
+def job_runner() -> dict:
+    return start_job_runner(_job_pool, JOB_WORKERS)
+
+def session_owner() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else ""
+
+def upload_digest(uploaded) -> str:
+    # sha256 isi upload, dihitung sekali per file_id (file besar tidak di-hash ulang setiap rerun)
+    digests = st.session_state.setdefault("upload_digests", {})
+    if uploaded.file_id not in digests: digests[uploaded.file_id] = file_digest(uploaded.getvalue())
+    return digests[uploaded.file_id]
+
+def queue_job(panel: str, kind: str, key: str, *args) -> str:
+    """Ajukan job (job antre/berjalan dengan kunci sama dipakai ulang) dan ingat sebagai job terakhir panel."""
+    profile = None
+    if debug_enabled(): profile = "memory" if st.session_state.get("debug_profile_memory") else "time"
+    job_id = submit_job(kind, args, key=key, owner=session_owner(), label=panel, profile=profile)
+    wake_runner(job_runner())
+    st.session_state.setdefault("jobs", {})[panel] = (key, job_id)
+    return job_id
+
+def panel_job(panel: str, key: str) -> Optional[str]:
+    # Job terakhir panel untuk kunci ini; kalau belum ada, job sama yang sedang jalan / selesai milik sesi ini.
+    # Job gagal dipakai hanya sampai error-nya tampil sekali (job_outcome), job selesai hanya selama hasilnya
+    # masih ada; setelah itu None -> diajukan ulang.
+    stored = st.session_state.get("jobs", {}).get(panel)
+    job = job_status(stored[1]) if stored is not None and stored[0] == key else None
+    if job is not None:
+        if job["status"] == "failed" and stored[1] not in st.session_state.get("jobs_reported", set()): return stored[1]
+        if job["status"] in ACTIVE or job["has_result"]: return stored[1]
+    job_id = find_job(key, session_owner())
+    if job_id is not None: st.session_state.setdefault("jobs", {})[panel] = (key, job_id)
+    return job_id
+
+@st.fragment(run_every=1)
+def _job_progress(job_id: str):
+    # Hanya fragment ini yang di-refresh selama job antre/berjalan; selesai -> rerun penuh sekali
+    job = job_status(job_id)
+    if job is None or job["status"] not in ACTIVE: st.rerun()
+    if job["status"] == "queued":
+        st.progress(0.0, text=f"Menunggu antrian (posisi {job['position']})...")
+    else:
+        done, total = job["done"], job["total"]
+        st.progress(done / total if total else 0.0, text=f"Memproses... {done}/{total}" if total > 1 else "Memproses...")
+
+def job_outcome(job_id: str, error_text: str = "{}") -> Optional[dict]:
+    """Hasil job yang selesai (lihat job_result); selama antre/berjalan hanya progress, gagal -> st.error. None jika belum ada hasil."""
+    job = job_status(job_id)
+    if job is None: return None
+    if job["status"] in ACTIVE:
+        _job_progress(job_id)
+        return None
+    result = job_result(job_id) if job["status"] == "done" else None
+    if job["status"] == "done" and result is None:
+        # Folder job sudah terhapus (purge) -> tidak ada hasil; panel_job berikutnya mengajukan ulang
+        st.warning("Hasil proses sebelumnya sudah tidak tersedia, silakan proses ulang.")
+        return None
+    error = job["error"] if result is None else result["error"]
+    if error:
+        st.error(error_text.format(error))
+        if job["status"] == "failed": st.session_state.setdefault("jobs_reported", set()).add(job_id)
+        return None
+    if result.get("cached"): st.caption("⚡ Hasil diambil dari cache (upload & opsi sama sudah pernah diproses).")
+    return result
+
+def job_download(label: str, job_id: str, name: str, result: dict, **kwargs):
+    # Tombol unduh file hasil job (kunci dari result["files"]); file yang sudah terhapus -> peringatan
+    data = job_file(job_id, name)
+    if data is None:
+        st.warning(f"File {result['files'][name]} sudah tidak tersedia, silakan proses ulang.")
+        return
+    st.download_button(label, data, result["files"][name], **kwargs)
+
+JOB_STATUS_TEXT = {"queued": "⏳ antre", "running": "⚙️ berjalan", "done": "✅ selesai", "failed": "❌ gagal"}
+
+def sidebar_jobs():
+    # Ringkasan job terbaru sesi ini; hasilnya diunduh di tab masing-masing
+    jobs = owner_jobs(session_owner(), limit=5)
+    if not jobs: return
+    active = sum(job["status"] in ACTIVE for job in jobs)
+    with st.sidebar.expander(f"📦 Job latar ({active} aktif)" if active else "📦 Job latar"):
+        for job in jobs:
+            progress = f" {job['done']}/{job['total']}" if job["status"] == "running" and job["total"] > 1 else ""
+            st.caption(f"{job['label']} · {JOB_STATUS_TEXT.get(job['status'], job['status'])}{progress}")
+        cache = artifact_stats()
+        st.caption(
+            f"Cache hasil: {cache['entries']} entri, {cache['bytes'] / 2**20:.1f}/{cache['max_bytes'] / 2**20:.0f} MiB"
+            f" · hit rate {cache['hit_rate']:.0%} ({cache['hits']} hit, {cache['misses']} miss)"
+        )
+
+# -----------------------------
+# MODE DEBUG: PROFIL TAHAP
+# -----------------------------
+# Toggle di sidebar (default dari env APP_PROFILE=1, atau APP_PROFILE=memory untuk sekalian mengukur
+# puncak memori) merekam waktu, CPU, memori & jumlah baris per tahap (processing/profiling.py) lalu
+# menampilkannya di expander tiap tab, plus satu baris JSON per tahap di log server. Rekaman disimpan
+# per panel di session_state: blok dalam satu rerun digabung, rerun yang mengolah ulang menggantinya.
+# Mode mati = tidak ada yang direkam.
+
+APP_PROFILE = os.environ.get("APP_PROFILE", "").strip().lower()
+
+@st.cache_resource
+def _profile_log_handler() -> logging.Handler:
+    # Dipasang sekali per proses; logger processing.profile hanya menulis selama ada sesi profil
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    PROFILE_LOGGER.addHandler(handler)
+    PROFILE_LOGGER.setLevel(logging.INFO)
+    return handler
+
+def debug_enabled() -> bool:
+    return bool(st.session_state.get("debug_profile"))
+
+@contextmanager
+def debug_profile(panel: str):
+    # Rekam tahap yang berjalan di blok ini untuk panel `panel` (no-op jika mode debug mati)
+    if not debug_enabled():
+        yield
+        return
+    _profile_log_handler()
+    traces = st.session_state.setdefault("debug_traces", {})
+    run = st.session_state.get("debug_run")
+    entry = traces.get(panel)
+    if entry is None or entry["run"] != run:
+        entry = {"run": run, "trace": new_trace(panel, memory=bool(st.session_state.get("debug_profile_memory")))}
+    try:
+        with profile_session(panel, memory=entry["trace"]["memory"], trace=entry["trace"]):
+            yield
+    finally:
+        # Rerun yang tidak mengolah apa-apa (mis. semua dari cache) tidak menghapus rekaman sebelumnya
+        if entry["trace"]["spans"]: traces[panel] = entry
+
+def _show_trace(trace: dict, note: str):
+    peak = f" · puncak memori {trace['peak_mb']:.1f} MiB" if trace["peak_mb"] is not None else ""
+    st.caption(f"Total {trace['wall_s'] * 1000:.0f} ms (CPU {trace['cpu_s'] * 1000:.0f} ms){peak} · {note}")
+    st.dataframe(profile_table(trace), hide_index=True, use_container_width=True)
+
+def debug_panel(panel: str):
+    # Rekaman di sesi ini + rekaman job latar terakhir panel (job diajukan saat mode debug aktif)
+    if not debug_enabled(): return
+    entry = st.session_state.get("debug_traces", {}).get(panel)
+    stored = st.session_state.get("jobs", {}).get(panel)
+    job_trace = (job_result(stored[1]) or {}).get("profile") if stored is not None else None
+    with st.expander("🔧 Debug: waktu & memori per tahap"):
+        if entry is None and job_trace is None:
+            st.caption("Belum ada tahap yang terekam (belum diproses, atau hasil diambil dari cache).")
+            return
+        if entry is not None:
+            _show_trace(entry["trace"], "rerun ini" if entry["run"] == st.session_state.get("debug_run") else "rerun sebelumnya")
+        if job_trace is not None:
+            _show_trace(job_trace, f"job latar {job_trace['label']} (worker)")
+
 # -----------------------------
 # APP 1: Shopee & CPAS (original code wrapped into function)
 # -----------------------------
@@ -87,281 +369,6 @@ def app_shopee_cpas():
             pass
         return uploaded_file.read()
 
-    def to_excel_bytes_from_sheets(sheets: dict) -> bytes:
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            for sheet_name, df in sheets.items():
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-                
-                if "Ringkasan" in sheet_name:
-                    try:
-                        ws = writer.sheets[sheet_name]
-                        for col_idx in range(1, len(df.columns) + 1):
-                            col_letter = get_column_letter(col_idx)
-                            ws.column_dimensions[col_letter].width = 40
-                            cell = ws.cell(row=2, column=col_idx)
-                            cell.alignment = Alignment(wrap_text=True, vertical="top")
-                    except Exception:
-                        pass
-                        
-        output.seek(0)
-        return output.getvalue()
-
-    def swap_dot_comma_df(df: pd.DataFrame) -> pd.DataFrame:
-        def swap_cell(x):
-            if isinstance(x, str):
-                return x.replace('.', 'DOT').replace(',', '.').replace('DOT', ',')
-            return x
-        if hasattr(df, 'map'):
-            return df.map(swap_cell)
-        return df.applymap(swap_cell)
-
-    @st.cache_data
-    def load_uploaded_csv_bytes(file_bytes: bytes) -> pd.DataFrame:
-        if file_bytes is None:
-            raise ValueError("No file bytes provided")
-        raw = file_bytes.decode("utf-8", errors="ignore")
-        lines = raw.splitlines()
-
-        HEADER_KEYS = ["Nama Iklan", "Nama Iklan/Produk"]
-        header_idx = None
-        for i, line in enumerate(lines[:30]):
-            if any(k in line for k in HEADER_KEYS):
-                header_idx = i
-                break
-        if header_idx is None:
-            raise ValueError("Header Nama Iklan tidak ditemukan")
-
-        delimiter = ";" if lines[header_idx].count(";") > lines[header_idx].count(",") else ","
-        clean_csv = "\n".join(lines[header_idx:])
-        df = pd.read_csv(io.StringIO(clean_csv), sep=delimiter, engine="python", on_bad_lines="skip")
-        df.columns = df.columns.str.strip()
-        return df
-
-    def normalize_nama_iklan_column(df: pd.DataFrame) -> pd.DataFrame:
-        for col in ["Nama Iklan", "Nama Iklan/Produk"]:
-            if col in df.columns:
-                return df.rename(columns={col: "Nama Iklan"})
-        raise ValueError("Kolom Nama Iklan tidak ditemukan")
-
-    def short_nama_iklan(nama, max_words=2):
-        if pd.isna(nama): return nama
-        text = str(nama).strip()
-        if text.lower().startswith("grup"): return text.split(" - ")[0]
-        text = re.sub(r"\[.*?\]", "", text).strip()
-
-        feature_blacklist = {"gamis", "busui","friendly","bahan","soft","ultimate","ultimates","motif","size","ukuran","promo","diskon","broad","testing","rayon","katun","cotton","silk","sustra","viscose","linen","polyester","jersey","crepe","chiffon","woolpeach","baloteli","babyterry","pink","hitam","black","putih","white","navy","biru","blue","merah","red","hijau","green","coklat","brown","abu","abu-abu","grey","gray","cream","krem","beige","maroon","ungu","purple","tosca","olive","sage", "sale", "couple"}
-        store_blacklist = {"official","shop","store","boutique","fashion","my","zahir","myzahir","by","original","premium"}
-        context_blacklist = {"terbaru","new","update","launch","launching","viral","hits","best","seller","bestseller","kondangan","ramadhan","ramadan","harian","pesta","formal","casual","trend","trending","populer","2024","2025","2026","2027", "2028", "2029", "2030"}
-        all_blacklists = feature_blacklist | store_blacklist | context_blacklist
-        product_keywords = {"dress", "set", "reject", "lebaran", "tunik", "abaya", "blouse", "khimar", "rok", "pashmina", "hijab", "outer"}
-
-        parts = re.split(r"\s*[-|,/]\s*", text)
-        candidates = []
-        for part in parts:
-            words = part.split()
-            valid_words = []
-            for w in words:
-                wl_clean = re.sub(r'[^a-z0-9]', '', w.lower())
-                if wl_clean in all_blacklists or not wl_clean: continue
-                valid_words.append(w)
-            if valid_words: candidates.append(valid_words)
-
-        best_candidate = []
-        for cand in candidates:
-            if len(cand) >= 2 and any(re.sub(r'[^a-z0-9]', '', w.lower()) in product_keywords for w in cand):
-                best_candidate = cand
-
-        if not best_candidate:
-            for cand in candidates:
-                if any(re.sub(r'[^a-z0-9]', '', w.lower()) in product_keywords for w in cand):
-                    best_candidate = cand
-                    break
-        if not best_candidate:
-            for cand in candidates:
-                if len(cand) >= 2:
-                    best_candidate = cand
-                    break
-        if not best_candidate and candidates: best_candidate = candidates[0]
-        if not best_candidate: best_candidate = text.split()
-
-        if len(best_candidate) > max_words:
-            kw_idx = -1
-            for i, w in enumerate(best_candidate):
-                if re.sub(r'[^a-z0-9]', '', w.lower()) in product_keywords:
-                    kw_idx = i
-                    break
-            if kw_idx != -1:
-                start_idx = max(0, kw_idx - max_words + 1)
-                if start_idx + max_words > len(best_candidate):
-                    start_idx = max(0, len(best_candidate) - max_words)
-                best_candidate = best_candidate[start_idx : start_idx + max_words]
-            else:
-                best_candidate = best_candidate[:max_words]
-
-        return " ".join(best_candidate).title()
-
-    def highlight_row(row):
-        styles = [''] * len(row)
-        roas = row.get('Efektifitas Iklan')
-        sales = row.get('Produk Terjual')
-        gmv = row.get('Penjualan Langsung (GMV Langsung)')
-        cost = row.get('Biaya')
-
-        if pd.isna(sales) or pd.isna(cost): return styles
-        if (cost == 0) and (sales > 0): return ['color: #006400'] * len(row)
-        if sales == 0 and cost >= 10000: return ['color: #FF0000'] * len(row)
-        if sales == 0 and cost < 10000: return styles
-
-        if pd.notna(roas):
-            try:
-                if roas < 8: styles = ['background-color: red'] * len(row)
-                elif roas < 10: styles = ['background-color: yellow'] * len(row)
-                else: styles = ['background-color: lightgreen'] * len(row)
-            except Exception: pass
-
-        try: nama_idx = row.index.get_loc('Nama Iklan')
-        except Exception: nama_idx = None
-        try: gmv_idx = row.index.get_loc('Penjualan Langsung (GMV Langsung)')
-        except Exception: gmv_idx = None
-
-        if sales > 0 and (pd.isna(gmv) or gmv == 0):
-            if nama_idx is not None: styles[nama_idx] = 'background-color: lightblue'
-            if gmv_idx is not None: styles[gmv_idx] = 'background-color: lightblue'
-        return styles
-
-    def get_iklan_color(row, csv_mode):
-        roas = row.get('Efektifitas Iklan')
-        sales = row.get('Produk Terjual')
-        cost = row.get('Biaya')
-
-        if pd.isna(sales) or pd.isna(cost): return None
-        if (cost == 0) and (sales > 0): return None
-        if sales == 0 and cost >= 10000: return None
-        if sales == 0 and cost < 10000: return None
-
-        if csv_mode == "CSV Grup Iklan (hanya iklan produk)":
-            if pd.isna(roas): return "HIJAU" if sales > 0 else None
-
-        if pd.isna(roas) or roas < 8: return "MERAH"
-        elif roas < 10: return "KUNING"
-        else: return "HIJAU"
-
-    def normalize_cols(df):
-        return df.rename(columns=lambda c: re.sub(r"\s+", " ", str(c).strip()))
-
-    def drop_kode_variasi_cols(df):
-        cols_to_drop = [c for c in df.columns if c.strip().lower() == "kode variasi"]
-        return df.drop(columns=cols_to_drop, errors="ignore")
-
-    def extract_variation_base(name):
-        if pd.isna(name): return ""
-        s = str(name).strip()
-        if s == "" or s == "-": return ""
-        if "," in s:
-            parts = s.rsplit(",", 1)
-            base = parts[0].strip()
-        else:
-            base = s
-        return base
-
-    def clean_idr_number(x):
-        if isinstance(x, str):
-            x = x.strip()
-            if not x or x == '-': return 0.0
-            x = x.replace('%', '')
-            if ',' in x: x = x.replace('.', '').replace(',', '.')
-            else: x = x.replace('.', '')
-            return x
-        return x
-
-    def safe_div(a, b):
-        try:
-            a, b = float(a), float(b)
-            return 0.0 if b == 0 else a / b
-        except Exception: return 0.0
-
-    def format_percentage(val):
-        return f"{val * 100:.2f}%".replace('.', ',')
-
-    def to_excel_bytes_with_styling(df, product_merge_col="Kode Produk", highlight_condition=None):
-        buf = io.BytesIO()
-        df.to_excel(buf, index=False, sheet_name="Sheet1")
-        buf.seek(0)
-        wb = load_workbook(buf)
-        ws = wb.active
-
-        header = [cell.value for cell in next(ws.iter_rows(min_row=1, max_row=1))]
-        prod_col_idx = header.index(product_merge_col) + 1 if product_merge_col in header else None
-
-        idr_col_indices = []
-        for i, col_name in enumerate(header):
-            if col_name and "IDR" in str(col_name).upper():
-                idr_col_indices.append(i + 1) 
-
-        yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-        total_dropdown_fill = PatternFill(start_color="BDE2F5", end_color="BDE2F5", fill_type="solid")
-        var_dropdown_fill = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid") 
-        grand_total_fill = PatternFill(start_color="D9EAD3", end_color="D9EAD3", fill_type="solid") 
-        bold_font = Font(bold=True)
-
-        last_col_idx = ws.max_column
-        last_col_letter = get_column_letter(last_col_idx)
-
-        dv = DataValidation(type="list", formula1='"Total,~"', allow_blank=True)
-        ws.add_data_validation(dv)
-        
-        if ws.max_row > 2:
-            dv.add(f"{last_col_letter}2:{last_col_letter}{ws.max_row - 1}")
-
-        if prod_col_idx:
-            start = 2
-            while start <= ws.max_row:
-                current = ws.cell(row=start, column=prod_col_idx).value
-                if current == "Total": break
-                end = start
-                while end + 1 <= ws.max_row and ws.cell(row=end + 1, column=prod_col_idx).value == current:
-                    end += 1
-                if current is not None and start < end:
-                    rng = get_column_letter(prod_col_idx) + str(start) + ":" + get_column_letter(prod_col_idx) + str(end)
-                    ws.merge_cells(rng)
-                start = end + 1
-
-        if highlight_condition is not None:
-            for i, row in df.iterrows():
-                excel_row = i + 2
-                
-                if row.get("Kode Produk", "") == "Total":
-                    for col in range(1, last_col_idx + 1):
-                        cell = ws.cell(row=excel_row, column=col)
-                        cell.fill = grand_total_fill
-                        cell.font = bold_font
-                    continue 
-
-                is_total = False
-                try: is_total = highlight_condition(row)
-                except Exception: pass
-
-                if is_total:
-                    for col in range(1, last_col_idx): ws.cell(row=excel_row, column=col).fill = yellow_fill
-                    ws.cell(row=excel_row, column=last_col_idx).fill = total_dropdown_fill
-                else:
-                    ws.cell(row=excel_row, column=last_col_idx).fill = var_dropdown_fill
-
-        rupiah_format = '_-"Rp"* #,##0_-;-"Rp"* #,##0_-;_-"Rp"* "-"_-;_-@_-'
-        for col_idx in idr_col_indices:
-            col_letter = get_column_letter(col_idx)
-            ws.column_dimensions[col_letter].width = 20 
-            for r in range(2, ws.max_row + 1):
-                cell = ws.cell(row=r, column=col_idx)
-                if isinstance(cell.value, (int, float)):
-                    cell.number_format = rupiah_format
-
-        out = io.BytesIO()
-        wb.save(out)
-        out.seek(0)
-        return out
-
     # =========================================================================
     # NAVIGATION VIA TABS (MENGGANTIKAN SIDEBAR)
     # =========================================================================
@@ -386,104 +393,32 @@ def app_shopee_cpas():
 
         uploaded = st.file_uploader("📂 Upload file Excel (.xlsx/.xls)", type=["xlsx", "xls"], key="gabung_uploader_shopee")
         if uploaded:
-            data = read_uploaded_bytes(uploaded)
             base_name = uploaded.name.rsplit(".", 1)[0]
-            
-            try:
-                xls = pd.ExcelFile(BytesIO(data))
-
-                # TAHAP 1
-                sheets_convert = {}
-                for sheet_name in xls.sheet_names:
-                    df_c = pd.read_excel(xls, sheet_name=sheet_name, dtype=str)
-                    df_c = swap_dot_comma_df(df_c)
-                    sheets_convert[sheet_name] = df_c
-                excel_bytes_convert = to_excel_bytes_from_sheets(sheets_convert)
-
-                # TAHAP 2
-                target_sheet_sort = "Performa Produk" if "Performa Produk" in xls.sheet_names else xls.sheet_names[0]
-                df_raw_sort = pd.read_excel(xls, sheet_name=target_sheet_sort)
-                req_sort = ["Channel", "Kode Produk"]
-                missing_sort = [c for c in req_sort if c not in df_raw_sort.columns]
-                
-                df_sorted = pd.DataFrame()
-                if not missing_sort:
-                    df_sorted = df_raw_sort.sort_values(by=["Channel", "Kode Produk"], ascending=[True, True])
-                else:
-                    st.warning(f"⚠️ Kolom Sort tidak lengkap {missing_sort} di sheet '{target_sheet_sort}'. Menggunakan data tanpa sort.")
-                    df_sorted = df_raw_sort.copy()
-
-                # TAHAP 3
-                df_terjual = pd.DataFrame()
-                df_atc = pd.DataFrame()
-                req_filter = ["Channel", "Produk", "Produk.1", "Produk Ditambahkan ke Keranjang"]
-                missing_filter = [c for c in req_filter if c not in df_sorted.columns]
-                
-                if not missing_filter:
-                    df_filter = df_sorted.copy()
-                    df_filter["Produk.1"] = pd.to_numeric(df_filter["Produk.1"], errors="coerce").fillna(0)
-                    df_filter["Produk Ditambahkan ke Keranjang"] = pd.to_numeric(df_filter["Produk Ditambahkan ke Keranjang"], errors="coerce").fillna(0)
-
-                    df_terjual = df_filter[df_filter["Produk.1"] > 0][["Channel", "Produk"]].drop_duplicates().sort_values(by=["Channel", "Produk"]).reset_index(drop=True)
-                    df_atc = df_filter[df_filter["Produk Ditambahkan ke Keranjang"] > 0][["Channel", "Produk"]].drop_duplicates().sort_values(by=["Channel", "Produk"]).reset_index(drop=True)
-
-                    def generate_ringkasan(df_source):
-                        res = {"Sales": [], "Traffic": [], "Instagram": []}
-                        if not df_source.empty:
-                            for _, r in df_source.iterrows():
-                                ch = str(r["Channel"]).lower()
-                                prod_short = short_nama_iklan(r["Produk"], max_words=2)
-                                if "sales" in ch: res["Sales"].append(prod_short)
-                                elif "traffic" in ch: res["Traffic"].append(prod_short)
-                                elif "ig" in ch or "instagram" in ch: res["Instagram"].append(prod_short)
-                                else: res["Sales"].append(prod_short)
-                                    
-                        final_dict = {}
-                        for k in ["Sales", "Traffic", "Instagram"]:
-                            unique_items = list(dict.fromkeys(res[k]))
-                            if unique_items:
-                                final_dict[k] = " ".join([f"{n}," for n in unique_items])
-                            else:
-                                final_dict[k] = ""
-                        return pd.DataFrame([final_dict])
-
-                    df_ringkasan_terjual = generate_ringkasan(df_terjual)
-                    df_ringkasan_atc = generate_ringkasan(df_atc)
-                else:
-                    st.warning(f"⚠️ Kolom Filter tidak lengkap {missing_filter}. Tahap Filter dilewati.")
-
-                # SUSUN EXCEL 2
-                sheets_sort_filter = {"1_Data_Sorted": df_sorted}
-                if not df_terjual.empty: sheets_sort_filter["2_Produk_Terjual"] = df_terjual
-                if not df_atc.empty: sheets_sort_filter["3_Nama_Produk_ATC"] = df_atc
-                if not df_ringkasan_terjual.empty: sheets_sort_filter["4_Ringkasan_Terjual"] = df_ringkasan_terjual
-                if not df_ringkasan_atc.empty: sheets_sort_filter["5_Ringkasan_ATC"] = df_ringkasan_atc
-                
-                excel_bytes_sort_filter = to_excel_bytes_from_sheets(sheets_sort_filter)
+            key = job_key("shopee-out", upload_digest(uploaded), base_name)
+            job_id = panel_job("shopee_out", key) or queue_job("shopee_out", "shopee-out", key, read_uploaded_bytes(uploaded), base_name)
+
+            result = job_outcome(job_id, "❌ Terjadi error: {}")
+            if result is not None:
+                for warning in result["warnings"]: st.warning(warning)
 
                 # UI DOWNLOAD
                 st.success("✅ Seluruh proses selesai! Silakan unduh file hasilnya di bawah ini:")
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.download_button(
-                        label="⬇️ Download Excel 1 (Dot/Comma)",
-                        data=excel_bytes_convert,
-                        file_name=f"{base_name}_converted.xlsx",
+                    job_download(
+                        "⬇️ Download Excel 1 (Dot/Comma)", job_id, "converted", result,
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     )
                 with col2:
-                    st.download_button(
-                        label="⬇️ Download Excel 2 (Sort & Filter)",
-                        data=excel_bytes_sort_filter,
-                        file_name=f"{base_name}_filtered.xlsx",
+                    job_download(
+                        "⬇️ Download Excel 2 (Sort & Filter)", job_id, "filtered", result,
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     )
                 
                 st.subheader("Preview File 2 - Sorted Data (10 Baris Pertama)")
-                st.dataframe(df_sorted.head(10), use_container_width=True)
+                st.dataframe(result["previews"]["sorted"], use_container_width=True)
 
-            except Exception as e:
-                st.error(f"❌ Terjadi error: {e}")
+            debug_panel("shopee_out")
 
 
     # =========================================================================
@@ -501,198 +436,22 @@ def app_shopee_cpas():
             base_name = uploaded.name.rsplit(".", 1)[0]
             
             try:
-                if uploaded.name.lower().endswith((".xlsx", ".xls")): df_raw = pd.read_excel(uploaded, dtype=object)
-                else: df_raw = pd.read_csv(uploaded, dtype=object)
+                with debug_profile("shopee_analitik"):
+                    df_raw = read_analitik_file(uploaded.getvalue(), uploaded.name)
             except Exception as e:
                 st.error(f"Gagal membaca file: {e}")
                 st.stop()
 
-            df_raw = normalize_cols(df_raw)
-
             st.subheader("Preview (data asli, beberapa baris)")
             st.dataframe(df_raw.head(200))
 
+            key = job_key("shopee-analitik", upload_digest(uploaded), base_name)
             if st.button("Process", key="process_variasi_shopee"):
-                
-                # Membungkus logika utama agar bisa dipanggil 2 kali (untuk Warna & Ukuran)
-                def process_dataframe(df_input, mode="warna"):
-                    df = df_input.copy()
-                    df = drop_kode_variasi_cols(df)
-
-                    numeric_cols_guess = [
-                        "Pengunjung Produk (Kunjungan)", "Halaman Produk Dilihat", "Pengunjung Melihat Tanpa Membeli",
-                        "Klik Pencarian", "Suka", "Pengunjung Produk (Menambahkan Produk ke Keranjang)",
-                        "Dimasukkan ke Keranjang (Produk)", "Total Pembeli (Pesanan Dibuat)", "Produk (Pesanan Dibuat)",
-                        "Total Penjualan (Pesanan Dibuat) (IDR)", "Total Pembeli (Pesanan Siap Dikirim)",
-                        "Produk (Pesanan Siap Dikirim)", "Penjualan (Pesanan Siap Dikirim) (IDR)"
-                    ]
-                    rate_cols_config = {
-                        "Tingkat Pengunjung Melihat Tanpa Membeli": ("Pengunjung Melihat Tanpa Membeli", "Pengunjung Produk (Kunjungan)"),
-                        "Tingkat Konversi Produk Dimasukkan ke Keranjang": ("Pengunjung Produk (Menambahkan Produk ke Keranjang)", "Pengunjung Produk (Kunjungan)"),
-                        "Tingkat Konversi (Pesanan yang Dibuat)": ("Total Pembeli (Pesanan Dibuat)", "Pengunjung Produk (Kunjungan)"),
-                        "Tingkat Konversi (Pesanan Siap Dikirim)": ("Total Pembeli (Pesanan Siap Dikirim)", "Pengunjung Produk (Kunjungan)"),
-                        "Tingkat Konversi (Pesanan Siap Dikirim dibagi Pesanan Dibuat)": ("Total Pembeli (Pesanan Siap Dikirim)", "Total Pembeli (Pesanan Dibuat)")
-                    }
-
-                    if "Kode Produk" not in df.columns or "Nama Variasi" not in df.columns:
-                        return None, None, None, "File harus berisi kolom 'Kode Produk' dan 'Nama Variasi'."
-
-                    df["__NamaVariasiRaw"] = df["Nama Variasi"].astype(object)
-                    
-                    # --- LOGIKA PENENTU PENGELOMPOKAN ---
-                    if mode == "warna":
-                        df["NamaVariasiBase"] = df["Nama Variasi"].apply(extract_variation_base)
-                    elif mode == "ukuran":
-                        # Ekstrak ukuran (mengambil string setelah koma atau strip)
-                        def extract_size(val):
-                            val_str = str(val)
-                            if "," in val_str: 
-                                return val_str.split(",")[-1].strip()
-                            elif "-" in val_str: 
-                                return val_str.split("-")[-1].strip()
-                            return val_str.strip()
-                        
-                        df["NamaVariasiBase"] = df["Nama Variasi"].apply(extract_size)
-                    # ------------------------------------
-
-                    df["__is_total_row"] = df["NamaVariasiBase"].fillna("").apply(lambda s: True if s == "" else False)
-
-                    product_order = []
-                    seen = set()
-                    for i, r in df.iterrows():
-                        kp = r.get("Kode Produk")
-                        if kp not in seen:
-                            seen.add(kp)
-                            product_order.append(kp)
-
-                    variation_mask = ~df["__is_total_row"]
-                    agg_numeric = {}
-                    for c in df.columns:
-                        if c in numeric_cols_guess:
-                            df[c] = df[c].apply(clean_idr_number)
-                            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
-                            agg_numeric[c] = "sum"
-
-                    other_keep = ["SKU Induk", "Produk"] + list(rate_cols_config.keys())
-                    agg_other = {c: "first" for c in other_keep if c in df.columns}
-
-                    group_cols = ["Kode Produk", "NamaVariasiBase"]
-                    if variation_mask.any():
-                        grouped = df[variation_mask].groupby(group_cols, dropna=False, as_index=False).agg({**agg_numeric, **agg_other})
-                        grouped = grouped.rename(columns={"NamaVariasiBase": "Nama Variasi"})
-                    else:
-                        grouped = pd.DataFrame(columns=["Kode Produk", "Nama Variasi"] + list(agg_numeric.keys()) + list(agg_other.keys()))
-
-                    totals = []
-                    for kp in product_order:
-                        totals_rows = df[(df["Kode Produk"] == kp) & (df["__is_total_row"])]
-                        if not totals_rows.empty:
-                            tot = {"Kode Produk": kp}
-                            for c in df.columns:
-                                if c in other_keep: tot[c] = totals_rows.iloc[0].get(c)
-                            for c in agg_numeric.keys():
-                                tot[c] = totals_rows[c].astype(float).sum()
-                            tot["Nama Variasi"] = ""
-                            totals.append(pd.Series(tot))
-                        else:
-                            gi = grouped[grouped["Kode Produk"] == kp]
-                            if not gi.empty:
-                                tot = {"Kode Produk": kp, "Nama Variasi": ""}
-                                for c in agg_numeric.keys(): tot[c] = gi[c].sum()
-                                for c in other_keep:
-                                    any_row = df[df["Kode Produk"] == kp]
-                                    if not any_row.empty: tot[c] = any_row.iloc[0].get(c)
-                                totals.append(pd.Series(tot))
-                            else:
-                                any_row = df[df["Kode Produk"] == kp]
-                                if not any_row.empty:
-                                    row0 = any_row.iloc[0].copy()
-                                    row0["Nama Variasi"] = ""
-                                    totals.append(row0)
-
-                    totals_df = pd.DataFrame(totals).reset_index(drop=True)
-                    sort_col_induk = "Penjualan (Pesanan Siap Dikirim) (IDR)"
-                    if sort_col_induk in totals_df.columns:
-                        totals_df[sort_col_induk] = pd.to_numeric(totals_df[sort_col_induk], errors="coerce").fillna(0)
-                        totals_df = totals_df.sort_values(by=sort_col_induk, ascending=False)
-                        
-                    product_order = totals_df["Kode Produk"].tolist()
-                    final_rows = []
-                    for kp in product_order:
-                        tot_row = totals_df[totals_df["Kode Produk"] == kp]
-                        if not tot_row.empty:
-                            tot_row = tot_row.iloc[0].to_dict()
-                            final_rows.append(tot_row)
-                        
-                        var_rows = grouped[grouped["Kode Produk"] == kp].copy()
-                        if sort_col_induk in var_rows.columns:
-                            var_rows[sort_col_induk] = pd.to_numeric(var_rows[sort_col_induk], errors="coerce").fillna(0)
-                            var_rows = var_rows.sort_values(by=sort_col_induk, ascending=False)
-                        
-                        for _, vr in var_rows.iterrows():
-                            final_rows.append(vr.to_dict())
-
-                    df_final = pd.DataFrame(final_rows).fillna("")
-
-                    for rate_col, (num_col, den_col) in rate_cols_config.items():
-                        if num_col in df_final.columns and den_col in df_final.columns:
-                            df_final[rate_col] = df_final.apply(lambda r: format_percentage(safe_div(r.get(num_col, 0), r.get(den_col, 0))), axis=1)
-
-                    def highlight_cond(row):
-                        nv = row.get("Nama Variasi", "")
-                        return (nv == "-" or str(nv).strip() == "")
-
-                    df_final["Nama Variasi"] = df_final["Nama Variasi"].replace({"": "-"})
-
-                    final_cols = []
-                    for c in df.columns:
-                        if c == "Nama Variasi": continue 
-                        if c in df_final.columns:
-                            final_cols.append(c)
-                            if c == "Produk": final_cols.append("Nama Variasi")
-                                
-                    if "Nama Variasi" not in final_cols:
-                        if "Kode Produk" in final_cols:
-                            idx = final_cols.index("Kode Produk") + 1
-                            final_cols.insert(idx, "Nama Variasi")
-                        else:
-                            final_cols.insert(0, "Nama Variasi")
-                            
-                    for c in df_final.columns:
-                        if c not in final_cols and not c.startswith("__"): final_cols.append(c)
-
-                    if "Tipe Baris" in final_cols: final_cols.remove("Tipe Baris")
-
-                    df_final["Tipe Baris"] = df_final.apply(lambda r: "Total" if highlight_cond(r) else "~", axis=1)
-                    final_cols.append("Tipe Baris")
-                    df_final = df_final[final_cols]
-
-                    total_rows_only = df_final[df_final["Tipe Baris"] == "Total"]
-                    grand_total_data = {}
-                    for c in final_cols:
-                        if c == "Kode Produk": grand_total_data[c] = "Total"
-                        elif c in numeric_cols_guess: grand_total_data[c] = pd.to_numeric(total_rows_only[c], errors="coerce").fillna(0).sum()
-                        else: grand_total_data[c] = "-"
-                    
-                    df_final = pd.concat([df_final, pd.DataFrame([grand_total_data])], ignore_index=True)
-
-                    excel_b = to_excel_bytes_with_styling(df_final, product_merge_col="Kode Produk", highlight_condition=highlight_cond)
-                    
-                    c_buf = io.BytesIO()
-                    c_buf.write(df_final.to_csv(index=False).encode("utf-8"))
-                    c_buf.seek(0)
-                    
-                    return df_final, excel_b, c_buf, None
-
-                # --- PROSES UNTUK KEDUA MODE ---
-                with st.spinner("Memproses data..."):
-                    df_warna, ex_warna, csv_warna, err_warna = process_dataframe(df_raw, mode="warna")
-                    df_ukuran, ex_ukuran, csv_ukuran, err_ukuran = process_dataframe(df_raw, mode="ukuran")
-
-                if err_warna or err_ukuran:
-                    st.error(err_warna or err_ukuran)
-                    st.stop()
+                queue_job("shopee_analitik", "shopee-analitik", key, df_raw, base_name)
 
+            job_id = panel_job("shopee_analitik", key)
+            result = job_outcome(job_id) if job_id is not None else None
+            if result is not None:
                 # --- MENAMPILKAN HASIL DAN TOMBOL DOWNLOAD ---
                 st.success("Proses Selesai! Silakan pilih format laporan yang ingin diunduh.")
 
@@ -701,18 +460,14 @@ def app_shopee_cpas():
                 with col1:
                     st.subheader("🎨 Berdasarkan Warna/Variasi")
                     with st.expander("Lihat Preview Warna"):
-                        st.dataframe(df_warna.tail(30))
-                    st.download_button(
-                        label="⬇️ Unduh Excel (Berdasarkan Warna)",
-                        data=ex_warna,
-                        file_name=f"{base_name}_Warna.xlsx",
+                        st.dataframe(result["previews"]["warna"])
+                    job_download(
+                        "⬇️ Unduh Excel (Berdasarkan Warna)", job_id, "excel_warna", result,
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         key="dl_excel_warna"
                     )
-                    st.download_button(
-                        label="⬇️ Unduh CSV (Berdasarkan Warna)",
-                        data=csv_warna,
-                        file_name=f"{base_name}_Warna.csv",
+                    job_download(
+                        "⬇️ Unduh CSV (Berdasarkan Warna)", job_id, "csv_warna", result,
                         mime="text/csv",
                         key="dl_csv_warna"
                     )
@@ -720,22 +475,20 @@ def app_shopee_cpas():
                 with col2:
                     st.subheader("📏 Berdasarkan Ukuran (Size)")
                     with st.expander("Lihat Preview Ukuran"):
-                        st.dataframe(df_ukuran.tail(30))
-                    st.download_button(
-                        label="⬇️ Unduh Excel (Berdasarkan Ukuran)",
-                        data=ex_ukuran,
-                        file_name=f"{base_name}_Ukuran.xlsx",
+                        st.dataframe(result["previews"]["ukuran"])
+                    job_download(
+                        "⬇️ Unduh Excel (Berdasarkan Ukuran)", job_id, "excel_ukuran", result,
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         key="dl_excel_ukuran"
                     )
-                    st.download_button(
-                        label="⬇️ Unduh CSV (Berdasarkan Ukuran)",
-                        data=csv_ukuran,
-                        file_name=f"{base_name}_Ukuran.csv",
+                    job_download(
+                        "⬇️ Unduh CSV (Berdasarkan Ukuran)", job_id, "csv_ukuran", result,
                         mime="text/csv",
                         key="dl_csv_ukuran"
                     )
 
+            debug_panel("shopee_analitik")
+
 
     # =========================================================================
     # FITUR 3: CSV IKLAN -> EXCEL BERWARNA
@@ -747,7 +500,7 @@ def app_shopee_cpas():
         st.markdown("##### Pengaturan Filter Laporan")
         csv_mode = st.selectbox(
             "Mode CSV",
-            options=["CSV Keseluruhan (Normal)", "CSV Grup Iklan (hanya iklan produk)"],
+            options=SHOPEE_ADS_MODES,
             index=0,
             key="shopee_csv_mode_main"
         )
@@ -765,175 +518,30 @@ def app_shopee_cpas():
         uploaded_file = st.file_uploader("Upload file CSV iklan Shopee", type=["csv"], key="csviklan_uploader_shopee")
 
         if uploaded_file:
+            include = {"include_merah": include_merah, "include_kuning": include_kuning,
+                       "include_hijau": include_hijau, "include_biru": include_biru}
+            base_name = uploaded_file.name.rsplit('.', 1)[0]
+            key = job_key("shopee-ads", upload_digest(uploaded_file), base_name, csv_mode, include)
             if st.button("🚀 Proses & Download Excel", key="process_csviklan_shopee"):
                 try:
-                    with st.spinner("Memproses data..."):
-                        raw_bytes = read_uploaded_bytes(uploaded_file)
-                        df = load_uploaded_csv_bytes(raw_bytes)
-                        df = normalize_nama_iklan_column(df)
-
-                        df["IS_AGGREGATE"] = df["Nama Iklan"].astype(str).str.lower().str.match(r'^\s*grup\b')
-
-                        for col in ["Efektifitas Iklan", "Produk Terjual", "Penjualan Langsung (GMV Langsung)", "Biaya"]:
-                            if col in df.columns:
-                                df[col] = pd.to_numeric(df[col], errors="coerce")
-
-                        df["IS_HIJAU_TIPE_A"] = (df.get("Biaya").notna() & (df.get("Biaya") == 0) & (df.get("Produk Terjual") > 0))
-                        df["IS_BIRU"] = ((df.get("Produk Terjual", 0) > 0) & (df.get("Penjualan Langsung (GMV Langsung)", 0) == 0))
-                        df["Nama Ringkasan"] = df["Nama Iklan"].where(df["IS_AGGREGATE"], df["Nama Iklan"].apply(short_nama_iklan))
-                        df["Kategori"] = df.apply(lambda row: get_iklan_color(row, csv_mode), axis=1)
-
-                        if csv_mode == "CSV Grup Iklan (hanya iklan produk)":
-                            df_agg = df[df["IS_AGGREGATE"]].copy()
-                            df_non_agg = df[~df["IS_AGGREGATE"]].copy()
-                            df = pd.concat([df_non_agg, df_agg], ignore_index=True)
-
-                            urutan_col = None
-                            for c in df.columns:
-                                if str(c).strip().lower() in ["urutan", "no", "no."]:
-                                    urutan_col = c
-                                    break
-                            
-                            if urutan_col:
-                                new_vals = list(range(1, len(df_non_agg) + 1)) + [""] * len(df_agg)
-                                df[urutan_col] = new_vals
-
-                        if csv_mode == "CSV Grup Iklan (hanya iklan produk)":
-                            df_nonagg = df[~df["IS_AGGREGATE"]].copy()
-                        else:
-                            df_nonagg = df.copy()
-
-                        df_nonagg = df_nonagg[~df_nonagg["IS_HIJAU_TIPE_A"]].copy()
-
-                        ordered_for_numbering = []
-                        for _, row in df_nonagg.iterrows():
-                            kat = row.get("Kategori")
-                            if pd.notna(kat):
-                                ordered_for_numbering.append({"nama": row["Nama Ringkasan"], "kategori": kat})
-                            if row.get("IS_BIRU", False):
-                                ordered_for_numbering.append({"nama": row["Nama Ringkasan"], "kategori": "BIRU"})
-
-                        per_col = {"MERAH": [], "KUNING": [], "HIJAU": [], "BIRU": []}
-                        if csv_mode != "CSV Keseluruhan (Normal)":
-                            for kat in ["MERAH", "KUNING", "HIJAU"]:
-                                names = df_nonagg[df_nonagg["Kategori"] == kat]["Nama Ringkasan"].tolist()
-                                names = list(dict.fromkeys(names)) 
-                                per_col[kat] = [f"{n}," for n in names]
-                            
-                            names_biru = df_nonagg[df_nonagg["IS_BIRU"]]["Nama Ringkasan"].tolist()
-                            names_biru = list(dict.fromkeys(names_biru))
-                            per_col["BIRU"] = [f"{n}," for n in names_biru]
-
-                        tanpa_konversi_df = (
-                            df_nonagg[(df_nonagg.get("Produk Terjual", 0) == 0) & (df_nonagg.get("Biaya", 0) >= 10000)]
-                            [["Nama Ringkasan", "Biaya"]]
-                            .rename(columns={"Nama Ringkasan": "Nama Iklan"})
-                            .sort_values("Biaya", ascending=False)
-                        )
-
-                        hijau_cols = ["Nama Ringkasan", "Produk Terjual", "Efektifitas Iklan", "Biaya"]
-                        available_cols = [c for c in hijau_cols if c in df.columns]
-                        hijau_tipe_a_df = df[(df.get("Biaya").notna()) & (df.get("Biaya") == 0) & (df.get("Produk Terjual", 0) > 0)][available_cols].copy()
-                        if "Nama Ringkasan" in hijau_tipe_a_df.columns:
-                            hijau_tipe_a_df = hijau_tipe_a_df.rename(columns={"Nama Ringkasan": "Nama Iklan"})
-
-                        filtered_per_col = {"MERAH": [], "KUNING": [], "HIJAU": [], "BIRU": []}
-                        if include_merah: filtered_per_col["MERAH"] = per_col["MERAH"]
-                        if include_kuning: filtered_per_col["KUNING"] = per_col["KUNING"]
-                        if include_hijau: filtered_per_col["HIJAU"] = per_col["HIJAU"]
-                        if include_biru: filtered_per_col["BIRU"] = per_col["BIRU"]
-
-                        # EXPORT
-                        buffer = io.BytesIO()
-                        original_name = uploaded_file.name
-                        base_name = original_name.rsplit(".", 1)[0]
-                        filename = f"{base_name}_colored.xlsx"
-
-                        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-                            try:
-                                styled = df.style.apply(highlight_row, axis=1)
-                                styled.to_excel(writer, sheet_name="DATA_IKLAN", index=False)
-                            except Exception:
-                                df.to_excel(writer, sheet_name="DATA_IKLAN", index=False)
-
-                            wb = writer.book
-                            if "RINGKASAN_IKLAN" in wb.sheetnames:
-                                wb.remove(wb["RINGKASAN_IKLAN"])
-                            ws_ring = wb.create_sheet("RINGKASAN_IKLAN")
-
-                            if csv_mode == "CSV Keseluruhan (Normal)":
-                                ws_ring.cell(row=1, column=1, value="DAFTAR IKLAN (URUT)")
-                                ws_ring.cell(row=1, column=1).font = Font(bold=True)
-                                
-                                semua_nama = []
-                                for item in ordered_for_numbering:
-                                    kat = item["kategori"]
-                                    if (kat == "MERAH" and include_merah) or \
-                                       (kat == "KUNING" and include_kuning) or \
-                                       (kat == "HIJAU" and include_hijau) or \
-                                       (kat == "BIRU" and include_biru):
-                                        semua_nama.append(item["nama"])
-                                
-                                semua_nama = list(dict.fromkeys(semua_nama))
-                                
-                                if semua_nama:
-                                    text_gabungan = "\n".join([f"{i+1}. {nama}" for i, nama in enumerate(semua_nama)])
-                                    cell = ws_ring.cell(row=2, column=1, value=text_gabungan)
-                                    cell.alignment = Alignment(wrap_text=True, vertical="top")
-                                    cell.font = Font(color="000000")
-                                
-                                ws_ring.column_dimensions["A"].width = 60
-                                
-                            else:
-                                headers = ["MERAH", "KUNING", "HIJAU", "BIRU"]
-                                color_map = {"MERAH": "FF0000", "KUNING": "000000", "HIJAU": "00AA00", "BIRU": "0066CC"}
-
-                                for c_idx, h in enumerate(headers, start=1):
-                                    cell = ws_ring.cell(row=1, column=c_idx, value=h)
-                                    cell.font = Font(bold=True)
-
-                                for c_idx, key in enumerate(headers, start=1):
-                                    items = filtered_per_col.get(key, [])
-                                    if items:
-                                        joined = " ".join(items)
-                                        if not joined.strip().endswith(","): joined = joined + ","
-                                        cell = ws_ring.cell(row=2, column=c_idx, value=joined)
-                                        cell.font = Font(color=color_map[key])
-                                        cell.alignment = Alignment(wrap_text=True, vertical="top")
-                                    else:
-                                        ws_ring.cell(row=2, column=c_idx, value="")
-
-                                for i in range(1, 5):
-                                    col_letter = get_column_letter(i)
-                                    ws_ring.column_dimensions[col_letter].width = 40
-
-                            tanpa_konversi_df.to_excel(writer, sheet_name=">10K_TANPA_KONVERSI", index=False)
-                            ws_tc = writer.book[">10K_TANPA_KONVERSI"]
-                            for r in range(2, ws_tc.max_row + 1):
-                                for c in range(1, ws_tc.max_column + 1):
-                                    cell = ws_tc.cell(row=r, column=c)
-                                    cell.font = Font(color="FF0000")
-
-                            hijau_tipe_a_df.to_excel(writer, sheet_name="SALES_0_BIAYA", index=False)
-                            ws_hi = writer.book["SALES_0_BIAYA"]
-                            for r in range(2, ws_hi.max_row + 1):
-                                for c in range(1, ws_hi.max_column + 1):
-                                    cell = ws_hi.cell(row=r, column=c)
-                                    cell.font = Font(color="006400")
-
-                            buffer.seek(0)
-
-                    st.success("Excel laporan siap di-download 👇")
-                    st.download_button(
-                        "⬇️ Download Excel Laporan",
-                        buffer,
-                        filename,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_shopee_report"
-                    )
+                    with debug_profile("shopee_ads"):
+                        df_ads = load_uploaded_csv_bytes(read_uploaded_bytes(uploaded_file))
+                    queue_job("shopee_ads", "shopee-ads", key, df_ads, base_name, csv_mode, include)
                 except Exception as e:
                     st.error(f"Terjadi error saat memproses file: {e}")
 
+            job_id = panel_job("shopee_ads", key)
+            result = job_outcome(job_id, "Terjadi error saat memproses file: {}") if job_id is not None else None
+            if result is not None:
+                st.success("Excel laporan siap di-download 👇")
+                job_download(
+                    "⬇️ Download Excel Laporan",
+                    job_id, "report", result,
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    key="download_shopee_report"
+                )
+            debug_panel("shopee_ads")
+
     # =========================================================================
     # FITUR 4: SHOPEE UTM Link Cleaner
     # =========================================================================
@@ -947,16 +555,10 @@ def app_shopee_cpas():
         # Tombol proses
         if st.button("Bersihkan Link", key="clean_link_button"):
             if url_input:
-                # Mencari pola -i.[ShopID].[ItemID] di dalam link
-                match = re.search(r'-i\.(\d+)\.(\d+)', url_input)
-                
-                if match:
-                    shop_id = match.group(1)
-                    item_id = match.group(2)
-                    
-                    # Menyusun ulang link baru
-                    clean_url = f"https://shopee.co.id/product/{shop_id}/{item_id}"
-                    
+                # Mencari pola -i.[ShopID].[ItemID] di dalam link lalu menyusun ulang link baru
+                clean_url = clean_shopee_link(url_input)
+
+                if clean_url:
                     st.success("Berhasil! Ini link baru kamu:")
                     
                     # Menampilkan hasil dengan tombol copy (st.code otomatis ada tombol copy di pojok kanannya)
@@ -976,10 +578,6 @@ def app_shopee_cpas():
 # -----------------------------
 
 def app_meta():
-    from openpyxl import Workbook
-    from openpyxl.styles import PatternFill
-    from openpyxl.utils import get_column_letter
-
     st.title("META Ads KPI Highlighter")
 
     st.markdown(
@@ -1006,395 +604,119 @@ def app_meta():
         unsafe_allow_html=True,
     )
 
-    def is_number(x):
-        try:
-            if pd.isna(x): return False
-            float(x)
-            return True
-        except:
-            return False
-
-    KEEP_DECIMAL_COLS = ["Frekuensi", "Tingkat klik tayang outbound"]
-
     tab_lama, tab_baru = st.tabs(["CPAS", "Whatsapp Ads"])
 
     # TAB 1: APLIKASI LAMA (STANDAR)
     with tab_lama:
         uploaded_file_lama = st.file_uploader("Upload file Excel (.xlsx) - Standar", type=["xlsx"], key="meta_uploader_lama")
 
-        def highlight_cells_lama(val, column):
-            try: v = float(val)
-            except: return ""
-
-            if column == "CPM (Biaya Per 1.000 Tayangan)" and v > 15000: return "background-color: #ffc7ce"
-            if column == "CTR (Rasio Klik Tayang Tautan)" and v < 0.5: return "background-color: #ffc7ce"
-            if column == "Frekuensi" and v > 3: return "background-color: #ffc7ce"
-            if column == "ROAS Pembelian Khusus untuk Item Bersama" and v >= 10: return "background-color: #c6efce"
-            return ""
-
-        def format_cells_for_preview_lama(val, column):
-            if pd.isna(val): return ""
-            try: v = float(val)
-            except: return val
-            
-            if "%ATC" in str(column):
-                if v <= 1: v = v * 100
-                return f"{v:.2f}%"
-            
-            if column in KEEP_DECIMAL_COLS: 
-                return f"{v:.2f}"
-            return f"{v:.0f}"
-
-        def excel_highlight_and_write_lama(df):
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "KPI Highlight"
-
-            for c_idx, col in enumerate(df.columns, start=1):
-                ws.cell(row=1, column=c_idx, value=col)
-
-            red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-
-            for r_idx, (_, row) in enumerate(df.iterrows(), start=2):
-                for c_idx, col in enumerate(df.columns, start=1):
-                    raw_val = row[col]
-                    cell = ws.cell(row=r_idx, column=c_idx)
-
-                    if is_number(raw_val):
-                        v = float(raw_val)
-                        if "%ATC" in str(col):
-                            cell.value = v / 100.0 if v > 1 else v
-                            cell.number_format = "0.00%"
-                        elif col in KEEP_DECIMAL_COLS:
-                            cell.value = v
-                            cell.number_format = "0.##" 
-                        else:
-                            cell.value = v
-                            cell.number_format = "0" 
-
-                        try: eval_v = float(raw_val)
-                        except: eval_v = None
-
-                        if col == "CPM (Biaya Per 1.000 Tayangan)" and eval_v is not None and eval_v > 15000: cell.fill = red_fill
-                        if col == "CTR (Rasio Klik Tayang Tautan)" and eval_v is not None and eval_v < 0.5: cell.fill = red_fill
-                        if col == "Frekuensi" and eval_v is not None and eval_v > 3: cell.fill = red_fill
-                        target_roas_cols = [
-                            "ROAS Pembelian Khusus untuk Item Bersama", 
-                            "ROAS pembelian khusus untuk item bersama"
-                        ]
-                        if col in target_roas_cols and eval_v is not None and eval_v >= 10: cell.fill = green_fill
-                    else:
-                        cell.value = raw_val
-
-            for i, col in enumerate(df.columns, start=1):
-                ws.column_dimensions[get_column_letter(i)].width = min(max(15, len(str(col)) + 2), 50)
-
-            out = BytesIO()
-            wb.save(out)
-            out.seek(0)
-            return out
-
         if uploaded_file_lama:
             try:
-                df_lama = pd.read_excel(uploaded_file_lama, header=0) 
-                
-                # Mendapatkan nama original (tanpa ekstensi)
-                base_name_lama = uploaded_file_lama.name.rsplit(".", 1)[0]
-                
-                # Mengambil isi dari kolom "Awal pelaporan" jika ada
-                tgl_awal_lama = ""
-                if "Awal pelaporan" in df_lama.columns and not df_lama["Awal pelaporan"].dropna().empty:
-                    raw_tgl = df_lama["Awal pelaporan"].dropna().iloc[0]
-                    if pd.notna(raw_tgl):
-                        # Jika format datetime, ubah jadi string YYYY-MM-DD. Jika bukan, ambil teksnya & hilangkan karakter ilegal /
-                        tgl_awal_lama = raw_tgl.strftime("%Y-%m-%d") if hasattr(raw_tgl, 'strftime') else str(raw_tgl).replace("/", "-")
-                
-                # Bentuk nama file final
-                if tgl_awal_lama:
-                    final_filename_lama = f"{base_name_lama}_{tgl_awal_lama}_sorted.xlsx"
-                else:
-                    final_filename_lama = f"{base_name_lama}_sorted.xlsx"
+                with debug_profile("meta_cpas"):
+                    df_lama, tgl_awal_lama = read_cpas_report(uploaded_file_lama.getvalue())
 
-                num_cols = df_lama.select_dtypes(include="number").columns
-                df_lama[num_cols] = df_lama[num_cols].fillna(0)
+                    # Nama original (tanpa ekstensi) + isi kolom "Awal pelaporan" jika ada
+                    final_filename_lama = report_filename(uploaded_file_lama.name.rsplit(".", 1)[0], tgl_awal_lama)
 
-                styled_df_lama = df_lama.style.apply(lambda col: [highlight_cells_lama(v, col.name) for v in col], axis=0)
-                for col in df_lama.columns:
-                    styled_df_lama = styled_df_lama.format(lambda v, c=col: format_cells_for_preview_lama(v, c), subset=[col])
+                    css_lama = kpi_style_matrix(df_lama, META_CPAS_RULES)
+                    styled_df_lama = kpi_styler(df_lama.style, css_lama)
+                    styled_df_lama = styled_df_lama.format({col: (lambda v, c=col: format_cell_for_preview(v, c)) for col in df_lama.columns})
 
-                st.subheader("📌 Preview Data - Standar")
-                st.dataframe(styled_df_lama, use_container_width=True)
+                    st.subheader("📌 Preview Data - Standar")
+                    with profile_stage("style", "preview Styler"):
+                        st.dataframe(styled_df_lama, use_container_width=True)
 
-                st.download_button(
-                    label="⬇️ Download Excel (Standar)",
-                    data=excel_highlight_and_write_lama(df_lama),
-                    file_name=final_filename_lama,
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    key="download_meta_lama"
-                )
+                    # Excel disusun job latar; preview di atas tidak menunggu
+                    key = job_key("meta-excel", "cpas", upload_digest(uploaded_file_lama), final_filename_lama)
+                    job_id = panel_job("meta_cpas", key) or queue_job(
+                        "meta_cpas", "meta-excel", key, df_lama, css_lama, final_filename_lama, "cpas",
+                    )
+                    result = job_outcome(job_id)
+                    if result is not None:
+                        job_download(
+                            "⬇️ Download Excel (Standar)", job_id, "excel", result,
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            key="download_meta_lama"
+                        )
             except Exception as e:
                 st.error(f"Gagal membaca file: {e}")
+            debug_panel("meta_cpas")
 
     # TAB 2: APLIKASI BARU (CUSTOM)
     with tab_baru:
         uploaded_file_baru = st.file_uploader("Upload file Excel (.xlsx) - Custom (Header Baris 3)", type=["xlsx"], key="meta_uploader_baru")
 
-        def style_df_baru(df):
-            styles = pd.DataFrame('', index=df.index, columns=df.columns)
-            camp_col = next((c for c in df.columns if "kampanye" in str(c).lower() or "campaign" in str(c).lower()), None)
-
-            for idx, row in df.iterrows():
-                for col in df.columns:
-                    val = row[col]
-                    if is_number(val):
-                        v = float(val)
-                        if col == "CPM (Biaya Per 1.000 Tayangan)" and v > 15000: styles.loc[idx, col] = "background-color: #ffc7ce"
-                        if col == "CTR (Rasio Klik Tayang Tautan)" and v < 0.5: styles.loc[idx, col] = "background-color: #ffc7ce"
-                        if col == "Frekuensi" and v > 3: styles.loc[idx, col] = "background-color: #ffc7ce"
-                            
-                        if col == "Biaya per hasil" and camp_col is not None:
-                            camp_name = str(row[camp_col]).lower() 
-                            if "visit" in camp_name:
-                                if v > 500:
-                                    styles.loc[idx, col] = "background-color: #ffc7ce"
-                            else:
-                                if v > 5000:
-                                    styles.loc[idx, col] = "background-color: #ffc7ce"
-            return styles
-
-        def format_cells_for_preview_baru(val, column):
-            if pd.isna(val): return ""
-            try: v = float(val)
-            except: return val
-            
-            if "%ATC" in str(column):
-                if v <= 1: v = v * 100
-                return f"{v:.2f}%"
-            
-            if column in KEEP_DECIMAL_COLS: 
-                return f"{v:.2f}"
-            return f"{v:.0f}"
-
-        def excel_highlight_and_write_baru(df):
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "KPI Highlight Custom"
-
-            for c_idx, col in enumerate(df.columns, start=1):
-                ws.cell(row=3, column=c_idx, value=col)
-
-            red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            camp_col = next((c for c in df.columns if "kampanye" in str(c).lower() or "campaign" in str(c).lower()), None)
-
-            for r_idx, (_, row) in enumerate(df.iterrows(), start=4):
-                for c_idx, col in enumerate(df.columns, start=1):
-                    raw_val = row[col]
-                    cell = ws.cell(row=r_idx, column=c_idx)
-
-                    if is_number(raw_val):
-                        v = float(raw_val)
-                        if "%ATC" in str(col):
-                            cell.value = v / 100.0 if v > 1 else v
-                            cell.number_format = "0.00%"
-                        elif col in KEEP_DECIMAL_COLS:
-                            cell.value = v
-                            cell.number_format = "0.##" 
-                        else:
-                            cell.value = v
-                            cell.number_format = "0" 
-
-                        try: eval_v = float(raw_val)
-                        except: eval_v = None
-
-                        if eval_v is not None:
-                            if col == "CPM (Biaya Per 1.000 Tayangan)" and eval_v > 15000: cell.fill = red_fill
-                            if col == "CTR (Rasio Klik Tayang Tautan)" and eval_v < 0.5: cell.fill = red_fill
-                            if col == "Frekuensi" and eval_v > 3: cell.fill = red_fill
-                            
-                            if col == "Biaya per hasil" and camp_col is not None:
-                                camp_name = str(row[camp_col]).lower()
-                                if "visit" in camp_name:
-                                    if eval_v > 500:
-                                        cell.fill = red_fill
-                                else:
-                                    if eval_v > 5000:
-                                        cell.fill = red_fill
-                    else:
-                        cell.value = raw_val
-
-            for i, col in enumerate(df.columns, start=1):
-                ws.column_dimensions[get_column_letter(i)].width = min(max(15, len(str(col)) + 2), 50)
-
-            out = BytesIO()
-            wb.save(out)
-            out.seek(0)
-            return out
-
         if uploaded_file_baru:
             try:
-                df_baru = pd.read_excel(uploaded_file_baru, header=2) 
-                
-                # --- FITUR: Hanya hapus kolom yang header-nya tidak punya nama (Unnamed) ---
-                df_baru = df_baru.loc[:, ~df_baru.columns.str.contains('^Unnamed', na=False)]
+                with debug_profile("meta_wa"):
+                    # Header di baris ke-3; kolom tanpa nama (Unnamed/kosong) dibuang
+                    df_baru, tgl_awal_baru = read_wa_report(uploaded_file_baru.getvalue())
 
-                # Jika ingin menghapus kolom yang benar-benar string kosong di header-nya:
-                df_baru = df_baru.loc[:, df_baru.columns.notna()] 
-                df_baru = df_baru.loc[:, df_baru.columns != ""]
-                
-                # Mendapatkan nama original (tanpa ekstensi)
-                base_name_baru = uploaded_file_baru.name.rsplit(".", 1)[0]
-                
-                # Mengambil isi dari kolom "Awal pelaporan" jika ada
-                tgl_awal_baru = ""
-                if "Awal pelaporan" in df_baru.columns and not df_baru["Awal pelaporan"].dropna().empty:
-                    raw_tgl = df_baru["Awal pelaporan"].dropna().iloc[0]
-                    if pd.notna(raw_tgl):
-                        tgl_awal_baru = raw_tgl.strftime("%Y-%m-%d") if hasattr(raw_tgl, 'strftime') else str(raw_tgl).replace("/", "-")
-                
-                # Bentuk nama file final
-                if tgl_awal_baru:
-                    final_filename_baru = f"{base_name_baru}_{tgl_awal_baru}_sorted.xlsx"
-                else:
-                    final_filename_baru = f"{base_name_baru}_sorted.xlsx"
+                    # Nama original (tanpa ekstensi) + isi kolom "Awal pelaporan" jika ada
+                    final_filename_baru = report_filename(uploaded_file_baru.name.rsplit(".", 1)[0], tgl_awal_baru)
 
-                num_cols = df_baru.select_dtypes(include="number").columns
-                df_baru[num_cols] = df_baru[num_cols].fillna(0)
+                    css_baru = kpi_style_matrix(df_baru, META_WA_RULES)
+                    styled_df_baru = kpi_styler(df_baru.style, css_baru)
+                    styled_df_baru = styled_df_baru.format({col: (lambda v, c=col: format_cell_for_preview(v, c)) for col in df_baru.columns})
 
-                styled_df_baru = df_baru.style.apply(style_df_baru, axis=None)
-                for col in df_baru.columns:
-                    styled_df_baru = styled_df_baru.format(lambda v, c=col: format_cells_for_preview_baru(v, c), subset=[col])
+                    st.subheader("📌 Preview Data - Custom")
+                    with profile_stage("style", "preview Styler"):
+                        st.dataframe(styled_df_baru, use_container_width=True)
 
-                st.subheader("📌 Preview Data - Custom")
-                st.dataframe(styled_df_baru, use_container_width=True)
-
-                st.download_button(
-                    label="⬇️ Download Excel (Custom Biaya per hasil)",
-                    data=excel_highlight_and_write_baru(df_baru),
-                    file_name=final_filename_baru,
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    key="download_meta_baru"
-                )
+                    # Excel disusun job latar; preview di atas tidak menunggu
+                    key = job_key("meta-excel", "wa", upload_digest(uploaded_file_baru), final_filename_baru)
+                    job_id = panel_job("meta_wa", key) or queue_job(
+                        "meta_wa", "meta-excel", key, df_baru, css_baru, final_filename_baru, "wa",
+                    )
+                    result = job_outcome(job_id)
+                    if result is not None:
+                        job_download(
+                            "⬇️ Download Excel (Custom Biaya per hasil)", job_id, "excel", result,
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            key="download_meta_baru"
+                        )
             except Exception as e:
                 st.error(f"Gagal membaca file: {e}. Pastikan header tabel berada tepat di baris ke-3 Excel Anda.")               
+            debug_panel("meta_wa")
 
 
 # -----------------------------
 # APP 3: TikTok (wrapped)
 # -----------------------------
 
-import streamlit as st
-import pandas as pd
-import numpy as np
-import io
-from datetime import datetime, date
-from collections import OrderedDict
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
-from pandas.io.formats.style import Styler
-
 def app_tiktok():
     st.title("🎵 Excel Tools — TikTok")
 
     # Helper & Config 
-    percent_cols = [
-        'Tingkat klik iklan produk', 'Rasio konversi iklan', 'Rasio tayang video iklan 2 detik',
-        'Rasio tayang video iklan 6 detik', 'Rasio tayang video iklan 25%', 'Rasio tayang video iklan 50%',
-        'Rasio tayang video iklan 75%', 'Rasio tayang video iklan 100%'
-    ]
-
-    def find_column(df, keywords):
-        kws = [k.lower() for k in keywords]
-        for col in df.columns:
-            low = str(col).lower()
-            if any(kw in low for kw in kws):
-                return col
-        return None
-
-    def series_to_numeric_like(df_col):
-        s_orig = df_col.astype(str).fillna("").str.strip()
-        had_pct = s_orig.str.contains("%")
-        s = s_orig.copy()
-        has_paren = s.str.startswith("(") & s.str.endswith(")")
-        s = s.mask(has_paren, "-" + s.str[1:-1])
-        s = s.str.replace("%", "", regex=False).str.replace(",", "", regex=False).str.replace(" ", "", regex=False).replace("", np.nan)
-        numeric = pd.to_numeric(s, errors="coerce")
-        numeric = numeric.where(~had_pct, numeric / 100.0)
-        return numeric
-
-    def make_highlighter(col_biaya, col_pendapatan, col_roi, col_status):
-        def highlight_row(row):
-            styles = [''] * len(row)
-            idx = {c: i for i, c in enumerate(row.index)}
-
-            def parse_val(val):
-                try:
-                    if pd.isna(val): return np.nan
-                    if isinstance(val, (int, float, np.floating, np.integer)): return float(val)
-                    s = str(val).strip()
-                    if s == "": return np.nan
-                    had_pct = "%" in s
-                    if s.startswith("(") and s.endswith(")"): s = "-" + s[1:-1]
-                    num = float(s.replace("%", "").replace(",", "").replace(" ", ""))
-                    return num / 100.0 if had_pct else num
-                except Exception:
-                    return np.nan
-
-            try:
-                biaya_val = parse_val(row[col_biaya]) if col_biaya in row.index else np.nan
-                pendapatan_val = parse_val(row[col_pendapatan]) if col_pendapatan in row.index else np.nan
-                roi_val = parse_val(row[col_roi]) if col_roi in row.index else np.nan
-            except Exception:
-                return styles
-
-            if col_status is not None and col_status in row.index:
-                status_text = str(row[col_status]).strip().lower() if pd.notna(row[col_status]) else ""
-                if status_text == "perlu otorisasi":
-                    styles = ['background-color: #98f073'] * len(row)
-                    if col_status in idx: styles[idx[col_status]] = 'background-color: #ff7979'
-                    return styles
-
-            if pd.isna(roi_val): return styles
-            biaya_pos = (pd.notna(biaya_val) and biaya_val > 0)
-            pendapatan_pos = (pd.notna(pendapatan_val) and pendapatan_val > 0)
-            if not (biaya_pos or pendapatan_pos) or roi_val == 0: return styles
-            if roi_val >= 10: return ['background-color: #00ff00'] * len(row)
-            if roi_val < 10: return ['background-color: #ffff00'] * len(row)
-            return styles
-        return highlight_row
-
-    try:
-        import xlsxwriter
-        EXCEL_ENGINE = "xlsxwriter"
-    except ImportError:
-        EXCEL_ENGINE = "openpyxl"
-
-    @st.cache_data
-    def load_excel_safe(file, sheet_name=0):
+    @st.cache_resource
+    def fixer_load_stats() -> dict:
+        # Statistik cache load_excel_safe (lintas sesi, seperti cache-nya sendiri)
+        return {"hits": 0, "misses": 0, "parse_seconds": 0.0, "saved_seconds": 0.0, "lock": threading.Lock()}
+
+    @st.cache_data(show_spinner=False, max_entries=16)
+    def parse_fixer_file(digest: str, sheet_name, _data: bytes, _probe: dict):
+        # Kunci cache = isi file (digest) + sheet; badan fungsi hanya jalan saat cache miss
+        _probe["parsed"] = True
+        started = time.perf_counter()
         try:
-            file.seek(0)
-            temp_df = pd.read_excel(file, sheet_name=sheet_name, nrows=0, engine="openpyxl")
-            dtype_dict = {}
-            target_col = None
-            for col in temp_df.columns:
-                if "id" in str(col).lower():
-                    dtype_dict[col] = str
-                    target_col = col
-                    break
-            file.seek(0)
-            final_df = pd.read_excel(file, sheet_name=sheet_name, dtype=dtype_dict, engine="openpyxl")
-            
-            # Membersihkan koma menjadi titik (Fixer)
-            for col in final_df.columns:
-                if col == target_col: continue
-                if final_df[col].dtype == "object":
-                    try:
-                        final_df[col] = final_df[col].astype(str).str.replace(',', '.', regex=False)
-                        final_df[col] = pd.to_numeric(final_df[col], errors='ignore')
-                    except Exception: pass
-            return final_df, target_col
+            df, target_col = read_fixer_workbook(_data, sheet_name)
         except Exception:
-            return None, None
+            df, target_col = None, None
+        return df, target_col, time.perf_counter() - started
+
+    def load_excel_safe(data: bytes, sheet_name=0):
+        """Return (DataFrame atau None jika gagal dibaca, kolom id, info cache {"hit", "parse_seconds", ...stats})."""
+        probe = {"parsed": False}
+        df, target_col, parse_seconds = parse_fixer_file(file_digest(data), sheet_name, data, probe)
+        stats = fixer_load_stats()
+        with stats["lock"]:
+            if probe["parsed"]:
+                stats["misses"] += 1; stats["parse_seconds"] += parse_seconds
+            else:
+                stats["hits"] += 1; stats["saved_seconds"] += parse_seconds
+            info = {"hit": not probe["parsed"], "parse_seconds": parse_seconds,
+                    **{k: v for k, v in stats.items() if k != "lock"}}
+        return df, target_col, info
 
     # NAVBAR MINI TIKTOK (Halaman disederhanakan)
     PAGES_TIKTOK = ["Fitur Utama", "Daily Ads Comparator"]
@@ -1404,6 +726,8 @@ def app_tiktok():
     # --- INISIALISASI KEY DINAMIS UNTUK RESET UPLOADER ---
     if "tiktok_uploader_key" not in st.session_state:
         st.session_state["tiktok_uploader_key"] = 0
+    if "tiktok_daily_ingested" not in st.session_state:
+        st.session_state["tiktok_daily_ingested"] = {}
 
     cols = st.columns(len(PAGES_TIKTOK), gap="small")
     for i, p in enumerate(PAGES_TIKTOK):
@@ -1427,106 +751,34 @@ def app_tiktok():
             # Switch Pewarnaan ROI
             use_roi_color = st.toggle("🎨 Aktifkan Pewarnaan ROI", value=False, help="Jika aktif, baris dengan ROI tinggi/rendah akan diberi warna.")
 
+            key = job_key("tiktok-fixer", upload_digest(uploaded_file), base_name, use_roi_color)
             if st.button("🚀 Proses & Download", key="process_merged_tiktok"):
-                with st.spinner("Memproses file..."):
-                    df_hasil, kolom_target = load_excel_safe(uploaded_file)
+                with st.spinner("Memproses file..."), debug_profile("tiktok_fixer"):
+                    df_hasil, kolom_target, load_info = load_excel_safe(uploaded_file.getvalue())
+                    st.caption(
+                        f"{'Cache hit' if load_info['hit'] else 'Diparse'}: baca file {load_info['parse_seconds']:.2f} dtk"
+                        f"{' dilewati' if load_info['hit'] else ''} · cache {load_info['hits']} hit / {load_info['misses']} miss,"
+                        f" total dihemat {load_info['saved_seconds']:.1f} dtk"
+                    )
 
-                    if df_hasil is None:
-                        st.error("Gagal memproses file. Pastikan format file benar.")
-                    else:
-                        buffer = io.BytesIO()
-
-                        # JIKA SWITCH PEWARNAAN AKTIF
-                        if use_roi_color:
-                            outname = f"{base_name}_colored.xlsx"
-                            
-                            col_biaya = find_column(df_hasil, ["biaya", "cost"])
-                            col_pendapatan_kotor = find_column(df_hasil, ["pendapatan kotor", "pendapatan_kotor", "pendapatan", "gmv", "revenue"])
-                            col_pendapatan_bruto = find_column(df_hasil, ["pendapatan bruto", "penghasilan bruto", "penghasilan_bruto", "bruto", "gross", "gross revenue"])
-                            col_roi = find_column(df_hasil, ["roi"])
-                            col_status = find_column(df_hasil, ["status"])
-
-                            col_pendapatan_effective = None
-                            pendapatan_computed_name = "__pendapatan_bruto_computed"
-                            bruto_was_computed = False
-
-                            if col_pendapatan_bruto:
-                                col_pendapatan_effective = col_pendapatan_bruto
-                            elif col_pendapatan_kotor:
-                                bonus_keywords = ["bonus", "komisi", "tunjangan", "insentif", "incentive"]
-                                if any(any(k in str(c).lower() for k in bonus_keywords) for c in df_hasil.columns):
-                                    col_pendapatan_effective = pendapatan_computed_name
-                                    bruto_was_computed = True
-                                else:
-                                    col_pendapatan_effective = col_pendapatan_kotor
-
-                            missing = [m for m, cond in zip(["Biaya", "Pendapatan", "ROI"], [col_biaya, col_pendapatan_kotor or col_pendapatan_bruto, col_roi]) if not cond]
-                            
-                            if missing:
-                                st.error(f"Kolom wajib tidak ditemukan: {', '.join(missing)}. Gagal mewarnai ROI.")
-                                st.stop()
-
-                            biaya_num = series_to_numeric_like(df_hasil[col_biaya])
-                            pendapatan_for_deletion = series_to_numeric_like(df_hasil[col_pendapatan_kotor if col_pendapatan_kotor else col_pendapatan_bruto])
-                            roi_num = series_to_numeric_like(df_hasil[col_roi])
-                            
-                            delete_mask = (biaya_num == 0) & (pendapatan_for_deletion == 0) & (roi_num == 0)
-                            df_colored = df_hasil.loc[~delete_mask].copy()
-
-                            pct_present = [c for c in percent_cols if c in df_colored.columns]
-                            for c in pct_present: df_colored[c] = series_to_numeric_like(df_colored[c])
-
-                            if bruto_was_computed:
-                                base = series_to_numeric_like(df_colored[col_pendapatan_kotor]).fillna(0)
-                                extras = pd.Series(0.0, index=df_colored.index)
-                                for bcol in [c for c in df_colored.columns if any(k in str(c).lower() for k in ["bonus", "komisi", "tunjangan", "insentif", "incentive"])]:
-                                    extras += series_to_numeric_like(df_colored[bcol]).fillna(0)
-                                df_colored[pendapatan_computed_name] = base + extras
-                                col_pendapatan_effective = pendapatan_computed_name
-
-                            if col_pendapatan_effective is None: col_pendapatan_effective = col_pendapatan_kotor or col_pendapatan_bruto
-
-                            highlighter = make_highlighter(col_biaya, col_pendapatan_effective, col_roi, col_status)
-                            styled = df_colored.style.apply(highlighter, axis=1)
-
-                            with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-                                styled.to_excel(writer, sheet_name="DATA_COLORED", index=False)
-                                df_hasil.to_excel(writer, sheet_name="DATA_ASLI", index=False)
-                                ws = writer.sheets["DATA_COLORED"]
-                                for col in pct_present:
-                                    try:
-                                        col_idx = df_colored.columns.get_loc(col) + 1
-                                        for row_cells in ws.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx, max_row=ws.max_row):
-                                            for cell in row_cells:
-                                                if isinstance(cell.value, (int, float, complex)) and not isinstance(cell.value, bool):
-                                                    cell.number_format = '0.00%'
-                                    except Exception: pass
-                                    
-                            st.success("✅ File berhasil diproses (Fixer + Warna).")
-                            st.dataframe(df_colored.head(10), use_container_width=True)
-
-                        # JIKA SWITCH PEWARNAAN MATI (Normal Fixer)
-                        else:
-                            outname = f"{base_name}_sorted.xlsx"
-                            
-                            with pd.ExcelWriter(buffer, engine=EXCEL_ENGINE) as writer:
-                                df_hasil.to_excel(writer, index=False, sheet_name="Sheet1")
-                                try:
-                                    worksheet = writer.sheets["Sheet1"]
-                                    if EXCEL_ENGINE == "xlsxwriter":
-                                        for i, col in enumerate(df_hasil.columns):
-                                            worksheet.set_column(i, i, max(df_hasil[col].astype(str).map(len).max(), len(str(col))) + 2)
-                                    else:
-                                        from openpyxl.utils import get_column_letter
-                                        for i, col in enumerate(df_hasil.columns, 1):
-                                            worksheet.column_dimensions[get_column_letter(i)].width = max(df_hasil[col].astype(str).map(len).max(), len(str(col))) + 2
-                                except Exception: pass
-                                
-                            st.success("✅ File berhasil diproses (Hanya Fixer).")
-                            st.dataframe(df_hasil.head(10), use_container_width=True)
-
-                        buffer.seek(0)
-                        st.download_button("📥 Download Excel Hasil", buffer, outname, key="download_merged_tiktok")
+                if df_hasil is None:
+                    st.error("Gagal memproses file. Pastikan format file benar.")
+                    st.stop()
+                # JIKA SWITCH PEWARNAAN AKTIF: kolom wajib dicek sebelum job diajukan
+                missing = roi_columns(df_hasil)["missing"] if use_roi_color else []
+                if missing:
+                    st.error(f"Kolom wajib tidak ditemukan: {', '.join(missing)}. Gagal mewarnai ROI.")
+                    st.stop()
+                queue_job("tiktok_fixer", "tiktok-fixer", key, df_hasil, base_name, use_roi_color)
+
+            job_id = panel_job("tiktok_fixer", key)
+            result = job_outcome(job_id, "Gagal memproses file: {}") if job_id is not None else None
+            if result is not None:
+                if use_roi_color: st.success("✅ File berhasil diproses (Fixer + Warna).")
+                else: st.success("✅ File berhasil diproses (Hanya Fixer).")
+                st.dataframe(result["previews"]["hasil"], use_container_width=True)
+                job_download("📥 Download Excel Hasil", job_id, "excel", result, key="download_merged_tiktok")
+            debug_panel("tiktok_fixer")
 
 
     # =========================================================================
@@ -1535,192 +787,19 @@ def app_tiktok():
     elif st.session_state.page_tiktok == "Daily Ads Comparator":
         st.header("Ads Performance Comparator — DAILY FOCUS")
         st.markdown("""
-        Upload TikTok exports per hari (header row 3, data row 4). Cache akan otomatis menyimpan dan menggabungkan datanya.
+        Upload TikTok exports per hari (header row 3, data row 4). Dataset disimpan di disk per tanggal laporan,
+        jadi tetap ada setelah aplikasi restart; file yang sama tidak diproses dua kali.
         """)
 
-        ALLOWED_METRICS = [
-            "ID", "Produk", "Status", "GMV", "Produk terjual", "Pesanan", "GMV tab Toko",
-            "Impresi daftar produk tab Toko", "Rasio klik-tayang shop tab", "GMV dari LIVE",
-            "Impresi dari LIVE", "Rasio klik-tayang dari LIVE", "GMV dari video",
-            "Impresi dari video", "Rasio klik-tayang dari video", "Impresi dari kartu produk",
-            "Tayangan halaman dari kartu produk", "Tayangan halaman unik dari kartu produk",
-            "Pembeli unik dari kartu produk", "Rasio klik-tayang dari kartu produk",
-            "Persentase konversi dari kartu produk",
-        ]
-        MAX_CACHE = 30
-        PERCENT_NAME_KEYWORDS = ["rasio", "rasio klik", "persentase", "konversi", "ctr", "ratio"]
-
-        def read_date_from_a1(uploaded_file) -> date:
-            try:
-                data = uploaded_file.read() if hasattr(uploaded_file, "read") else uploaded_file
-                wb = load_workbook(filename=io.BytesIO(data) if isinstance(data, bytes) else data, data_only=True)
-                raw = wb.active["A1"].value
-                if isinstance(raw, datetime): return raw.date()
-                if isinstance(raw, date): return raw
-                if isinstance(raw, (int, float)):
-                    try: return datetime.fromordinal(datetime(1900, 1, 1).toordinal() + int(raw) - 2).date()
-                    except Exception: return raw
-                if isinstance(raw, str):
-                    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y", "%Y/%m/%d"):
-                        try: return datetime.strptime(raw.strip(), fmt).date()
-                        except Exception: pass
-                    return raw.strip()
-                return raw
-            except Exception:
-                return None
-
-        def read_data_table(uploaded_file) -> pd.DataFrame:
-            try:
-                if hasattr(uploaded_file, "read"):
-                    try: uploaded_file.seek(0)
-                    except Exception: pass
-                return pd.read_excel(uploaded_file, header=2, engine="openpyxl")
-            except Exception:
-                return pd.DataFrame()
-
-        def normalize_and_filter_df(df: pd.DataFrame) -> pd.DataFrame:
-            df.columns = [str(c).strip() for c in df.columns]
-            df = df.reindex(columns=[c for c in ALLOWED_METRICS if c in df.columns])
-            for s in ["ID", "Produk", "Status"]:
-                if s in df.columns: df[s] = df[s].astype(str)
-            for col in df.columns:
-                if col in ("ID", "Produk", "Status"): continue
-                is_percent = any(k in col.lower() for k in PERCENT_NAME_KEYWORDS)
-                if df[col].dtype == object or is_percent:
-                    def try_parse(x):
-                        if pd.isna(x): return None
-                        if isinstance(x, str):
-                            v = x.strip().replace(',', '')
-                            if v.endswith('%'):
-                                try: return float(v.rstrip('%')) / 100.0
-                                except Exception: return None
-                            try: return float(v)
-                            except Exception: return None
-                        if isinstance(x, (int, float)):
-                            if is_percent and x > 1: return float(x) / 100.0
-                            return float(x)
-                        return None
-                    df[col] = df[col].apply(try_parse)
-                df[col] = pd.to_numeric(df[col], errors='coerce') if col not in ("ID", "Produk", "Status") else df[col]
-            return df
-
-        def add_to_session_cache(date_val, df):
-            date_key = str(date_val)
-            if "tiktok_daily_datasets" not in st.session_state:
-                st.session_state["tiktok_daily_datasets"] = OrderedDict()
-            datasets = st.session_state["tiktok_daily_datasets"]
-            datasets[date_key] = df
-            while len(datasets) > MAX_CACHE: datasets.popitem(last=False)
-            st.session_state["tiktok_daily_datasets"] = datasets
-
-        def clear_cache(): st.session_state["tiktok_daily_datasets"] = OrderedDict()
-
-        def remove_date_from_cache(date_key):
-            if "tiktok_daily_datasets" in st.session_state and date_key in st.session_state["tiktok_daily_datasets"]:
-                st.session_state["tiktok_daily_datasets"].pop(date_key)
-
-        def build_daily_aggregate(datasets: OrderedDict) -> pd.DataFrame:
-            if not datasets: return pd.DataFrame()
-            frames = []
-            for date_key, df in datasets.items():
-                parsed = pd.to_datetime(date_key, errors='coerce')
-                if pd.isna(parsed):
-                    try: parsed = pd.to_datetime(str(date_key).split()[0], errors='coerce')
-                    except Exception: parsed = None
-                if pd.isna(parsed): continue
-                
-                df2 = df[[c for c in ALLOWED_METRICS if c in df.columns]].copy()
-                numeric = df2.select_dtypes(include=['number']).columns.tolist()
-                summed = df2[numeric].sum(axis=0) if numeric else pd.Series(dtype=float)
-                summed = summed.to_frame().T
-                summed['date'] = pd.to_datetime(parsed)
-                frames.append(summed)
-
-            if not frames: return pd.DataFrame()
-            agg = pd.concat(frames, ignore_index=True).set_index('date')
-            agg.index = pd.to_datetime(agg.index).date
-            return agg.sort_index()
-
-        def style_daily_aggregate(df: pd.DataFrame) -> Styler:
-            if df.empty: return df
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-            diffs = df[numeric_cols].diff()
-            styles = pd.DataFrame('', index=df.index, columns=df.columns)
-            for col in numeric_cols:
-                for idx in df.index:
-                    d = diffs.loc[idx, col]
-                    if pd.notna(d):
-                        if d > 0: styles.at[idx, col] = 'background-color: #b6f2c2'
-                        elif d < 0: styles.at[idx, col] = 'background-color: #f5b7b1'
-                        else: styles.at[idx, col] = 'background-color: white'
-
-            def fmt(x, col=None):
-                if pd.isna(x): return ""
-                if col and any(k in col.lower() for k in PERCENT_NAME_KEYWORDS):
-                    try: return f"{x:.2%}"
-                    except Exception: return x
-                else:
-                    try: return f"{int(x):,}" if float(x).is_integer() else f"{x:,.2f}"
-                    except Exception: return x
-
-            return df.style.format({c: (lambda v, col=c: fmt(v, col)) for c in df.columns}).apply(lambda _: styles, axis=None)
-
-        def build_product_sheets(datasets: OrderedDict) -> bytes:
-            if not datasets: return None
-            frames = []
-            for date_key, df in datasets.items():
-                parsed = pd.to_datetime(str(date_key).split('~')[0].strip(), errors='coerce')
-                if pd.notna(parsed):
-                    d = df.copy()
-                    d['date'] = pd.to_datetime(parsed)
-                    frames.append(d)
-            if not frames: return None
-
-            concat = pd.concat(frames, ignore_index=True, sort=False)
-            if 'Produk' not in concat.columns: return None
-
-            numeric_metrics = [c for c in ALLOWED_METRICS if c in concat.columns and c not in ('ID', 'Produk', 'Status')]
-            bytes_io = io.BytesIO()
-            with pd.ExcelWriter(bytes_io, engine='openpyxl') as writer:
-                for product_name, grp in concat.groupby('Produk'):
-                    row = grp.groupby('date')[numeric_metrics].sum().reset_index().sort_values('date')
-                    safe_sheet_name = str(product_name)[:31] if product_name else 'Unknown'
-                    row.to_excel(writer, sheet_name=safe_sheet_name, index=False)
-                    ws = writer.book[safe_sheet_name]
-
-                    ws.column_dimensions['A'].width = 15
-                    for cell in ws['A'][1:]: cell.number_format = 'yyyy-mm-dd'
-
-                    from openpyxl.formatting.rule import FormulaRule
-                    from openpyxl.chart import LineChart, Reference
-
-                    green_fill = PatternFill(start_color="B6F2C2", end_color="B6F2C2", fill_type="solid")
-                    red_fill = PatternFill(start_color="F5B7B1", end_color="F5B7B1", fill_type="solid")
-
-                    for col_idx in range(2, ws.max_column + 1):
-                        col_name = str(ws.cell(row=1, column=col_idx).value).lower()
-                        col_letter = ws.cell(row=1, column=col_idx).column_letter
-                        is_percent = any(k in col_name for k in PERCENT_NAME_KEYWORDS)
-                        for row_idx in range(2, ws.max_row + 1):
-                            ws.cell(row=row_idx, column=col_idx).number_format = '0.00%' if is_percent else '#,##0'
-                        if ws.max_row >= 3:
-                            cf_range = f"{col_letter}3:{col_letter}{ws.max_row}"
-                            ws.conditional_formatting.add(cf_range, FormulaRule(formula=[f"{col_letter}3>{col_letter}2"], fill=green_fill))
-                            ws.conditional_formatting.add(cf_range, FormulaRule(formula=[f"{col_letter}3<{col_letter}2"], fill=red_fill))
-
-                    if ws.max_row >= 2:
-                        start_chart_row, chart_idx = ws.max_row + 3, 0
-                        for col_idx in range(2, ws.max_column + 1):
-                            chart = LineChart()
-                            chart.title = ws.cell(row=1, column=col_idx).value
-                            chart.style, chart.width, chart.height, chart.legend = 13, 16, 8, None
-                            chart.add_data(Reference(ws, min_col=col_idx, min_row=1, max_row=ws.max_row), titles_from_data=True)
-                            chart.set_categories(Reference(ws, min_col=1, min_row=2, max_row=ws.max_row))
-                            ws.add_chart(chart, f"{'A' if chart_idx % 2 == 0 else 'I'}{start_chart_row + (chart_idx // 2) * 16}")
-                            chart_idx += 1
-
-            bytes_io.seek(0)
-            return bytes_io.read()
+        @st.cache_data(show_spinner=False, max_entries=512)
+        def daily_aggregate_html(fingerprint: str, product: str, _df: pd.DataFrame) -> str:
+            # HTML tabel dirender sekali per (produk, sidik jari data); _df tidak ikut di-hash
+            return style_daily_aggregate(_df).to_html()
+
+        @st.cache_data(show_spinner=False, max_entries=8)
+        def product_row_index(fingerprint: str, _product_daily: pd.DataFrame) -> dict:
+            # produk -> posisi baris di ringkasan per (produk, tanggal); dihitung sekali per sidik jari data
+            return _product_daily.groupby('produk').indices
 
         col1, col2 = st.columns([2, 1])
 
@@ -1735,55 +814,86 @@ def app_tiktok():
             
             sukses_tanggal = [] 
             if uploaded_files:
+                # Hasil per file upload (file_id tetap sama antar rerun): rerun tanpa upload baru cukup lookup,
+                # tanpa hash/parse ulang dan tanpa menimpa lagi tanggal yang sudah diganti file lain
+                previous = st.session_state["tiktok_daily_ingested"]
+                ingested = {f.file_id: previous[f.file_id] for f in uploaded_files if f.file_id in previous}
+                pending = OrderedDict()  # digest -> (nama, bytes, [file_id, ...])
                 for uploaded in uploaded_files:
-                    uploaded_bytes = uploaded.read()
-                    date_val = read_date_from_a1(io.BytesIO(uploaded_bytes))
-                    if not date_val:
-                        st.error(f"Gagal ekstrak tanggal dari file: {uploaded.name}")
+                    if uploaded.file_id in ingested: continue
+                    uploaded_bytes = uploaded.getvalue()
+                    digest = file_digest(uploaded_bytes)
+                    stored_key = daily_store_find_hash(digest)
+                    if stored_key is not None:
+                        # File identik sudah ada di store -> tidak perlu parsing ulang
+                        ingested[uploaded.file_id] = {"date": stored_key, "error": None}
                     else:
-                        df_raw = read_data_table(io.BytesIO(uploaded_bytes))
-                        if df_raw.empty:
-                            st.error(f"Gagal baca data tabel: {uploaded.name}")
-                        else:
-                            add_to_session_cache(date_val, normalize_and_filter_df(df_raw))
-                            sukses_tanggal.append(str(date_val))
+                        pending.setdefault(digest, (uploaded.name, uploaded_bytes, []))[2].append(uploaded.file_id)
+                if pending:
+                    # File baru diparse paralel (atau diambil dari cache), lalu disimpan berurutan menurut tanggal laporan
+                    with st.spinner(f"Memproses {len(pending)} file..."), debug_profile("tiktok_daily"):
+                        results = ingest_uploads([(name, data, digest) for digest, (name, data, _) in pending.items()])
+                        for result in results:
+                            if not result["error"]:
+                                daily_store_put(result["date"], result["df"], result["digest"])
+                            for file_id in pending[result["digest"]][2]:
+                                ingested[file_id] = {"date": str(result["date"]), "error": result["error"]}
+                st.session_state["tiktok_daily_ingested"] = ingested
+                for uploaded in uploaded_files:
+                    outcome = ingested[uploaded.file_id]
+                    if outcome["error"]:
+                        st.error(f"{outcome['error']}: {uploaded.name}")
+                    else:
+                        sukses_tanggal.append(outcome["date"])
             if sukses_tanggal:
                 st.success(f"Berhasil menyimpan {len(sukses_tanggal)} dataset untuk tanggal: {', '.join(sukses_tanggal)}")
 
         with col2:
-            datasets = st.session_state.get("tiktok_daily_datasets", OrderedDict())
-            if not datasets:
+            store_index = daily_store_index()
+            if store_index.empty:
                 st.info("Cache kosong.")
             else:
                 st.write("**Datasets in cache**")
-                st.table(pd.DataFrame([{"date": k, "rows": len(v)} for k, v in datasets.items()]).set_index('date'))
-                to_remove = st.selectbox("Hapus tanggal (pilih)", [""] + list(datasets.keys()), key="tiktok_daily_remove")
+                st.table(store_index[["date", "rows"]].set_index('date'))
+                to_remove = st.selectbox("Hapus tanggal (pilih)", [""] + store_index["date"].tolist(), key="tiktok_daily_remove")
                 
                 # --- MENAMBAHKAN INCREMENT KEY SAAT HAPUS ---
                 if to_remove and st.button("Hapus tanggal", key="tiktok_daily_btn_rem"):
-                    remove_date_from_cache(to_remove)
+                    daily_store_remove(to_remove)
                     st.session_state["tiktok_uploader_key"] += 1 # Reset Uploader UI
                     st.rerun()
                     
                 # --- MENAMBAHKAN INCREMENT KEY SAAT CLEAR ALL ---
                 if st.button("Clear all cache", key="tiktok_daily_btn_clr"):
-                    clear_cache()
+                    daily_store_clear()
                     st.session_state["tiktok_uploader_key"] += 1 # Reset Uploader UI
                     st.rerun()
 
         st.markdown("---")
-        if not datasets: st.stop()
-
-        valid_dates = [pd.to_datetime(str(k).split('~')[0].strip(), errors='coerce').date() for k in datasets.keys()]
-        valid_dates = sorted([d for d in valid_dates if pd.notna(d)])
+        if store_index.empty: st.stop()
+
+        # Hanya rentang tanggal yang dipilih yang dimuat dari store
+        stored_dates = pd.to_datetime(store_index["report_date"].dropna()).dt.date
+        start_date = end_date = None
+        if not stored_dates.empty:
+            date_window = st.date_input(
+                "Rentang tanggal", value=(stored_dates.min(), stored_dates.max()),
+                min_value=stored_dates.min(), max_value=stored_dates.max(), key="tiktok_daily_window",
+            )
+            if isinstance(date_window, (tuple, list)) and date_window:
+                start_date, end_date = date_window[0], date_window[-1]
+        with debug_profile("tiktok_daily"):
+            totals, product_totals = daily_store_summaries(DAILY_STORE_PATH, daily_store_generation(), start_date, end_date)
+        # Tanggal yang tidak terbaca tidak ikut tampilan/export
+        totals = totals[totals["report_date"].notna()]
+        product_totals = product_totals[product_totals["report_date"].notna()]
+        if totals.empty: st.stop()
+        numeric_metrics = daily_numeric_metrics(totals)
+
+        valid_dates = sorted(set(pd.to_datetime(totals["report_date"]).dt.date))
         
         # Penamaan File Download
-        if len(valid_dates) >= 1:
-            start_date_str = valid_dates[0].strftime("%Y%m%d")
-            end_date_str = valid_dates[-1].strftime("%Y%m%d")
-            outname_compare = f"dailycompare_{start_date_str}_to_{end_date_str}.xlsx"
-        else:
-            outname_compare = "dailycompare_report.xlsx"
+        outname_compare = daily_compare_filename(valid_dates)
 
         if len(valid_dates) > 1:
             expected_days = (valid_dates[-1] - valid_dates[0]).days + 1
@@ -1793,27 +903,27 @@ def app_tiktok():
                 st.warning(f"⚠️ **Peringatan Data Bolong!** Ada tanggal yang terlewat: {missing_str}")
 
         st.subheader("📥 Export Laporan Akhir")
-        excel_bytes = build_product_sheets(datasets)
-        
-        if excel_bytes:
-            st.download_button("Download Excel Laporan (1 Sheet per Produk + Grafik)", excel_bytes, outname_compare, mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', key="tiktok_daily_dl_excel")
-        else:
-            st.info("Unggah file yang memiliki kolom Produk untuk membuat format Excel per-sheet.")
+        # Workbook per produk hanya dibuat saat diminta, sebagai job latar, dan dipakai ulang selama
+        # file dalam rentang tanggal tidak berubah
+        data_fingerprint = daily_store_fingerprint(start_date, end_date)
+        export_key = job_key("tiktok-daily-sheets", data_fingerprint, outname_compare)
+        export_job = panel_job("tiktok_daily", export_key)
+        export_status = job_status(export_job) if export_job is not None else None
+        if (export_status is None or export_status["status"] == "failed") and st.button("Siapkan Excel Laporan (1 Sheet per Produk + Grafik)", key="tiktok_daily_prepare_excel"):
+            export_job = queue_job("tiktok_daily", "tiktok-daily-sheets", export_key, product_totals, numeric_metrics, outname_compare)
+
+        if export_job is not None:
+            result = job_outcome(export_job, "Gagal membuat Excel: {}")
+            if result is not None and "excel" in result["files"]:
+                job_download("Download Excel Laporan (1 Sheet per Produk + Grafik)", export_job, "excel", result, mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', key="tiktok_daily_dl_excel")
+            elif result is not None:
+                st.info("Unggah file yang memiliki kolom Produk untuk membuat format Excel per-sheet.")
 
         st.markdown("---")
         
-        frames = []
-        for date_key, df in datasets.items():
-            parsed = pd.to_datetime(str(date_key).split('~')[0].strip(), errors='coerce')
-            if pd.notna(parsed):
-                d = df.copy()
-                d['date'] = parsed.date()
-                frames.append(d)
-                
-        if not frames: st.stop()
-        all_data = pd.concat(frames, ignore_index=True, sort=False)
-        numeric_metrics = [c for c in ALLOWED_METRICS if c in all_data.columns and c not in ('ID', 'Produk', 'Status')]
-        daftar_produk = sorted([p for p in all_data['Produk'].unique() if str(p).strip() not in ('nan', '', 'None')]) if 'Produk' in all_data.columns else []
+        product_daily = product_totals.assign(date=pd.to_datetime(product_totals["report_date"]).dt.date)
+        product_rows = product_row_index(data_fingerprint, product_daily)
+        daftar_produk = sorted([p for p in product_rows if str(p).strip() not in ('nan', '', 'None')])
 
         def show_charts(df_plot):
             if df_plot.empty: return st.info("Data tidak cukup untuk grafik.")
@@ -1824,28 +934,36 @@ def app_tiktok():
                         st.caption(f"**{metric}**")
                         st.line_chart(df_plot[[metric]])
 
-        tabs = st.tabs(["📊 Keseluruhan (All)"] + [f"🛍️ {p[:20]}..." if len(p) > 20 else f"🛍️ {p}" for p in daftar_produk])
+        tab_all, tab_produk = st.tabs(["📊 Keseluruhan (All)", f"🛍️ Per Produk ({len(daftar_produk)})"])
         
-        with tabs[0]:
-            agg = build_daily_aggregate(datasets)
+        with tab_all:
+            with debug_profile("tiktok_daily"):
+                agg = build_daily_aggregate(totals, numeric_metrics)
             if agg.empty: st.warning("Tidak ada data numerik.")
             else:
                 sub1, sub2 = st.tabs(["🧮 Tabel Data", "📈 Grafik Tren"])
                 with sub1:
-                    st.write(style_daily_aggregate(agg).to_html(), unsafe_allow_html=True)
+                    with debug_profile("tiktok_daily"):
+                        st.write(daily_aggregate_html(data_fingerprint, "", agg), unsafe_allow_html=True)
                     st.download_button("📥 Download CSV (All)", agg.reset_index().to_csv(index=False), "daily_aggregate_all.csv", mime='text/csv', key="tiktok_daily_dl_csv")
                 with sub2: show_charts(agg)
 
-        for i, produk_name in enumerate(daftar_produk):
-            with tabs[i + 1]:
-                df_produk = all_data[all_data['Produk'] == produk_name]
+        # Hanya produk yang dipilih yang dihitung & dirender (bukan satu tab penuh per produk)
+        with tab_produk:
+            produk_name = st.selectbox("Pilih produk", daftar_produk, key="tiktok_daily_produk") if daftar_produk else None
+            if produk_name is None: st.info("Tidak ada data produk.")
+            else:
+                df_produk = product_daily.iloc[product_rows[produk_name]]
                 agg_produk = df_produk.groupby('date')[numeric_metrics].sum().sort_index()
                 if agg_produk.empty: st.info("Tidak ada data numerik.")
                 else:
                     sub1, sub2 = st.tabs(["🧮 Tabel Data", "📈 Grafik Tren"])
-                    with sub1: st.write(style_daily_aggregate(agg_produk).to_html(), unsafe_allow_html=True)
+                    with sub1: st.write(daily_aggregate_html(data_fingerprint, produk_name, agg_produk), unsafe_allow_html=True)
                     with sub2: show_charts(agg_produk)
 
+        # Export Excel per produk berjalan di thread latar, jadi tidak ikut rekaman ini
+        debug_panel("tiktok_daily")
+
 # -----------------------------
 # APP 4: Guide / Panduan
 # -----------------------------
@@ -1935,6 +1053,16 @@ def main():
         key="page" 
     )
 
+    # Mode debug: nomor rerun dipakai debug_profile untuk menggabungkan blok dalam satu rerun
+    st.session_state["debug_run"] = st.session_state.get("debug_run", 0) + 1
+    st.sidebar.toggle("🔧 Debug: profil tahap", value=APP_PROFILE in ("1", "true", "memory"), key="debug_profile")
+    if debug_enabled():
+        st.sidebar.checkbox("Ukur puncak memori (lebih lambat)", value=APP_PROFILE == "memory", key="debug_profile_memory")
+    # Dispatcher dinyalakan di setiap run: job yang dikembalikan ke antrian setelah restart tetap dikerjakan
+    # walaupun halaman hanya menampilkan job lama (panel_job) tanpa mengajukan job baru
+    job_runner()
+    sidebar_jobs()
+
     # Render navbar atas
     navbar()
 
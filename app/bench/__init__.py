@@ -0,0 +1,4 @@
+# bench/__init__.py
+# Benchmark pipeline processing (Shopee, Meta, TikTok) dengan file export sintetis:
+# generators.py membuat input, pipelines.py menjalankan & mengukur tiap tahap, __main__.py = CLI.
+# Jalankan dari folder app/: python -m bench --help
@@ -0,0 +1,187 @@
+# bench/__main__.py
+# Benchmark pipeline processing dengan file export sintetis. Jalankan dari folder app/, mis.:
+#   python -m bench                                        # semua pipeline, 1rb & 10rb baris
+#   python -m bench --rows 1000 100000 1000000 --pipelines shopee-ads meta-cpas
+#   python -m bench --compare bench/results/<file sebelumnya>.json
+# Hasil disimpan sebagai JSON di bench/results/ (nama berisi commit git), jadi dua commit bisa dibandingkan
+# dengan --compare. Waktu = run tercepat dari --repeat; memori diukur di run terpisah dengan tracemalloc
+# (jauh lebih lambat, jadi hanya untuk ukuran <= --memory-max-rows). Input hasil generator disimpan
+# di bench/.inputs/ agar ukuran besar tidak dibuat ulang tiap kali.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from bench.generators import GENERATOR_VERSION
+from bench.pipelines import PIPELINES, run_pipeline
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ROWS = [1000, 10000]
+
+# -----------------------------
+# INPUT (generator + cache di disk)
+# -----------------------------
+
+def load_inputs(pipeline: str, rows: int, seed: int, cache_dir) -> tuple:
+    """Return (files, detik generate atau None bila dari cache)."""
+    generate, _ = PIPELINES[pipeline]
+    if cache_dir is None:
+        start = time.perf_counter()
+        return generate(rows, seed), time.perf_counter() - start
+
+    folder = os.path.join(cache_dir, f"{generate.__name__}_{rows}_s{seed}_v{GENERATOR_VERSION}")
+    if os.path.isdir(folder):
+        files = []
+        for name in sorted(os.listdir(folder)):
+            with open(os.path.join(folder, name), "rb") as f:
+                files.append((name, f.read()))
+        return files, None
+
+    start = time.perf_counter()
+    files = generate(rows, seed)
+    elapsed = time.perf_counter() - start
+    tmp = folder + ".tmp"
+    os.makedirs(tmp, exist_ok=True)
+    for name, data in files:
+        with open(os.path.join(tmp, name), "wb") as f:
+            f.write(data)
+    os.replace(tmp, folder)
+    return files, elapsed
+
+# -----------------------------
+# RUN & HASIL
+# -----------------------------
+
+def git_commit() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=BENCH_DIR, capture_output=True, text=True, timeout=30).stdout.strip()
+        except Exception:
+            return ""
+    return {"commit": git("rev-parse", "--short", "HEAD") or None, "dirty": bool(git("status", "--porcelain", "--", ".."))}
+
+def bench_one(pipeline: str, rows: int, args) -> dict:
+    files, generate_s = load_inputs(pipeline, rows, args.seed, args.input_cache)
+    runs = [run_pipeline(pipeline, files) for _ in range(args.repeat)]
+    fastest = min(runs, key=lambda r: r["total"]["wall_s"])
+    result = {
+        "pipeline": pipeline, "rows": rows, "seed": args.seed,
+        "input_files": len(files), "input_bytes": sum(len(data) for _, data in files), "generate_s": generate_s,
+        "rows_out": fastest["rows_out"],
+        "wall_s": fastest["total"]["wall_s"], "cpu_s": fastest["total"]["cpu_s"],
+        "wall_s_runs": [r["total"]["wall_s"] for r in runs],
+        "stages": {s: {"wall_s": v["wall_s"], "cpu_s": v["cpu_s"], "calls": v["calls"]} for s, v in fastest["stages"].items()},
+        "peak_mb": None,
+    }
+    if rows <= args.memory_max_rows:
+        mem = run_pipeline(pipeline, files, trace_memory=True)
+        result["peak_mb"] = mem["total"]["peak_mb"]
+        for s, v in mem["stages"].items():
+            result["stages"].setdefault(s, {})["peak_mb"] = v["peak_mb"]
+    return result
+
+def format_result(r: dict) -> str:
+    stages = "  ".join(f"{s} {v['wall_s']:.2f}" for s, v in r["stages"].items() if v.get("wall_s", 0) >= 0.005)
+    peak = f"{r['peak_mb']:.1f} MiB" if r["peak_mb"] is not None else "-"
+    return (f"{r['pipeline']:<17} {r['rows']:>8} baris  {r['wall_s']:7.2f} s (median {statistics.median(r['wall_s_runs']):.2f})"
+            f"  puncak {peak:>10}  | {stages}")
+
+# -----------------------------
+# BANDINGKAN DENGAN HASIL SEBELUMNYA
+# -----------------------------
+
+def compare(baseline: dict, current: dict, threshold: float, min_seconds: float) -> list:
+    """Cetak rasio waktu per (pipeline, baris) & tahap; return daftar regresi (lebih lambat > threshold)."""
+    base_index = {(r["pipeline"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nDibanding {baseline['git'].get('commit')} ({baseline['created']}):")
+    for r in current["results"]:
+        b = base_index.get((r["pipeline"], r["rows"]))
+        if b is None: continue
+        pairs = [("total", b["wall_s"], r["wall_s"])] + [
+            (s, b["stages"][s]["wall_s"], v["wall_s"]) for s, v in r["stages"].items() if s in b["stages"] and "wall_s" in v
+        ]
+        parts = []
+        for name, old, new in pairs:
+            ratio = new / old if old > 0 else float("inf") if new > 0 else 1.0
+            slower = ratio > 1 + threshold and new - old > min_seconds
+            if slower: regressions.append(f"{r['pipeline']} {r['rows']} {name}: {old:.2f}s -> {new:.2f}s")
+            if name == "total" or slower or ratio < 1 - threshold:
+                parts.append(f"{name} {old:.2f}->{new:.2f}s ({ratio:.2f}x){' REGRESI' if slower else ''}")
+        print(f"  {r['pipeline']:<17} {r['rows']:>8}  " + "  ".join(parts))
+    return regressions
+
+# -----------------------------
+# MAIN
+# -----------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark pipeline processing (waktu & memori per tahap).")
+    parser.add_argument("--pipelines", nargs="+", choices=list(PIPELINES), default=list(PIPELINES), metavar="NAMA",
+                        help=f"pipeline yang dijalankan (default semua: {', '.join(PIPELINES)})")
+    parser.add_argument("--rows", nargs="+", type=int, default=DEFAULT_ROWS, help="jumlah baris input (default: 1000 10000)")
+    parser.add_argument("--repeat", type=int, default=3, help="run per ukuran, diambil yang tercepat (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory-max-rows", type=int, default=20_000,
+                        help="run tracemalloc hanya untuk ukuran <= ini (default: 20000; 0 = tanpa memori)")
+    parser.add_argument("--input-cache", default=os.path.join(BENCH_DIR, ".inputs"),
+                        help="folder cache file input (default: bench/.inputs)")
+    parser.add_argument("--no-input-cache", dest="input_cache", action="store_const", const=None)
+    parser.add_argument("--out", help="file JSON hasil (default: bench/results/<waktu>_<commit>.json)")
+    parser.add_argument("--compare", help="JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=0.2, help="batas regresi relatif (default: 0.2 = 20%% lebih lambat)")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="selisih minimum agar dihitung regresi (default: 0.05)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit code 1 jika ada regresi pada --compare")
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    created = datetime.now()
+    report = {
+        "created": created.isoformat(timespec="seconds"),
+        "git": git_commit(),
+        "environment": {
+            "python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(),
+            "pandas": pd.__version__, "numpy": np.__version__, "openpyxl": openpyxl.__version__,
+        },
+        "settings": {"repeat": args.repeat, "seed": args.seed, "memory_max_rows": args.memory_max_rows,
+                     "generator_version": GENERATOR_VERSION},
+        "results": [],
+    }
+    for rows in args.rows:
+        for pipeline in args.pipelines:
+            result = bench_one(pipeline, rows, args)
+            report["results"].append(result)
+            print(format_result(result), flush=True)
+
+    out = args.out or os.path.join(
+        BENCH_DIR, "results", f"{created:%Y%m%d-%H%M%S}_{report['git']['commit'] or 'nogit'}{'-dirty' if report['git']['dirty'] else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"Hasil: {out}")
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} regresi:", *regressions, sep="\n  ")
+            if args.fail_on_regression: return 1
+    return 0
+
+sys.exit(main())
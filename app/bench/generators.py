@@ -0,0 +1,254 @@
+# bench/generators.py
+# Generator file export sintetis yang deterministik (seed sama -> bytes sama), meniru format asli:
+# - Shopee Performa Produk (Analitik): baris total produk "-" + baris variasi "Warna,Ukuran", angka bertitik ribuan
+# - Shopee Out Platform: sheet info + "Performa Produk" per Channel dengan kolom "Produk" ganda
+# - Shopee Ads CSV: baris metadata toko/periode sebelum header "Nama Iklan", termasuk baris "Grup Iklan"
+# - Meta CPAS (header baris 1) & WhatsApp Ads (header baris 3, ada kolom tanpa nama)
+# - TikTok Fixer (ID panjang sebagai teks, desimal koma) & TikTok harian (tanggal di A1, header baris 3)
+# Semua generator: (rows, seed) -> [(nama file, bytes), ...]. Workbook ditulis write-only agar 1jt baris tetap muat.
+
+import io
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from openpyxl import Workbook
+
+from processing.shopee import NUMERIC_COLS_GUESS
+from processing.tiktok_daily import ALLOWED_METRICS
+
+# Naikkan jika output generator berubah (cache input di bench/.inputs ikut berganti)
+GENERATOR_VERSION = 1
+
+WARNA = ["Hitam", "Putih", "Navy", "Sage", "Mocca", "Dusty Pink", "Maroon", "Army", "Lilac", "Cream"]
+UKURAN = ["S", "M", "L", "XL", "XXL", "All Size", "Jumbo"]
+MODEL = ["Gamis", "Dress", "Tunik", "Rok Plisket", "Khimar", "Set Koko", "Kaftan", "Abaya"]
+BAHAN = ["Rayon", "Crinkle", "Wolfis", "Ceruty Babydoll", "Linen", "Katun Jepang", "Moscrepe"]
+TEMA = ["Busui Friendly", "Lebaran", "Motif Bunga", "Polos Premium", "Kekinian", "Syari Jumbo"]
+
+def _xlsx_bytes(wb: Workbook) -> bytes:
+    # openpyxl mencatat waktu simpan (docProps/core.xml & header zip) -> disamakan agar bytes deterministik
+    raw, out = io.BytesIO(), io.BytesIO()
+    wb.save(raw)
+    with zipfile.ZipFile(raw) as zin, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "docProps/core.xml":
+                data = re.sub(rb"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ", b"2026-01-01T00:00:00Z", data)
+            zout.writestr(zipfile.ZipInfo(item.filename, date_time=(2026, 1, 1, 0, 0, 0)), data, zipfile.ZIP_DEFLATED)
+    return out.getvalue()
+
+def _product_names(rng, n: int) -> np.ndarray:
+    # Nama produk panjang ala Shopee: "Gamis Rayon 123 Busui Friendly - Dress Muslim Wanita"
+    model, bahan, tema = rng.choice(MODEL, n), rng.choice(BAHAN, n), rng.choice(TEMA, n)
+    return np.array([f"{m} {b} {i} {t} - Dress Muslim Wanita" for i, (m, b, t) in enumerate(zip(model, bahan, tema))], dtype=object)
+
+def _idr_text(values) -> list:
+    # Angka rupiah seperti export Shopee: "1.234.500"
+    return [f"{int(v):,}".replace(",", ".") for v in values]
+
+# -----------------------------
+# SHOPEE
+# -----------------------------
+
+def shopee_performa_produk(rows: int, seed: int = 0) -> list:
+    """Analitik Produk: tiap produk = baris total ("-") lalu 0-12 baris variasi, sampai `rows` baris data."""
+    rng = np.random.default_rng(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Performa Produk")
+    rate_cols = ["Tingkat Konversi (Pesanan Siap Dikirim)", "Tingkat Pengunjung Melihat Tanpa Membeli"]
+    ws.append(["Kode Produk", "Produk", "Status Produk Saat Ini", "Kode Variasi", "Nama Variasi", "Status Variasi Saat Ini",
+               "SKU Induk"] + NUMERIC_COLS_GUESS + rate_cols)
+
+    n_products = max(1, rows // 7)
+    names = _product_names(rng, n_products)
+    written, p = 0, 0
+    while written < rows:
+        kode = str(2_000_000_000 + p * 37) if p % 5 else f"KP{p:06d}"
+        nama, sku = names[p % n_products], (f"SKU-{p:05d}" if p % 9 else "")
+        n_var = min(int(rng.integers(0, 13)), rows - written - 1)
+        # Baris total produk: angka = jumlah variasinya (di export asli juga begitu)
+        var_numbers = rng.integers(0, 400, size=(n_var, len(NUMERIC_COLS_GUESS)))
+        var_numbers[:, [9, 12]] *= 85_000
+        total = var_numbers.sum(axis=0) if n_var else rng.integers(0, 400, len(NUMERIC_COLS_GUESS))
+        for numbers, variasi in [(total, "-")] + [
+            (var_numbers[v], f"{rng.choice(WARNA)},{rng.choice(UKURAN)}") for v in range(n_var)
+        ]:
+            values = [str(int(x)) for x in numbers]
+            values[9], values[12] = _idr_text([numbers[9], numbers[12]])
+            rates = [f"{x:.2f}%".replace(".", ",") for x in rng.uniform(0, 25, len(rate_cols))]
+            kode_variasi = "-" if variasi == "-" else f"{kode}{written % 97:02d}"
+            ws.append([kode, nama, "Normal", kode_variasi, variasi, "Normal", sku] + values + rates)
+            written += 1
+        p += 1
+    return [("performa_produk.xlsx", _xlsx_bytes(wb))]
+
+def shopee_out_platform(rows: int, seed: int = 0) -> list:
+    """Out Platform: sheet "Ringkasan" + "Performa Produk" per Channel; angka berformat titik/koma Indonesia."""
+    rng = np.random.default_rng(seed)
+    wb = Workbook(write_only=True)
+    info = wb.create_sheet("Ringkasan")
+    info.append(["Laporan Performa Iklan di Luar Platform"])
+    info.append(["Periode", "01-01-2026 - 31-01-2026"])
+    info.append(["Total Biaya", "12.345.678,50"])
+
+    ws = wb.create_sheet("Performa Produk")
+    ws.append(["Channel", "Kode Produk", "Produk", "Produk", "Produk Ditambahkan ke Keranjang", "Penjualan (IDR)",
+               "Biaya (IDR)", "ROAS", "Klik", "CTR"])
+    names = _product_names(rng, max(1, rows // 4))
+    channel = rng.choice(["Sales Iklan Meta", "Traffic Meta", "Instagram Ads", "Google Ads", "TikTok Ads"], rows)
+    idx = rng.integers(0, len(names), rows)
+    sold, atc = rng.integers(0, 4, rows) * (rng.random(rows) < 0.4), rng.integers(0, 6, rows) * (rng.random(rows) < 0.5)
+    gmv, cost = rng.integers(0, 9_000_000, rows), rng.uniform(0, 500_000, rows)
+    roas, clicks, ctr = rng.uniform(0, 30, rows), rng.integers(0, 5000, rows), rng.uniform(0, 8, rows)
+    for i in range(rows):
+        ws.append([
+            str(channel[i]), f"KP{idx[i]:06d}", names[idx[i]], int(sold[i]), int(atc[i]), _idr_text([gmv[i]])[0],
+            f"{cost[i]:,.2f}".replace(",", "_").replace(".", ",").replace("_", "."), f"{roas[i]:.2f}".replace(".", ","),
+            int(clicks[i]), f"{ctr[i]:.2f}%".replace(".", ","),
+        ])
+    return [("out_platform.xlsx", _xlsx_bytes(wb))]
+
+SHOPEE_ADS_COLUMNS = [
+    "Urutan", "Nama Iklan", "Status", "Jenis Iklan", "Kode Produk", "Tampilan Iklan", "Mode Bidding",
+    "Penempatan Iklan", "Tanggal Mulai", "Tanggal Selesai", "Dilihat", "Jumlah Klik", "Persentase Klik",
+    "Konversi", "Produk Terjual", "Omzet Penjualan", "Penjualan Langsung (GMV Langsung)", "Biaya",
+    "Efektifitas Iklan", "Persentase Biaya Iklan terhadap Penjualan dari Iklan (ACOS)",
+]
+
+def shopee_ads_csv(rows: int, seed: int = 0) -> list:
+    """CSV Shopee Ads: 6 baris metadata sebelum header; ~2% baris "Grup Iklan", sebagian iklan tanpa biaya/penjualan."""
+    rng = np.random.default_rng(seed)
+    names = _product_names(rng, max(1, rows // 3))
+    lines = [
+        "Laporan Iklan Shopee - Semua Iklan",
+        "Nama Pengguna,toko_gamis_official",
+        "Nama Toko,Toko Gamis Official",
+        "Periode,01/01/2026 - 31/01/2026",
+        "Tanggal Laporan Dibuat,01/02/2026 09:15",
+        "",
+        ",".join(SHOPEE_ADS_COLUMNS),
+    ]
+    is_grup = rng.random(rows) < 0.02
+    idx = rng.integers(0, len(names), rows)
+    views, clicks = rng.integers(0, 200_000, rows), rng.integers(0, 5_000, rows)
+    sold = rng.integers(0, 40, rows) * (rng.random(rows) < 0.6)
+    gmv = np.where(rng.random(rows) < 0.1, 0, sold * rng.integers(60_000, 250_000, rows))
+    cost = np.where(rng.random(rows) < 0.05, 0, rng.uniform(0, 400_000, rows).round(0))
+    roas = np.where(cost > 0, np.round(gmv / np.maximum(cost, 1), 2), 0)
+    for i in range(rows):
+        nama = f"Grup Iklan {i}" if is_grup[i] else f'"{names[idx[i]]}"'
+        roas_text = "-" if is_grup[i] and i % 3 else f"{roas[i]:.2f}"
+        lines.append(",".join([
+            str(i + 1), nama, "Berjalan" if i % 7 else "Dijeda", "Iklan Produk", f"{2_000_000_000 + idx[i] * 37}",
+            "Pencarian & Rekomendasi", "GMV Max" if i % 4 == 0 else "Manual", "Semua", "01/12/2025", "Tidak Terbatas",
+            str(views[i]), str(clicks[i]), f"{clicks[i] / max(views[i], 1) * 100:.2f}%", str(sold[i]), str(sold[i]),
+            str(gmv[i]), str(gmv[i]), f"{cost[i]:.0f}", roas_text,
+            f"{cost[i] / gmv[i] * 100:.2f}%" if gmv[i] else "-",
+        ]))
+    return [("shopee_ads.csv", ("\n".join(lines) + "\n").encode("utf-8"))]
+
+# -----------------------------
+# META
+# -----------------------------
+
+META_COLUMNS = [
+    "Nama kampanye", "Nama set iklan", "Awal pelaporan", "Akhir pelaporan", "Jangkauan", "Impresi", "Frekuensi",
+    "Jumlah dibelanjakan (IDR)", "CPM (Biaya Per 1.000 Tayangan)", "Klik tautan", "CTR (Rasio Klik Tayang Tautan)",
+    "Tingkat klik tayang outbound", "Hasil", "Biaya per hasil", "ROAS Pembelian Khusus untuk Item Bersama", "%ATC",
+]
+
+def _meta_rows(rng, rows: int):
+    kampanye = rng.choice(["Sales Katalog Gamis", "Konversi WA Lebaran", "Profile Visit IG", "Traffic Landing Page",
+                           "Visit Shopee Dress"], rows)
+    jangkauan = rng.integers(100, 400_000, rows)
+    impresi = (jangkauan * rng.uniform(1, 4, rows)).astype(int)
+    spend = rng.integers(0, 3_000_000, rows)
+    hasil = rng.integers(0, 300, rows)
+    mulai = date(2026, 1, 1)
+    for i in range(rows):
+        yield [
+            str(kampanye[i]), f"Set {i % 250} - Wanita 25-45", datetime(2026, 1, 1) + timedelta(days=int(i % 28)),
+            mulai + timedelta(days=int(i % 28) + 6), int(jangkauan[i]), int(impresi[i]), round(impresi[i] / jangkauan[i], 2),
+            int(spend[i]), round(spend[i] / max(impresi[i], 1) * 1000, 2), int(hasil[i] * 3),
+            round(float(rng.uniform(0, 3)), 3), float(rng.uniform(0, 3)), int(hasil[i]),
+            round(spend[i] / hasil[i], 0) if hasil[i] else None, round(float(rng.uniform(0, 25)), 2) if i % 6 else None,
+            round(float(rng.uniform(0, 60)), 2),
+        ]
+
+def meta_cpas(rows: int, seed: int = 0) -> list:
+    """Meta CPAS (Advantage+ Catalog): header di baris 1, seperti yang dibaca read_cpas_report."""
+    rng = np.random.default_rng(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Raw Data Report")
+    ws.append(META_COLUMNS)
+    for row in _meta_rows(rng, rows): ws.append(row)
+    return [("meta_cpas.xlsx", _xlsx_bytes(wb))]
+
+def meta_wa(rows: int, seed: int = 0) -> list:
+    """Meta WhatsApp Ads: judul & periode di baris 1-2, header di baris 3, plus satu kolom tanpa nama."""
+    rng = np.random.default_rng(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Raw Data Report")
+    ws.append(["Laporan Iklan WhatsApp - Custom Report"])
+    ws.append(["Periode: 01 Jan 2026 - 31 Jan 2026"])
+    ws.append(META_COLUMNS[:4] + [None] + META_COLUMNS[4:])
+    for row in _meta_rows(rng, rows): ws.append(row[:4] + [None] + row[4:])
+    return [("meta_wa.xlsx", _xlsx_bytes(wb))]
+
+# -----------------------------
+# TIKTOK
+# -----------------------------
+
+def tiktok_fixer(rows: int, seed: int = 0) -> list:
+    """Export iklan TikTok: ID Campaign 19 digit (teks), angka & persen berdesimal koma, status otorisasi."""
+    rng = np.random.default_rng(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Data")
+    ws.append(["Nama kampanye", "ID Campaign", "Status", "Biaya", "Pendapatan kotor", "ROI", "Impresi", "Klik",
+               "Tingkat klik iklan produk", "Rasio konversi iklan", "Rasio tayang video iklan 2 detik", "Pesanan"])
+    biaya = rng.uniform(0, 2_000_000, rows) * (rng.random(rows) < 0.85)
+    roi = rng.choice([0, 0.8, 3.5, 9.99, 10, 14.2, 25], rows) * (biaya > 0)
+    status = rng.choice(["Aktif", "Tidak aktif", "Perlu otorisasi"], rows, p=[0.7, 0.25, 0.05])
+    for i in range(rows):
+        ws.append([
+            f"GMV Max Gamis {i % 300}", str(1_799_000_000_000_000_000 + i * 7919), str(status[i]),
+            f"{biaya[i]:.2f}".replace(".", ","), f"{biaya[i] * roi[i]:.2f}".replace(".", ","),
+            f"{roi[i]:.2f}".replace(".", ","), str(int(biaya[i] / 12)), str(int(biaya[i] / 900)),
+            f"{rng.uniform(0, 6):.2f}%".replace(".", ","), f"{rng.uniform(0, 15):.2f}%".replace(".", ","),
+            f"{rng.uniform(0, 40):.2f}%".replace(".", ","), int(biaya[i] * roi[i] / 150_000),
+        ])
+    return [("tiktok_ads.xlsx", _xlsx_bytes(wb))]
+
+TIKTOK_DAILY_DAYS = 7
+TIKTOK_DAILY_PRODUCTS = 300  # jumlah produk toko tidak ikut membesar dengan jumlah baris
+
+def tiktok_daily(rows: int, seed: int = 0) -> list:
+    """TikTok harian: `rows` baris dibagi ke TIKTOK_DAILY_DAYS file; tanggal di A1 (datetime/teks), header baris 3."""
+    rng = np.random.default_rng(seed)
+    per_file = max(1, rows // TIKTOK_DAILY_DAYS)
+    products = _product_names(rng, max(1, min(per_file, TIKTOK_DAILY_PRODUCTS)))
+    columns = ALLOWED_METRICS + ["Komisi afiliasi"]
+    files = []
+    for d in range(TIKTOK_DAILY_DAYS):
+        day = datetime(2026, 1, 1) + timedelta(days=d)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Data")
+        ws.append([day if d % 2 == 0 else day.strftime("%Y-%m-%d")])
+        ws.append(["Data diperbarui setiap hari pukul 09.00 (GMT+7)"])
+        ws.append(columns)
+        idx = rng.integers(0, len(products), per_file)
+        # Nilai dibuat per kolom sekaligus, lalu ditulis per baris
+        values = []
+        for c in columns:
+            if c == "ID": values.append([str(1_729_000_000_000_000_000 + int(i)) for i in idx])
+            elif c == "Produk": values.append(products[idx])
+            elif c == "Status": values.append(np.where(np.arange(per_file) % 9 == 0, "Nonaktif", "Aktif").tolist())
+            elif "Rasio" in c or "Persentase" in c: values.append([f"{x:.2f}%" for x in rng.uniform(0, 12, per_file)])
+            elif c.startswith("GMV"): values.append([f"{x:,}" for x in rng.integers(0, 5_000_000, per_file).tolist()])
+            else: values.append(rng.integers(0, 5000, per_file).tolist())
+        for row in zip(*values):
+            ws.append(list(row))
+        files.append((f"tiktok_harian_{day:%Y%m%d}.xlsx", _xlsx_bytes(wb)))
+    return files
@@ -0,0 +1,128 @@
+# bench/pipelines.py
+# Pipeline per tool (urutan panggilan sama dengan halaman app), diukur dengan processing/profiling.py.
+# Tahap: parse (file -> DataFrame), transform (olah data), style (aturan warna/Styler preview),
+# write (susun xlsx/csv), store (SQLite harian). Fungsi processing sudah ditandai @profiled, jadi helper
+# style/write di dalam fungsi gabungan (mis. build_ads_report) masuk ke tahapnya sendiri; di sini hanya
+# langkah app yang tidak ada di processing (preview Styler) yang dibungkus profile_stage.
+# Waktu eksklusif: tahap luar tidak ikut menghitung tahap di dalamnya. Puncak memori per tahap = kenaikan
+# tertinggi satu panggilan di atas memori awalnya, termasuk tahap di dalamnya.
+
+import os
+import tempfile
+
+from processing.daily_store import daily_store_product_totals, daily_store_put, daily_store_totals, file_digest
+from processing.kpi import META_CPAS_RULES, META_WA_RULES, kpi_style_matrix, kpi_styler
+from processing.meta import excel_highlight_cpas, excel_highlight_wa, format_cell_for_preview, read_cpas_report, read_wa_report
+from processing.profiling import profile_session, profile_stage, stage_totals
+from processing.shopee import (
+    SHOPEE_ADS_MODES, build_ads_report, load_uploaded_csv_bytes, out_platform_report, prepare_variasi_base,
+    process_dataframe, read_analitik_file,
+)
+from processing.shortener import _short_nama_iklan_text
+from processing.tiktok_daily import (
+    build_daily_aggregate, build_product_sheets, daily_numeric_metrics, normalize_and_filter_df, read_daily_upload,
+    style_daily_aggregate,
+)
+from processing.tiktok_fixer import build_fixer_workbook, build_roi_workbook, read_fixer_workbook
+from processing.xlsx import css_to_xlsx_style
+from bench import generators
+
+def reset_caches():
+    # Tiap run dimulai dingin, seperti upload pertama di proses app yang baru
+    _short_nama_iklan_text.cache_clear()
+    css_to_xlsx_style.cache_clear()
+
+# -----------------------------
+# PIPELINE (files = [(nama, bytes)]) -> jumlah baris hasil
+# -----------------------------
+
+def run_shopee_analitik(files):
+    (name, data), = files
+    base = prepare_variasi_base(read_analitik_file(data, name))
+    # App menjalankan kedua mode paralel (process_variasi_modes); di sini berurutan agar tahap tidak tumpang tindih
+    return sum(len(process_dataframe(base, mode)[0]) for mode in ("warna", "ukuran"))
+
+def run_shopee_out(files):
+    (_, data), = files
+    return len(out_platform_report(data)["sorted"])
+
+def _run_shopee_ads(files, csv_mode):
+    (_, data), = files
+    df = load_uploaded_csv_bytes(data)
+    build_ads_report(df, csv_mode)
+    return len(df)
+
+def run_shopee_ads(files):
+    return _run_shopee_ads(files, SHOPEE_ADS_MODES[0])
+
+def run_shopee_ads_grup(files):
+    return _run_shopee_ads(files, SHOPEE_ADS_MODES[1])
+
+def _run_meta(files, read, rules, export):
+    (_, data), = files
+    df, _ = read(data)
+    css = kpi_style_matrix(df, rules)
+    # Preview halaman Meta: Styler + format per kolom (st.dataframe merender display value yang sama)
+    with profile_stage("style", "preview Styler"):
+        styler = kpi_styler(df.style, css).format({col: (lambda v, c=col: format_cell_for_preview(v, c)) for col in df.columns})
+        styler.to_html()
+    export(df, css)
+    return len(df)
+
+def run_meta_cpas(files):
+    return _run_meta(files, read_cpas_report, META_CPAS_RULES, excel_highlight_cpas)
+
+def run_meta_wa(files):
+    return _run_meta(files, read_wa_report, META_WA_RULES, excel_highlight_wa)
+
+def run_tiktok_fixer(files):
+    (_, data), = files
+    df, _ = read_fixer_workbook(data)
+    build_fixer_workbook(df)
+    return len(df)
+
+def run_tiktok_fixer_roi(files):
+    (_, data), = files
+    df, _ = read_fixer_workbook(data)
+    return len(build_roi_workbook(df)[1])
+
+def run_tiktok_daily(files):
+    # Alur Daily Ads Comparator: ingest semua file ke store baru, ringkasan, tabel HTML & Excel per produk
+    rows = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "tiktok_daily.sqlite")
+        for _, data in files:
+            date_val, df_raw = read_daily_upload(data)
+            df = normalize_and_filter_df(df_raw)
+            daily_store_put(date_val, df, file_digest(data), path=store)
+            rows += len(df)
+        totals = daily_store_totals(path=store)
+        product_totals = daily_store_product_totals(path=store)
+        numeric_metrics = daily_numeric_metrics(totals)
+        agg = build_daily_aggregate(totals, numeric_metrics)
+        with profile_stage("style", "preview Styler"):
+            style_daily_aggregate(agg).to_html()
+        build_product_sheets(product_totals, numeric_metrics)
+    return rows
+
+# nama -> (generator input, fungsi pipeline)
+PIPELINES = {
+    "shopee-analitik": (generators.shopee_performa_produk, run_shopee_analitik),
+    "shopee-out": (generators.shopee_out_platform, run_shopee_out),
+    "shopee-ads": (generators.shopee_ads_csv, run_shopee_ads),
+    "shopee-ads-grup": (generators.shopee_ads_csv, run_shopee_ads_grup),
+    "meta-cpas": (generators.meta_cpas, run_meta_cpas),
+    "meta-wa": (generators.meta_wa, run_meta_wa),
+    "tiktok-fixer": (generators.tiktok_fixer, run_tiktok_fixer),
+    "tiktok-fixer-roi": (generators.tiktok_fixer, run_tiktok_fixer_roi),
+    "tiktok-daily": (generators.tiktok_daily, run_tiktok_daily),
+}
+
+def run_pipeline(name: str, files: list, trace_memory: bool = False) -> dict:
+    """Satu run pipeline -> {"rows_out", "total": {...}, "stages": {tahap: {...}}} (waktu detik, memori MiB)."""
+    _, run = PIPELINES[name]
+    reset_caches()
+    with profile_session(f"bench {name}", memory=trace_memory) as trace:
+        rows_out = run(files)
+    total = {"wall_s": trace["wall_s"], "cpu_s": trace["cpu_s"], "peak_mb": trace["peak_mb"] or 0.0}
+    return {"rows_out": rows_out, "total": total, "stages": stage_totals(trace)}
@@ -0,0 +1,67 @@
+# processing/__init__.py
+# Fungsi pengolahan data tanpa Streamlit (bytes masuk, DataFrame/bytes keluar), dipakai halaman app
+# dan CLI batch (python -m processing, lihat processing/cli.py).
+
+from processing.excel_io import excel_cell_value, read_sheet_rows, rows_to_frame
+from processing.numbers import parse_numeric
+from processing.profiling import profiled, profile_stage, profile_session, profile_table, stage_totals
+from processing.xlsx import streaming_workbook, xlsx_cell, write_frame, css_matrix_to_xlsx, workbook_bytes
+from processing.kpi import (
+    kpi_rule_hits, kpi_style_matrix, kpi_row_labels, kpi_styler, tiktok_roi_rules,
+    META_CPAS_RULES, META_WA_RULES, SHOPEE_IKLAN_STYLE_RULES, SHOPEE_KATEGORI_RULES,
+)
+from processing.shortener import short_nama_iklan, shorten_many, short_name_cache_stats
+from processing.shopee import (
+    SHOPEE_ADS_MODES, out_platform_report, read_analitik_file, process_variasi_modes,
+    load_uploaded_csv_bytes, build_ads_report, clean_shopee_link,
+)
+from processing.meta import (
+    format_cell_for_preview, read_cpas_report, read_wa_report, report_filename,
+    excel_highlight_cpas, excel_highlight_wa,
+)
+from processing.tiktok_fixer import (
+    find_id_column, fix_decimal_commas, read_fixer_workbook, roi_columns, build_roi_workbook, build_fixer_workbook,
+)
+from processing.tiktok_daily import (
+    ALLOWED_METRICS, PERCENT_NAME_KEYWORDS, date_from_a1, read_daily_upload,
+    normalize_and_filter_df, ingest_daily_file, ingest_daily_files, sort_daily_results,
+    daily_numeric_metrics, daily_compare_filename, build_daily_aggregate, style_daily_aggregate, build_product_sheets,
+)
+from processing.daily_store import (
+    DAILY_STORE_PATH, file_digest, daily_store_put, daily_store_find_hash, daily_store_index,
+    daily_store_load, daily_store_totals, daily_store_product_totals, daily_store_remove, daily_store_clear,
+)
+
+# Nama publik paket (semua import di atas adalah re-export)
+__all__ = [
+    # excel_io
+    "excel_cell_value", "read_sheet_rows", "rows_to_frame",
+    # numbers
+    "parse_numeric",
+    # profiling
+    "profiled", "profile_stage", "profile_session", "profile_table", "stage_totals",
+    # xlsx
+    "streaming_workbook", "xlsx_cell", "write_frame", "css_matrix_to_xlsx", "workbook_bytes",
+    # kpi
+    "kpi_rule_hits", "kpi_style_matrix", "kpi_row_labels", "kpi_styler", "tiktok_roi_rules", "META_CPAS_RULES",
+    "META_WA_RULES", "SHOPEE_IKLAN_STYLE_RULES", "SHOPEE_KATEGORI_RULES",
+    # shortener
+    "short_nama_iklan", "shorten_many", "short_name_cache_stats",
+    # shopee
+    "SHOPEE_ADS_MODES", "out_platform_report", "read_analitik_file", "process_variasi_modes",
+    "load_uploaded_csv_bytes", "build_ads_report", "clean_shopee_link",
+    # meta
+    "format_cell_for_preview", "read_cpas_report", "read_wa_report", "report_filename", "excel_highlight_cpas",
+    "excel_highlight_wa",
+    # tiktok_fixer
+    "find_id_column", "fix_decimal_commas", "read_fixer_workbook", "roi_columns", "build_roi_workbook",
+    "build_fixer_workbook",
+    # tiktok_daily
+    "ALLOWED_METRICS", "PERCENT_NAME_KEYWORDS", "date_from_a1", "read_daily_upload", "normalize_and_filter_df",
+    "ingest_daily_file", "ingest_daily_files", "sort_daily_results", "daily_numeric_metrics",
+    "daily_compare_filename", "build_daily_aggregate", "style_daily_aggregate", "build_product_sheets",
+    # daily_store
+    "DAILY_STORE_PATH", "file_digest", "daily_store_put", "daily_store_find_hash", "daily_store_index",
+    "daily_store_load", "daily_store_totals", "daily_store_product_totals", "daily_store_remove",
+    "daily_store_clear",
+]
@@ -0,0 +1,8 @@
+# processing/__main__.py
+# python -m processing <KIND> <folder> --out <folder hasil>  (lihat processing/cli.py)
+
+import sys
+
+from processing.cli import main
+
+sys.exit(main())
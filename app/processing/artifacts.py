@@ -0,0 +1,149 @@
+# processing/artifacts.py
+# Cache hasil laporan lintas sesi (disk lokal, content-addressed). Satu entri = isi folder job yang selesai
+# (result.pkl + file_*), disimpan dengan kunci = kunci job (jenis + sidik jari input + opsi) + versi kode,
+# jadi upload identik dengan opsi sama -- dari sesi atau pengguna mana pun -- langsung mendapat hasil
+# tanpa diproses ulang. Versi kode = hash sumber paket processing: perubahan kode pengolahan otomatis
+# membuat entri lama tidak terpakai (lalu terbuang lewat LRU).
+# Indeks (ukuran, waktu terakhir dipakai) & hitungan hit/miss di SQLite; total ukuran dibatasi
+# ARTIFACT_CACHE_MAX_BYTES dengan membuang entri yang paling lama tidak dipakai.
+# File dipasang ke folder tujuan dengan hardlink (salin bila tidak bisa), sehingga menghapus entri cache
+# tidak mengganggu job yang memakainya, dan sebaliknya.
+
+import glob
+import hashlib
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+
+
+ARTIFACT_CACHE_DIR = os.environ.get(
+    "APP_ARTIFACT_CACHE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".data", "artifacts"),
+)
+ARTIFACT_CACHE_MAX_BYTES = int(os.environ.get("APP_ARTIFACT_CACHE_MB", "1024")) * 1024 * 1024
+
+def _code_version() -> str:
+    # Hash semua sumber paket processing (urut nama file)
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(os.path.basename(path).encode() + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+CODE_VERSION = _code_version()
+
+def artifact_key(job_key: str) -> str:
+    return hashlib.sha256(f"{job_key}|{CODE_VERSION}".encode("utf-8")).hexdigest()
+
+# -----------------------------
+# INDEKS (SQLite)
+# -----------------------------
+
+def artifacts_connect(root: str = ARTIFACT_CACHE_DIR) -> sqlite3.Connection:
+    os.makedirs(root, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(root, "artifacts.sqlite"), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS artifacts (
+            key TEXT PRIMARY KEY, kind TEXT, bytes INTEGER NOT NULL, created REAL, last_used REAL, hits INTEGER DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS artifacts_lru ON artifacts(last_used);
+        CREATE TABLE IF NOT EXISTS artifact_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        INSERT OR IGNORE INTO artifact_stats VALUES ('hits', 0), ('misses', 0), ('stores', 0), ('evictions', 0);
+    """)
+    return conn
+
+def _bump(conn, name: str, n: int = 1):
+    conn.execute("UPDATE artifact_stats SET value = value + ? WHERE name = ?", (n, name))
+
+def _entry_dir(key: str, root: str) -> str:
+    return os.path.join(root, key[:2], key)
+
+def _link_files(src: str, dst: str, names: list):
+    os.makedirs(dst, exist_ok=True)
+    for name in names:
+        try:
+            os.link(os.path.join(src, name), os.path.join(dst, name))
+        except OSError:
+            shutil.copyfile(os.path.join(src, name), os.path.join(dst, name))
+
+# -----------------------------
+# AMBIL & SIMPAN
+# -----------------------------
+
+def artifact_fetch(key: str, dst: str, root: str = ARTIFACT_CACHE_DIR) -> bool:
+    """Pasang isi entri `key` sebagai folder dst (belum boleh ada) dan catat hit/miss. Return True jika ada di cache."""
+    with closing(artifacts_connect(root)) as conn:
+        row = conn.execute("SELECT key FROM artifacts WHERE key = ?", (key,)).fetchone()
+        src, tmp = _entry_dir(key, root), f"{dst}.tmp"
+        try:
+            if row is None: raise FileNotFoundError(src)
+            _link_files(src, tmp, os.listdir(src))
+            os.replace(tmp, dst)
+        except OSError:
+            # Entri tidak ada, atau foldernya hilang (dibuang proses lain) -> miss
+            shutil.rmtree(tmp, ignore_errors=True)
+            with conn:
+                if row is not None: conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                _bump(conn, "misses")
+            return False
+        with conn:
+            conn.execute("UPDATE artifacts SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+            _bump(conn, "hits")
+    return True
+
+def artifact_store(key: str, src: str, names: list, kind: str = "", root: str = ARTIFACT_CACHE_DIR,
+                   max_bytes: int = ARTIFACT_CACHE_MAX_BYTES) -> bool:
+    """Simpan file `names` dari folder src sebagai entri `key`, lalu buang entri LRU di atas max_bytes.
+
+    Entri yang lebih besar dari max_bytes tidak disimpan. Return True jika tersimpan (atau sudah ada).
+    """
+    nbytes = sum(os.path.getsize(os.path.join(src, name)) for name in names)
+    if nbytes > max_bytes: return False
+    entry = _entry_dir(key, root)
+    with closing(artifacts_connect(root)) as conn:
+        if conn.execute("SELECT 1 FROM artifacts WHERE key = ?", (key,)).fetchone() is not None: return True
+        # Folder disusun di nama sementara lalu di-rename, jadi pembaca tidak melihat entri setengah jadi
+        tmp = f"{entry}.{uuid.uuid4().hex}.tmp"
+        _link_files(src, tmp, names)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        now = time.time()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts (key, kind, bytes, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, nbytes, now, now),
+            )
+            _bump(conn, "stores")
+        _evict(conn, root, max_bytes)
+    return True
+
+def _evict(conn, root: str, max_bytes: int):
+    # Buang entri yang paling lama tidak dipakai sampai total ukuran <= max_bytes
+    total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM artifacts").fetchone()[0]
+    if total <= max_bytes: return
+    stale = []
+    for row in conn.execute("SELECT key, bytes FROM artifacts ORDER BY last_used").fetchall():
+        if total <= max_bytes: break
+        stale.append(row["key"])
+        total -= row["bytes"]
+    with conn:
+        conn.executemany("DELETE FROM artifacts WHERE key = ?", [(key,) for key in stale])
+        _bump(conn, "evictions", len(stale))
+    for key in stale:
+        shutil.rmtree(_entry_dir(key, root), ignore_errors=True)
+
+def artifact_stats(root: str = ARTIFACT_CACHE_DIR) -> dict:
+    # Isi & hit rate cache (lintas sesi dan restart), untuk memantau ARTIFACT_CACHE_MAX_BYTES
+    with closing(artifacts_connect(root)) as conn:
+        entries, nbytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM artifacts").fetchone()
+        stats = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM artifact_stats")}
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "entries": entries, "bytes": nbytes, "max_bytes": ARTIFACT_CACHE_MAX_BYTES, **stats,
+        "hit_rate": stats["hits"] / lookups if lookups else 0.0, "code_version": CODE_VERSION,
+    }
@@ -0,0 +1,218 @@
+# processing/cli.py
+# Batch tanpa UI: olah semua file export di folder dengan fungsi yang sama seperti halaman app.
+# Jalankan dari folder app/, mis.:
+#   python -m processing shopee-out exports/ --out hasil/
+#   python -m processing shopee-ads exports/ --mode grup --exclude BIRU
+#   python -m processing tiktok-daily harian/ --out hasil/ --store hasil/tiktok_daily.sqlite
+# Hasil ditulis dengan nama file yang sama seperti tombol download di app. File yang gagal
+# dilaporkan ke stderr dan sisanya tetap diproses; exit code 1 jika ada yang gagal.
+# --profile menulis waktu/memori per tahap (satu baris JSON per tahap, lihat processing/profiling.py) ke stderr.
+
+import argparse
+import logging
+import os
+import sys
+from contextlib import nullcontext
+
+import pandas as pd
+
+from processing.daily_store import (
+    daily_store_find_hash, daily_store_index, daily_store_product_totals, daily_store_put, daily_store_totals,
+    file_digest,
+)
+from processing.meta import excel_highlight_cpas, excel_highlight_wa, read_cpas_report, read_wa_report, report_filename
+from processing.profiling import PROFILE_LOGGER, profile_session
+from processing.shopee import (
+    SHOPEE_ADS_MODES, build_ads_report, load_uploaded_csv_bytes, out_platform_report, process_variasi_modes,
+    read_analitik_file,
+)
+from processing.tiktok_daily import (
+    build_daily_aggregate, build_product_sheets, daily_compare_filename, daily_numeric_metrics, ingest_daily_files,
+)
+from processing.tiktok_fixer import build_fixer_workbook, build_roi_workbook, read_fixer_workbook
+
+ADS_MODE_CHOICES = {"normal": SHOPEE_ADS_MODES[0], "grup": SHOPEE_ADS_MODES[1]}
+ADS_COLORS = ["MERAH", "KUNING", "HIJAU", "BIRU"]
+
+# -----------------------------
+# HANDLER PER FILE: (nama file, bytes, args) -> [(nama file hasil, bytes), ...]
+# -----------------------------
+
+def _base(name: str) -> str:
+    return name.rsplit(".", 1)[0]
+
+def run_shopee_out(name, data, args):
+    report = out_platform_report(data)
+    for warning in report["warnings"]: print(f"  {name}: {warning}", file=sys.stderr)
+    return [(f"{_base(name)}_converted.xlsx", report["converted"]), (f"{_base(name)}_filtered.xlsx", report["filtered"])]
+
+def run_shopee_analitik(name, data, args):
+    outputs = []
+    results = process_variasi_modes(read_analitik_file(data, name))
+    for mode, label in (("warna", "Warna"), ("ukuran", "Ukuran")):
+        _, excel_b, csv_buf, err = results[mode]
+        if err: raise ValueError(err)
+        outputs += [(f"{_base(name)}_{label}.xlsx", excel_b.getvalue()), (f"{_base(name)}_{label}.csv", csv_buf.getvalue())]
+    return outputs
+
+def run_shopee_ads(name, data, args):
+    include = {f"include_{c.lower()}": c not in args.exclude for c in ADS_COLORS}
+    report = build_ads_report(load_uploaded_csv_bytes(data), ADS_MODE_CHOICES[args.mode], **include)
+    return [(f"{_base(name)}_colored.xlsx", report)]
+
+def run_meta_cpas(name, data, args):
+    df, tgl_awal = read_cpas_report(data)
+    return [(report_filename(_base(name), tgl_awal), excel_highlight_cpas(df))]
+
+def run_meta_wa(name, data, args):
+    df, tgl_awal = read_wa_report(data)
+    return [(report_filename(_base(name), tgl_awal), excel_highlight_wa(df))]
+
+def run_tiktok_fixer(name, data, args):
+    df, _ = read_fixer_workbook(data)
+    if args.roi: return [(f"{_base(name)}_colored.xlsx", build_roi_workbook(df)[0])]
+    return [(f"{_base(name)}_sorted.xlsx", build_fixer_workbook(df))]
+
+# nama perintah -> (ekstensi file input, handler per file atau None untuk tiktok-daily, keterangan)
+KINDS = {
+    "shopee-out": ((".xlsx", ".xls"), run_shopee_out, "Shopee Out Platform: convert titik/koma + sort & filter"),
+    "shopee-analitik": ((".xlsx", ".xls", ".csv"), run_shopee_analitik, "Shopee Analitik Produk per warna & ukuran"),
+    "shopee-ads": ((".csv",), run_shopee_ads, "CSV Shopee Ads -> Excel laporan berwarna"),
+    "meta-cpas": ((".xlsx",), run_meta_cpas, "META CPAS KPI Highlight (header baris 1)"),
+    "meta-wa": ((".xlsx",), run_meta_wa, "META WhatsApp Ads KPI Highlight (header baris 3)"),
+    "tiktok-fixer": ((".xlsx", ".xls"), run_tiktok_fixer, "TikTok Excel Fixer (opsional --roi)"),
+    "tiktok-daily": ((".xlsx",), None, "TikTok harian: simpan ke store lalu buat laporan perbandingan"),
+}
+
+# -----------------------------
+# TIKTOK HARIAN (satu laporan untuk seluruh folder)
+# -----------------------------
+
+def run_tiktok_daily(files: list, args) -> list:
+    """File baru disimpan ke store (yang sudah ada dilewati), lalu laporan dibuat dari ringkasan store.
+
+    Seperti upload di app, untuk tanggal yang sama file terakhir (urut nama) yang dipakai, juga saat
+    folder yang sama dijalankan ulang.
+    """
+    digests = [file_digest(data) for _, data in files]
+    position = {digest: i for i, digest in enumerate(digests)}
+    pending = [i for i, digest in enumerate(digests) if daily_store_find_hash(digest, path=args.store) is None]
+    index = daily_store_index(path=args.store)
+    stored_hash = dict(zip(index["date"], index["file_hash"]))
+    failed = []
+    for result in ingest_daily_files([files[i] for i in pending]):
+        if result["error"]:
+            failed.append(result["name"])
+            print(f"GAGAL {result['name']}: {result['error']}", file=sys.stderr)
+            continue
+        i = pending[result["index"]]
+        if position.get(stored_hash.get(str(result["date"])), -1) > i:
+            print(f"{result['name']}: {result['date']} (dilewati, tanggal diisi file yang lebih akhir)")
+            continue
+        status = daily_store_put(result["date"], result["df"], digests[i], path=args.store)
+        print(f"{result['name']}: {result['date']} ({status})")
+    print(f"{len(files) - len(pending)} file sudah ada di store, dilewati")
+
+    totals = daily_store_totals(args.start, args.end, path=args.store)
+    product_totals = daily_store_product_totals(args.start, args.end, path=args.store)
+    totals = totals[totals["report_date"].notna()]
+    product_totals = product_totals[product_totals["report_date"].notna()]
+    if totals.empty:
+        print("Store kosong untuk rentang ini, tidak ada laporan.")
+        return failed
+
+    numeric_metrics = daily_numeric_metrics(totals)
+    agg = build_daily_aggregate(totals, numeric_metrics)
+    _write_output(args.out, "daily_aggregate_all.csv", agg.reset_index().to_csv(index=False).encode("utf-8"))
+    product_sheets = build_product_sheets(product_totals, numeric_metrics)
+    if product_sheets:
+        valid_dates = sorted(set(pd.to_datetime(totals["report_date"]).dt.date))
+        _write_output(args.out, daily_compare_filename(valid_dates), product_sheets)
+    return failed
+
+# -----------------------------
+# MAIN
+# -----------------------------
+
+def _input_files(paths: list, extensions: tuple) -> list:
+    # Folder: semua file berekstensi cocok di level teratas (urut nama); file tunggal juga diterima
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found += sorted(
+                os.path.join(path, f) for f in os.listdir(path)
+                if f.lower().endswith(extensions) and not f.startswith(("~$", ".")) and os.path.isfile(os.path.join(path, f))
+            )
+        else:
+            found.append(path)
+    return found
+
+def _write_output(out_dir: str, name: str, data: bytes):
+    os.makedirs(out_dir, exist_ok=True)
+    target = os.path.join(out_dir, name)
+    with open(target, "wb") as f:
+        f.write(data)
+    print(f"  -> {target}")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m processing", description="Olah folder export tanpa UI Streamlit.")
+    sub = parser.add_subparsers(dest="kind", required=True, metavar="KIND")
+    for kind, (extensions, _, help_text) in KINDS.items():
+        p = sub.add_parser(kind, help=help_text, description=help_text)
+        p.add_argument("paths", nargs="+", help=f"folder atau file ({', '.join(extensions)})")
+        p.add_argument("--out", default="hasil", help="folder hasil (default: ./hasil)")
+        p.add_argument("--profile", nargs="?", const="time", choices=["time", "memory"],
+                       help="log JSON waktu per tahap ke stderr; 'memory' juga puncak memori (lebih lambat)")
+        if kind == "shopee-ads":
+            p.add_argument("--mode", choices=list(ADS_MODE_CHOICES), default="normal", help="format CSV (default: normal)")
+            p.add_argument("--exclude", nargs="*", choices=ADS_COLORS, default=[], help="kategori yang tidak masuk RINGKASAN_IKLAN")
+        if kind == "tiktok-fixer":
+            p.add_argument("--roi", action="store_true", help="aktifkan pewarnaan ROI")
+        if kind == "tiktok-daily":
+            p.add_argument("--store", help="file SQLite dataset harian (default: <out>/tiktok_daily.sqlite)")
+            p.add_argument("--start", help="tanggal awal laporan (YYYY-MM-DD)")
+            p.add_argument("--end", help="tanggal akhir laporan (YYYY-MM-DD)")
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    extensions, handler, _ = KINDS[args.kind]
+    paths = _input_files(args.paths, extensions)
+    if not paths:
+        print(f"Tidak ada file {', '.join(extensions)} di {', '.join(args.paths)}", file=sys.stderr)
+        return 1
+
+    if args.profile:
+        handler_log = logging.StreamHandler(sys.stderr)
+        handler_log.setFormatter(logging.Formatter("%(message)s"))
+        PROFILE_LOGGER.addHandler(handler_log)
+        PROFILE_LOGGER.setLevel(logging.INFO)
+
+    def profile(label):
+        return profile_session(label, memory=args.profile == "memory") if args.profile else nullcontext()
+
+    files = []
+    for path in paths:
+        with open(path, "rb") as f:
+            files.append((os.path.basename(path), f.read()))
+
+    if handler is None:
+        args.store = args.store or os.path.join(args.out, "tiktok_daily.sqlite")
+        with profile(args.kind):
+            failed = run_tiktok_daily(files, args)
+    else:
+        failed = []
+        for name, data in files:
+            print(name)
+            try:
+                with profile(name):
+                    outputs = handler(name, data, args)
+            except Exception as e:
+                failed.append(name)
+                print(f"GAGAL {name}: {e}", file=sys.stderr)
+                continue
+            for out_name, out_data in outputs:
+                _write_output(args.out, out_name, out_data)
+
+    print(f"Selesai: {len(files) - len(failed)}/{len(files)} file berhasil.")
+    return 1 if failed else 0
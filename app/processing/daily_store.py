@@ -0,0 +1,233 @@
+# processing/daily_store.py
+# Penyimpanan dataset harian TikTok (SQLite di disk).
+# Satu baris tabel daily_rows = satu baris data produk; kolom metrik ditambah otomatis (ALTER TABLE)
+# saat muncul kolom baru. daily_files mencatat satu file per tanggal laporan beserta hash isinya,
+# sehingga upload ulang file yang sama dilewati tanpa parsing dan data bisa diambil per rentang tanggal.
+# daily_totals (per tanggal) & daily_product_totals (per produk per tanggal) berisi jumlah metrik yang
+# dihitung sekali saat file disimpan; tampilan & export membaca ringkasan ini, bukan baris mentah.
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+from processing.profiling import profiled
+
+
+DAILY_STORE_PATH = os.environ.get(
+    "TIKTOK_DAILY_STORE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".data", "tiktok_daily.sqlite"),
+)
+DAILY_PRODUCT_COL = "Produk"
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def _sql_name(name) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _report_date(date_key):
+    # Tanggal awal laporan ("2024-01-01" atau "2024-01-01 ~ 2024-01-07"), None jika tidak terbaca
+    parsed = pd.to_datetime(str(date_key).split('~')[0].strip(), errors='coerce')
+    return None if pd.isna(parsed) else parsed.date().isoformat()
+
+def daily_store_connect(path: str = DAILY_STORE_PATH) -> sqlite3.Connection:
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS daily_files (
+            date_key TEXT PRIMARY KEY, report_date TEXT, file_hash TEXT UNIQUE,
+            n_rows INTEGER, columns TEXT, added_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS daily_files_report_date ON daily_files(report_date);
+        CREATE TABLE IF NOT EXISTS daily_rows (date_key TEXT NOT NULL, row_no INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS daily_rows_date_key ON daily_rows(date_key, row_no);
+        CREATE TABLE IF NOT EXISTS daily_totals (date_key TEXT PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS daily_product_totals (date_key TEXT NOT NULL, produk TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS daily_product_totals_date_key ON daily_product_totals(date_key);
+        CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER);
+    """)
+    return conn
+
+def _store_columns(conn, table: str = "daily_rows") -> dict:
+    return {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+def _ensure_columns(conn, table: str, col_types: dict):
+    existing = _store_columns(conn, table)
+    for c, sql_type in col_types.items():
+        if c not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {_sql_name(c)} {sql_type}")
+
+def _insert_frame(conn, table: str, lead_cols: list, lead_values, df: pd.DataFrame):
+    cols = lead_cols + [str(c) for c in df.columns]
+    values = df.astype(object).where(df.notna(), None)
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(map(_sql_name, cols))}) VALUES ({', '.join('?' * len(cols))})",
+        ((*lead, *row) for lead, row in zip(lead_values, values.itertuples(index=False, name=None))),
+    )
+
+def daily_store_generation(path: str = DAILY_STORE_PATH) -> int:
+    # Naik setiap kali isi store berubah; dipakai sebagai kunci cache pembacaan
+    with closing(daily_store_connect(path)) as conn:
+        row = conn.execute("SELECT value FROM store_meta WHERE key = 'generation'").fetchone()
+    return row[0] if row else 0
+
+def _bump_generation(conn):
+    conn.execute(
+        "INSERT INTO store_meta(key, value) VALUES('generation', 1) "
+        "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+    )
+
+def _delete_date(conn, date_key: str) -> bool:
+    deleted = conn.execute("DELETE FROM daily_files WHERE date_key = ?", (date_key,)).rowcount > 0
+    for table in ("daily_rows", "daily_totals", "daily_product_totals"):
+        conn.execute(f"DELETE FROM {table} WHERE date_key = ?", (date_key,))
+    return deleted
+
+def _write_summaries(conn, date_key: str, df: pd.DataFrame):
+    # Ringkasan satu tanggal saja: total metrik & total per produk (Produk kosong tidak ikut)
+    metrics = [c for c in df.columns if c != DAILY_PRODUCT_COL and pd.api.types.is_numeric_dtype(df[c])]
+    real_types = {c: "REAL" for c in metrics}
+    _ensure_columns(conn, "daily_totals", real_types)
+    _ensure_columns(conn, "daily_product_totals", real_types)
+    _insert_frame(conn, "daily_totals", ["date_key"], [(date_key,)], df[metrics].sum().to_frame().T)
+    if DAILY_PRODUCT_COL in df.columns:
+        per_product = df.groupby(DAILY_PRODUCT_COL)[metrics].sum()
+        _insert_frame(conn, "daily_product_totals", ["date_key", "produk"],
+                      [(date_key, p) for p in per_product.index], per_product)
+
+def _read_rows(conn, date_key: str, cols: list) -> pd.DataFrame:
+    if not cols:
+        n_rows = conn.execute("SELECT COUNT(*) FROM daily_rows WHERE date_key = ?", (date_key,)).fetchone()[0]
+        return pd.DataFrame(index=range(n_rows))
+    col_types = _store_columns(conn)
+    return pd.read_sql_query(
+        f"SELECT {', '.join(map(_sql_name, cols))} FROM daily_rows WHERE date_key = ? ORDER BY row_no",
+        conn, params=(date_key,),
+        dtype={c: "float64" for c in cols if col_types.get(c) == "REAL"},
+    )
+
+def _backfill_summaries(conn):
+    # Store lama (sebelum ada tabel ringkasan): hitung ringkasan untuk tanggal yang belum punya
+    missing = conn.execute(
+        "SELECT date_key, columns FROM daily_files WHERE date_key NOT IN (SELECT date_key FROM daily_totals)"
+    ).fetchall()
+    for date_key, file_cols in missing:
+        _write_summaries(conn, date_key, _read_rows(conn, date_key, json.loads(file_cols)))
+
+def daily_store_find_hash(file_hash: str, path: str = DAILY_STORE_PATH) -> Optional[str]:
+    with closing(daily_store_connect(path)) as conn:
+        row = conn.execute("SELECT date_key FROM daily_files WHERE file_hash = ?", (file_hash,)).fetchone()
+    return row[0] if row else None
+
+@profiled("store")
+def daily_store_put(date_val, df: pd.DataFrame, file_hash: str, path: str = DAILY_STORE_PATH) -> str:
+    """Simpan dataset satu tanggal. Tanggal yang sudah ada diganti (seperti cache sesi lama).
+
+    Ringkasan tanggal itu ikut dihitung ulang di transaksi yang sama; tanggal lain tidak disentuh.
+    Return "duplicate" jika file dengan hash sama sudah tersimpan, "replaced" atau "added".
+    """
+    date_key = str(date_val)
+    cols = [str(c) for c in df.columns]
+    with closing(daily_store_connect(path)) as conn, conn:
+        if conn.execute("SELECT 1 FROM daily_files WHERE file_hash = ?", (file_hash,)).fetchone():
+            return "duplicate"
+
+        _ensure_columns(conn, "daily_rows", {
+            c: "REAL" if pd.api.types.is_numeric_dtype(df[c]) else "TEXT" for c in cols
+        })
+        replaced = _delete_date(conn, date_key)
+        _insert_frame(conn, "daily_rows", ["date_key", "row_no"], ((date_key, i) for i in range(len(df))), df)
+        _write_summaries(conn, date_key, df)
+        conn.execute(
+            "INSERT INTO daily_files VALUES (?, ?, ?, ?, ?, ?)",
+            (date_key, _report_date(date_key), file_hash, len(df), json.dumps(cols), datetime.now().isoformat(timespec="seconds")),
+        )
+        _bump_generation(conn)
+    return "replaced" if replaced else "added"
+
+def daily_store_index(path: str = DAILY_STORE_PATH) -> pd.DataFrame:
+    # Daftar tanggal tersimpan tanpa membaca baris data
+    with closing(daily_store_connect(path)) as conn:
+        return pd.read_sql_query(
+            "SELECT date_key AS date, report_date, n_rows AS rows, file_hash, added_at "
+            "FROM daily_files ORDER BY report_date IS NULL, report_date, date_key",
+            conn,
+        )
+
+def _window_where(start, end):
+    where, params = [], []
+    if start is not None:
+        where.append("f.report_date >= ?"); params.append(pd.Timestamp(start).date().isoformat())
+    if end is not None:
+        where.append("f.report_date <= ?"); params.append(pd.Timestamp(end).date().isoformat())
+    return (f"WHERE {' AND '.join(where)}" if where else ""), params
+
+@profiled("store")
+def daily_store_load(start=None, end=None, columns=None, path: str = DAILY_STORE_PATH) -> OrderedDict:
+    """Muat dataset per tanggal dalam rentang [start, end] (inklusif) sebagai OrderedDict date_key -> DataFrame.
+
+    Hanya kolom yang diminta (dan memang ada di file aslinya) yang dibaca. Tanpa start/end semua
+    tanggal dimuat, termasuk yang tanggalnya tidak terbaca.
+    """
+    where_sql, params = _window_where(start, end)
+    datasets = OrderedDict()
+    with closing(daily_store_connect(path)) as conn:
+        files = conn.execute(
+            f"SELECT f.date_key, f.columns FROM daily_files f {where_sql} "
+            "ORDER BY f.report_date IS NULL, f.report_date, f.date_key",
+            params,
+        ).fetchall()
+        for date_key, file_cols in files:
+            cols = [c for c in json.loads(file_cols) if columns is None or c in columns]
+            datasets[date_key] = _read_rows(conn, date_key, cols)
+    return datasets
+
+def _read_summary(table: str, key_cols: list, start, end, path: str) -> pd.DataFrame:
+    # Kolom metrik yang tidak ada di file tanggal tersebut bernilai NaN (bukan 0)
+    where_sql, params = _window_where(start, end)
+    with closing(daily_store_connect(path)) as conn, conn:
+        _backfill_summaries(conn)
+        metrics = [c for c in _store_columns(conn, table) if c not in key_cols]
+        select_sql = ", ".join([f"t.{_sql_name(c)}" for c in key_cols + metrics])
+        return pd.read_sql_query(
+            f"SELECT f.report_date, {select_sql} FROM {table} t JOIN daily_files f ON f.date_key = t.date_key "
+            f"{where_sql} ORDER BY f.report_date IS NULL, f.report_date, t.date_key",
+            conn, params=params, dtype={c: "float64" for c in metrics},
+        )
+
+@profiled("store")
+def daily_store_totals(start=None, end=None, path: str = DAILY_STORE_PATH) -> pd.DataFrame:
+    return _read_summary("daily_totals", ["date_key"], start, end, path)
+
+@profiled("store")
+def daily_store_product_totals(start=None, end=None, path: str = DAILY_STORE_PATH) -> pd.DataFrame:
+    return _read_summary("daily_product_totals", ["date_key", "produk"], start, end, path)
+
+def daily_store_remove(date_key: str, path: str = DAILY_STORE_PATH):
+    with closing(daily_store_connect(path)) as conn, conn:
+        _delete_date(conn, date_key)
+        _bump_generation(conn)
+
+def daily_store_clear(path: str = DAILY_STORE_PATH):
+    with closing(daily_store_connect(path)) as conn, conn:
+        for table in ("daily_files", "daily_rows", "daily_totals", "daily_product_totals"):
+            conn.execute(f"DELETE FROM {table}")
+        _bump_generation(conn)
+
+def daily_store_fingerprint(start=None, end=None, path: str = DAILY_STORE_PATH) -> str:
+    # Sidik jari himpunan file dalam rentang: berubah hanya jika file di rentang itu berubah
+    where_sql, params = _window_where(start, end)
+    with closing(daily_store_connect(path)) as conn:
+        hashes = conn.execute(
+            f"SELECT f.file_hash FROM daily_files f {where_sql} ORDER BY f.date_key", params
+        ).fetchall()
+    return hashlib.sha256("|".join(h for (h,) in hashes).encode()).hexdigest()
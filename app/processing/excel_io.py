@@ -0,0 +1,38 @@
+# processing/excel_io.py
+# Pembaca workbook read-only: padanan pd.read_excel tanpa parse ulang file.
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from processing.profiling import profiled
+
+
+def excel_cell_value(cell):
+    # Konversi sel sama seperti pd.read_excel (engine openpyxl)
+    if cell.value is None: return ""
+    if cell.data_type == "e": return np.nan
+    if cell.data_type == "n":
+        val = int(cell.value)
+        return val if val == cell.value else float(cell.value)
+    return cell.value
+
+@profiled("parse")
+def read_sheet_rows(ws) -> list:
+    # Isi sheet read-only sebagai list baris; sel & baris kosong di ekor dipangkas seperti pandas
+    ws.reset_dimensions()
+    data, last_row_with_data = [], -1
+    for row_number, row in enumerate(ws.rows):
+        values = [excel_cell_value(cell) for cell in row]
+        while values and values[-1] == "": values.pop()
+        if values: last_row_with_data = row_number
+        data.append(values)
+    data = data[: last_row_with_data + 1]
+    width = max((len(r) for r in data), default=0)
+    return [r + [""] * (width - len(r)) for r in data]
+
+@profiled("parse")
+def rows_to_frame(rows: list, **kwargs) -> pd.DataFrame:
+    # Parser yang sama dengan pd.read_excel, tanpa membaca ulang file
+    if not rows: return pd.DataFrame()
+    return TextParser(rows, header=0, skip_blank_lines=False, **kwargs).read()
@@ -0,0 +1,465 @@
+# processing/jobs.py
+# Antrian job latar untuk export berat (SQLite di disk). Job diajukan dari halaman mana pun dan langsung
+# mendapat id; argumennya disimpan sebagai pickle di folder job, lalu dispatcher (thread di proses app)
+# menyerahkannya ke worker di process pool. Worker menulis progress {"done", "total"} dan hasilnya
+# (file + preview kecil) ke folder job, jadi hasil tetap bisa diunduh lintas rerun, sesi, maupun restart app.
+# Worker (processing/pool.py: forkserver/spawn, bukan fork dari server) tidak membuka SQLite: worker hanya menulis
+# ke folder job, status & progress di database hanya ditulis dispatcher. Tiap dispatcher mencatat heartbeat
+# di tabel runners dan menandai job yang diambilnya; job berjalan milik dispatcher yang berhenti kembali antre.
+# Pembagian CPU: job berikutnya diambil dari pemilik (sesi) yang job berjalannya paling sedikit, baru
+# kemudian yang paling lama antre, sehingga satu pengguna dengan banyak job tidak memonopoli worker.
+# Job identik (kunci sama) yang masih antre/berjalan dipakai bersama, tidak diajukan dua kali; hasil job
+# yang berhasil disimpan ke cache hasil (processing/artifacts.py), sehingga pengajuan berikutnya dengan
+# kunci sama (sesi mana pun) langsung selesai tanpa worker.
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import BrokenExecutor
+from contextlib import closing
+from typing import Optional
+
+from processing.artifacts import ARTIFACT_CACHE_DIR, artifact_fetch, artifact_key, artifact_store
+from processing.meta import excel_highlight_cpas, excel_highlight_wa
+from processing.profiling import profile_session, reset_in_worker
+from processing.shopee import build_ads_report, out_platform_report, process_variasi_modes
+from processing.tiktok_daily import build_product_sheets
+from processing.tiktok_fixer import build_fixer_workbook, build_roi_workbook
+
+
+JOB_STORE_DIR = os.environ.get(
+    "APP_JOB_STORE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".data", "jobs"),
+)
+JOB_KEEP_SECONDS = 24 * 3600   # hasil job selesai disimpan selama ini...
+JOB_KEEP_MAX = 200             # ...dan paling banyak sejumlah ini (yang terbaru)
+JOB_NICE = 5                   # worker sedikit di bawah prioritas proses app agar UI tetap responsif
+PROGRESS_INTERVAL = 0.5        # detik minimum antar tulis progress worker; juga interval cek dispatcher
+PURGE_INTERVAL = 600
+RUNNER_HEARTBEAT = 5           # detik antar heartbeat dispatcher di tabel runners...
+RUNNER_STALE = 60              # ...dan tanpa heartbeat selama ini dispatcher dianggap mati
+
+ACTIVE = ("queued", "running")
+FINISHED = ("done", "failed")
+
+LOGGER = logging.getLogger("processing.jobs")
+
+def job_key(*parts) -> str:
+    # Kunci job dari jenis + sidik jari input + opsi; job dengan kunci sama dipakai bersama
+    return hashlib.sha256(json.dumps(parts, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+
+# -----------------------------
+# STORE (SQLite + folder per job)
+# -----------------------------
+
+def jobs_connect(root: str = JOB_STORE_DIR) -> sqlite3.Connection:
+    os.makedirs(root, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(root, "jobs.sqlite"), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY, kind TEXT NOT NULL, job_key TEXT, owner TEXT, label TEXT, profile TEXT,
+            status TEXT NOT NULL, done INTEGER DEFAULT 0, total INTEGER DEFAULT 0, error TEXT,
+            created REAL, started REAL, finished REAL, runner TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created);
+        CREATE INDEX IF NOT EXISTS jobs_key ON jobs(job_key);
+        CREATE INDEX IF NOT EXISTS jobs_owner ON jobs(owner, created);
+        CREATE TABLE IF NOT EXISTS runners (id TEXT PRIMARY KEY, pid INTEGER, host TEXT, started REAL, seen REAL);
+    """)
+    # Store dari versi sebelum kolom runner
+    if "runner" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+        try:
+            conn.execute("ALTER TABLE jobs ADD COLUMN runner TEXT")
+        except sqlite3.OperationalError:
+            pass  # baru saja ditambahkan koneksi lain
+    return conn
+
+def _job_dir(job_id: str, root: str) -> str:
+    return os.path.join(root, job_id)
+
+def _has_result(job_id: str, root: str) -> bool:
+    return os.path.exists(os.path.join(_job_dir(job_id, root), "result.pkl"))
+
+def _find(conn, key: str, owner: str, root: str) -> Optional[str]:
+    rows = conn.execute(
+        "SELECT id, status FROM jobs WHERE job_key = ? AND (status IN ('queued', 'running') OR (status = 'done' AND owner = ?))"
+        " ORDER BY created DESC",
+        (key, owner),
+    ).fetchall()
+    return next((row["id"] for row in rows if row["status"] in ACTIVE or _has_result(row["id"], root)), None)
+
+def find_job(key: str, owner: str = None, root: str = JOB_STORE_DIR) -> Optional[str]:
+    """Job terbaru dengan kunci ini: yang antre/berjalan (pemilik siapa pun) atau selesai milik `owner` yang hasilnya masih ada."""
+    with closing(jobs_connect(root)) as conn:
+        return _find(conn, key, owner, root)
+
+def submit_job(kind: str, args: tuple, key: str = None, owner: str = "", label: str = "", profile: str = None,
+               root: str = JOB_STORE_DIR, artifact_root: str = ARTIFACT_CACHE_DIR) -> str:
+    """Ajukan job `kind` (lihat JOB_KINDS) dengan argumen `args`; return id job (yang sudah ada bila kunci sama).
+
+    Dengan `key`, hasil dari cache hasil langsung menjadi job selesai (result["cached"] = True).
+    profile: None, "time" atau "memory" -> tahap di worker direkam (processing/profiling.py) ke hasil job.
+    """
+    if kind not in JOB_KINDS: raise ValueError(f"Jenis job tidak dikenal: {kind}")
+    if key is not None:
+        existing = find_job(key, owner, root)
+        if existing is not None: return existing
+    job_id = uuid.uuid4().hex
+    job_dir = _job_dir(job_id, root)
+    if key is not None and artifact_fetch(artifact_key(key), job_dir, root=artifact_root):
+        _mark_cached(job_dir)
+        now = time.time()
+        with closing(jobs_connect(root)) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, job_key, owner, label, profile, status, done, total, created, started, finished)"
+                " VALUES (?, ?, ?, ?, ?, ?, 'done', 1, 1, ?, ?, ?)",
+                (job_id, kind, key, owner, label, profile, now, now, now),
+            )
+        return job_id
+    os.makedirs(job_dir, exist_ok=True)
+    with open(os.path.join(job_dir, "args.pkl"), "wb") as f:
+        pickle.dump(args, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Cek ulang + INSERT dalam satu transaksi: pengajuan lain dengan kunci sama (rerun, sesi lain) yang masuk
+    # setelah cek pertama di atas tidak menghasilkan job kedua
+    with closing(jobs_connect(root)) as conn:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = _find(conn, key, owner, root) if key is not None else None
+            if existing is None:
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, job_key, owner, label, profile, status, created) VALUES (?, ?, ?, ?, ?, ?, 'queued', ?)",
+                    (job_id, kind, key, owner, label, profile, time.time()),
+                )
+    if existing is not None:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return existing
+    return job_id
+
+def _mark_cached(job_dir: str):
+    # result.pkl di folder job adalah hardlink ke entri cache: ditulis ulang lewat file baru (os.replace),
+    # bukan diubah di tempat. Profil tahap berasal dari run aslinya, jadi tidak ikut ditampilkan.
+    path = os.path.join(job_dir, "result.pkl")
+    with open(path, "rb") as f:
+        result = pickle.load(f)
+    result.update(cached=True, profile=None)
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+def job_status(job_id: str, root: str = JOB_STORE_DIR) -> Optional[dict]:
+    """Baris job sebagai dict, None jika tidak ada.
+
+    Tambahan: "position" = urutan di antrian untuk job yang masih antre; "has_result" = result.pkl job selesai
+    masih ada (folder job belum terhapus).
+    """
+    with closing(jobs_connect(root)) as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None: return None
+        job = dict(row)
+        job["position"] = None
+        job["has_result"] = job["status"] == "done" and _has_result(job_id, root)
+        if job["status"] == "queued":
+            job["position"] = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created <= ?", (job["created"],)
+            ).fetchone()[0]
+    return job
+
+def owner_jobs(owner: str, limit: int = 10, root: str = JOB_STORE_DIR) -> list:
+    # Job terbaru milik satu pemilik (sesi), untuk daftar di UI
+    with closing(jobs_connect(root)) as conn:
+        rows = conn.execute("SELECT * FROM jobs WHERE owner = ? ORDER BY created DESC LIMIT ?", (owner, limit)).fetchall()
+    return [dict(r) for r in rows]
+
+def job_result(job_id: str, root: str = JOB_STORE_DIR) -> Optional[dict]:
+    """Hasil job selesai: {"files": {kunci: nama file}, "previews", "warnings", "error", "profile", "cached"}."""
+    try:
+        with open(os.path.join(_job_dir(job_id, root), "result.pkl"), "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+
+def job_file(job_id: str, name: str, root: str = JOB_STORE_DIR) -> Optional[bytes]:
+    # Isi file hasil job (kunci dari result["files"]); None jika folder job sudah terhapus
+    try:
+        with open(os.path.join(_job_dir(job_id, root), f"file_{name}"), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def _finish(conn, job_id: str, status: str, error: str = None):
+    conn.execute("UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?", (status, error, time.time(), job_id))
+
+def _claim_next(conn, runner_id: str) -> Optional[dict]:
+    # Ambil satu job antre secara adil lalu tandai berjalan milik dispatcher runner_id (dalam satu transaksi)
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("""
+            SELECT j.id, j.kind, j.job_key, j.profile FROM jobs j WHERE j.status = 'queued'
+            ORDER BY (SELECT COUNT(*) FROM jobs r WHERE r.owner = j.owner AND r.status = 'running'), j.created
+            LIMIT 1
+        """).fetchone()
+        if row is None: return None
+        conn.execute(
+            "UPDATE jobs SET status = 'running', started = ?, done = 0, total = 0, runner = ? WHERE id = ?",
+            (time.time(), runner_id, row["id"]),
+        )
+    return dict(row)
+
+def purge_jobs(root: str = JOB_STORE_DIR, keep_seconds: float = JOB_KEEP_SECONDS, keep_max: int = JOB_KEEP_MAX) -> int:
+    """Hapus job selesai yang lebih tua dari keep_seconds atau di luar keep_max terbaru; return jumlah dihapus."""
+    with closing(jobs_connect(root)) as conn, conn:
+        rows = conn.execute(
+            "SELECT id, finished FROM jobs WHERE status NOT IN ('queued', 'running') ORDER BY finished DESC"
+        ).fetchall()
+        cutoff = time.time() - keep_seconds
+        stale = [r["id"] for i, r in enumerate(rows) if i >= keep_max or (r["finished"] or 0) < cutoff]
+        conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in stale])
+    for job_id in stale:
+        shutil.rmtree(_job_dir(job_id, root), ignore_errors=True)
+    return len(stale)
+
+# -----------------------------
+# WORKER
+# -----------------------------
+
+class _JobProgress(dict):
+    # {"done", "total"} seperti progress job latar; perubahan ditulis ke progress.json paling cepat tiap PROGRESS_INTERVAL
+    def __init__(self, job_dir):
+        super().__init__(done=0, total=0)
+        self.path, self.written = os.path.join(job_dir, "progress.json"), 0.0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        now = time.monotonic()
+        if now - self.written >= PROGRESS_INTERVAL or self["done"] >= self["total"]:
+            self.written = now
+            with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(dict(self), f)
+            os.replace(self.path + ".tmp", self.path)
+
+def _read_progress(job_dir: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(job_dir, "progress.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def init_job_worker():
+    # Initializer process pool job: tanpa sesi profil induk, prioritas sedikit di bawah proses app
+    reset_in_worker()
+    if hasattr(os, "nice"):
+        try:
+            os.nice(JOB_NICE)
+        except OSError:
+            pass
+
+def run_job(job_id: str, kind: str, profile: str = None, root: str = JOB_STORE_DIR) -> Optional[str]:
+    """Jalankan satu job di worker: file & result.pkl ditulis ke folder job. Return pesan error, None jika berhasil."""
+    job_dir = _job_dir(job_id, root)
+    try:
+        with open(os.path.join(job_dir, "args.pkl"), "rb") as f:
+            args = pickle.load(f)
+        progress = _JobProgress(job_dir)
+        if profile:
+            with profile_session(kind, memory=profile == "memory") as trace:
+                outcome = JOB_KINDS[kind](*args, progress=progress)
+        else:
+            trace, outcome = None, JOB_KINDS[kind](*args, progress=progress)
+        files = {}
+        for name, (filename, data) in outcome.get("files", {}).items():
+            if data is None: continue
+            with open(os.path.join(job_dir, f"file_{name}"), "wb") as f:
+                f.write(data)
+            files[name] = filename
+        result = {"files": files, "previews": outcome.get("previews", {}), "warnings": outcome.get("warnings", []),
+                  "error": outcome.get("error"), "profile": trace, "cached": False}
+        with open(os.path.join(job_dir, "result.pkl.tmp"), "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(os.path.join(job_dir, "result.pkl.tmp"), os.path.join(job_dir, "result.pkl"))
+        os.remove(os.path.join(job_dir, "args.pkl"))
+        return None
+    except Exception as e:
+        LOGGER.error("job %s (%s) gagal:\n%s", job_id, kind, traceback.format_exc())
+        return str(e) or type(e).__name__
+
+# -----------------------------
+# DISPATCHER (thread di proses app)
+# -----------------------------
+
+def start_job_runner(executor_factory, workers: int, root: str = JOB_STORE_DIR, artifact_root: str = ARTIFACT_CACHE_DIR) -> dict:
+    """Mulai dispatcher: job antre diserahkan ke executor_factory() (dibuat saat perlu) maksimal `workers` sekaligus.
+
+    Job yang tercatat berjalan milik dispatcher yang sudah mati (proses app sebelumnya: restart/crash) dikembalikan
+    ke antrian; job milik proses app lain yang masih hidup dengan store yang sama dibiarkan.
+    """
+    runner_id = uuid.uuid4().hex
+    with closing(jobs_connect(root)) as conn, conn:
+        _heartbeat(conn, runner_id)
+        _requeue_orphans(conn)
+    runner = {
+        "id": runner_id, "root": root, "artifact_root": artifact_root, "workers": workers, "factory": executor_factory,
+        "pool": None, "running": {}, "wake": threading.Event(), "purged": 0.0, "beat": time.monotonic(),
+    }
+    threading.Thread(target=_dispatch_loop, args=(runner,), name="job-dispatcher", daemon=True).start()
+    return runner
+
+def _heartbeat(conn, runner_id: str):
+    # Tanda hidup dispatcher; pid & host hanya untuk diagnosa (pid bisa dipakai ulang setelah restart container)
+    now = time.time()
+    conn.execute(
+        "INSERT INTO runners (id, pid, host, started, seen) VALUES (?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET seen = ?",
+        (runner_id, os.getpid(), socket.gethostname(), now, now, now),
+    )
+
+def _requeue_orphans(conn) -> int:
+    # Job berjalan yang dispatcher-nya tidak memberi heartbeat selama RUNNER_STALE (atau dari store sebelum kolom
+    # runner) kembali antre; return jumlahnya
+    conn.execute("DELETE FROM runners WHERE seen < ?", (time.time() - RUNNER_STALE,))
+    return conn.execute(
+        "UPDATE jobs SET status = 'queued', runner = NULL"
+        " WHERE status = 'running' AND (runner IS NULL OR runner NOT IN (SELECT id FROM runners))"
+    ).rowcount
+
+def wake_runner(runner: dict):
+    # Panggil setelah submit_job agar job baru langsung diambil
+    runner["wake"].set()
+
+def _dispatch_loop(runner: dict):
+    while True:
+        runner["wake"].wait(timeout=PROGRESS_INTERVAL)
+        runner["wake"].clear()
+        try:
+            _dispatch(runner)
+        except Exception:
+            LOGGER.exception("dispatcher job gagal")
+
+def _dispatch(runner: dict):
+    root, running = runner["root"], runner["running"]
+    with closing(jobs_connect(root)) as conn:
+        if time.monotonic() - runner["beat"] >= RUNNER_HEARTBEAT:
+            runner["beat"] = time.monotonic()
+            with conn:
+                _heartbeat(conn, runner["id"])
+                requeued = _requeue_orphans(conn)
+            if requeued: LOGGER.warning("%d job dari dispatcher yang berhenti dikembalikan ke antrian", requeued)
+        for job_id, (future, job) in list(running.items()):
+            if not future.done():
+                progress = _read_progress(_job_dir(job_id, root))
+                if progress is not None:
+                    with conn:
+                        conn.execute("UPDATE jobs SET done = ?, total = ? WHERE id = ?", (progress["done"], progress["total"], job_id))
+                continue
+            del running[job_id]
+            error = future.exception()
+            if error is None:
+                progress = _read_progress(_job_dir(job_id, root)) or {"done": 0, "total": 0}
+                with conn:
+                    conn.execute("UPDATE jobs SET done = ?, total = ? WHERE id = ?", (progress["done"], progress["total"], job_id))
+                    _finish(conn, job_id, "failed" if future.result() else "done", future.result())
+                if future.result() is None and job["job_key"] is not None: _cache_result(runner, job)
+                continue
+            # Worker mati (mis. kehabisan memori): job gagal, pool yang rusak dibuat ulang
+            LOGGER.error("job %s: worker berhenti", job_id, exc_info=error)
+            with conn: _finish(conn, job_id, "failed", f"Worker berhenti ({type(error).__name__})")
+            if isinstance(error, BrokenExecutor) and runner["pool"] is not None:
+                runner["pool"].shutdown(wait=False)
+                runner["pool"] = None
+        while len(running) < runner["workers"]:
+            job = _claim_next(conn, runner["id"])
+            if job is None: break
+            if runner["pool"] is None: runner["pool"] = runner["factory"]()
+            future = runner["pool"].submit(run_job, job["id"], job["kind"], job["profile"], root)
+            future.add_done_callback(lambda _: runner["wake"].set())
+            running[job["id"]] = (future, job)
+    if time.monotonic() - runner["purged"] > PURGE_INTERVAL:
+        runner["purged"] = time.monotonic()
+        purge_jobs(root)
+
+def _cache_result(runner: dict, job: dict):
+    # Hasil yang berhasil (tanpa error di hasil) disimpan ke cache hasil; gagal menyimpan tidak menggagalkan job
+    job_dir = _job_dir(job["id"], runner["root"])
+    try:
+        if job_result(job["id"], runner["root"])["error"]: return
+        names = [name for name in os.listdir(job_dir) if name == "result.pkl" or name.startswith("file_")]
+        artifact_store(artifact_key(job["job_key"]), job_dir, names, kind=job["kind"], root=runner["artifact_root"])
+    except OSError:
+        LOGGER.exception("hasil job %s tidak tersimpan ke cache", job["id"])
+
+# -----------------------------
+# JENIS JOB: (*args, progress) -> {"files": {kunci: (nama file, bytes)}, "previews", "warnings", "error"}
+# -----------------------------
+
+def shopee_out_job(data: bytes, base_name: str, progress):
+    progress["total"] = 1
+    report = out_platform_report(data)
+    progress["done"] += 1
+    return {
+        "files": {"converted": (f"{base_name}_converted.xlsx", report["converted"]),
+                  "filtered": (f"{base_name}_filtered.xlsx", report["filtered"])},
+        "previews": {"sorted": report["sorted"].head(10)},
+        "warnings": report["warnings"],
+    }
+
+def shopee_analitik_job(df_raw, base_name: str, progress):
+    progress["total"] = 1
+    results = process_variasi_modes(df_raw)
+    progress["done"] += 1
+    files, previews, errors = {}, {}, []
+    for mode, label in (("warna", "Warna"), ("ukuran", "Ukuran")):
+        df_final, excel_b, csv_buf, err = results[mode]
+        if err:
+            errors.append(err)
+            continue
+        files[f"excel_{mode}"] = (f"{base_name}_{label}.xlsx", excel_b.getvalue())
+        files[f"csv_{mode}"] = (f"{base_name}_{label}.csv", csv_buf.getvalue())
+        previews[mode] = df_final.tail(30)
+    return {"files": files, "previews": previews, "error": errors[0] if errors else None}
+
+def shopee_ads_job(df, base_name: str, csv_mode: str, include: dict, progress):
+    progress["total"] = 1
+    report = build_ads_report(df, csv_mode, **include)
+    progress["done"] += 1
+    return {"files": {"report": (f"{base_name}_colored.xlsx", report)}}
+
+def meta_excel_job(df, css, filename: str, variant: str, progress):
+    progress["total"] = 1
+    export = excel_highlight_cpas if variant == "cpas" else excel_highlight_wa
+    data = export(df, css)
+    progress["done"] += 1
+    return {"files": {"excel": (filename, data)}}
+
+def tiktok_fixer_job(df_hasil, base_name: str, use_roi_color: bool, progress):
+    progress["total"] = 1
+    if use_roi_color:
+        data, df_preview = build_roi_workbook(df_hasil)
+        outname = f"{base_name}_colored.xlsx"
+    else:
+        data, df_preview = build_fixer_workbook(df_hasil), df_hasil
+        outname = f"{base_name}_sorted.xlsx"
+    progress["done"] += 1
+    return {"files": {"excel": (outname, data)}, "previews": {"hasil": df_preview.head(10)}}
+
+def tiktok_daily_sheets_job(product_totals, numeric_metrics: list, filename: str, progress):
+    # Tanpa kolom Produk tidak ada sheet -> tanpa file (UI memberi keterangan)
+    return {"files": {"excel": (filename, build_product_sheets(product_totals, numeric_metrics, progress=progress))}}
+
+# nama -> fungsi job
+JOB_KINDS = {
+    "shopee-out": shopee_out_job,
+    "shopee-analitik": shopee_analitik_job,
+    "shopee-ads": shopee_ads_job,
+    "meta-excel": meta_excel_job,
+    "tiktok-fixer": tiktok_fixer_job,
+    "tiktok-daily-sheets": tiktok_daily_sheets_job,
+}
@@ -0,0 +1,180 @@
+# processing/kpi.py
+# Aturan KPI deklaratif (dipakai preview & export).
+# Satu aturan = {"when": [(kolom, operator, ambang), ...], "cols": [...], "css"/"label": ..., "stop": bool}.
+# Syarat dalam "when" di-AND; tanpa "cols" aturan berlaku untuk seluruh baris. Aturan dievaluasi
+# berurutan (yang belakangan menimpa) dan "stop" menutup baris yang cocok dari aturan berikutnya.
+# Kolom berawalan "~" dicari per kata kunci, mis. "~kampanye|campaign".
+
+import numpy as np
+import pandas as pd
+
+from processing.numbers import parse_numeric
+from processing.profiling import profiled
+
+
+KPI_BAD_CSS = "background-color: #ffc7ce"
+KPI_GOOD_CSS = "background-color: #c6efce"
+
+KPI_NUMERIC_OPS = {
+    ">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal, "==": np.equal,
+    # "!op" = kebalikan op; sel kosong (NaN) ikut terpilih
+    "!>": lambda v, t: ~np.greater(v, t), "!>=": lambda v, t: ~np.greater_equal(v, t), "!<": lambda v, t: ~np.less(v, t),
+    "isna": lambda v, t: np.isnan(v), "notna": lambda v, t: ~np.isnan(v),
+}
+KPI_TEXT_OPS = {
+    "is": lambda s, t: s.eq(t).to_numpy(dtype=bool),
+    "contains": lambda s, t: s.str.contains(t, regex=False).to_numpy(dtype=bool),
+    "!contains": lambda s, t: ~s.str.contains(t, regex=False).to_numpy(dtype=bool),
+}
+
+def _float_or_nan(v):
+    try:
+        return np.nan if pd.isna(v) else float(v)
+    except Exception:
+        return np.nan
+
+def float_like_series(s):
+    # Padanan vektor dari float(x) per sel: yang gagal diubah menjadi NaN
+    if pd.api.types.is_datetime64_any_dtype(s) or pd.api.types.is_timedelta64_dtype(s):
+        return pd.Series(np.nan, index=s.index)
+    if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+        return pd.Series(s.to_numpy(dtype=float, na_value=np.nan), index=s.index)
+    try: parsed = pd.to_numeric(s, errors="coerce")
+    except Exception: parsed = pd.Series(np.nan, index=s.index)
+    # Sisa sel yang ditolak to_numeric dicek ulang satu per satu
+    rest = parsed.isna() & s.notna()
+    if rest.any():
+        parsed = parsed.where(~rest, s[rest].map(_float_or_nan))
+    return pd.Series(parsed.to_numpy(dtype=float, na_value=np.nan), index=s.index)
+
+KPI_NUMBER_PARSERS = {"float": float_like_series, "percent": parse_numeric}
+
+def kpi_cell_rule(col, op, threshold, css, *when):
+    # Aturan satu kolom: sel di kolom itu diwarnai bila nilainya memenuhi ambang (+ syarat tambahan)
+    return {"when": [(col, op, threshold), *when], "cols": [col], "css": css}
+
+def kpi_rule_hits(df, rules, parser="float"):
+    """Evaluasi tabel aturan KPI -> list (mask baris, posisi kolom atau None, aturan)."""
+    to_number = KPI_NUMBER_PARSERS[parser]
+    n_rows = len(df)
+    numbers, texts = {}, {}
+
+    def resolve(name):
+        if isinstance(name, str) and name.startswith("~"):
+            keys = name[1:].split("|")
+            return next((c for c in df.columns if any(k in str(c).lower() for k in keys)), None)
+        return name if name is not None and name in df.columns else None
+
+    def number_col(col):
+        if col not in numbers:
+            numbers[col] = to_number(df[col]).to_numpy(dtype=float, na_value=np.nan) if col is not None else np.full(n_rows, np.nan)
+        return numbers[col]
+
+    def text_col(col):
+        if col not in texts:
+            s = df[col]
+            texts[col] = s.astype(object).where(s.notna(), "").astype(str).str.strip().str.lower()
+        return texts[col]
+
+    done = np.zeros(n_rows, dtype=bool)
+    hits = []
+    for rule in rules:
+        mask = ~done
+        for name, op, threshold in rule.get("when", []):
+            col = resolve(name)
+            if op in KPI_TEXT_OPS:
+                # Syarat teks pada kolom yang tidak ada tidak pernah terpenuhi
+                mask = mask & KPI_TEXT_OPS[op](text_col(col), threshold) if col is not None else np.zeros(n_rows, dtype=bool)
+            else:
+                mask = mask & KPI_NUMERIC_OPS[op](number_col(col), threshold)
+        targets = np.flatnonzero(pd.Index(df.columns).isin(rule["cols"])) if "cols" in rule else None
+        hits.append((mask, targets, rule))
+        if rule.get("stop"): done |= mask
+    return hits
+
+@profiled("style")
+def kpi_style_matrix(df, rules, parser="float"):
+    # Matriks CSS (baris x kolom) dihitung sekali per data; preview Styler & Excel memakai hasil yang sama
+    css = np.full(df.shape, "", dtype=object)
+    for mask, targets, rule in kpi_rule_hits(df, rules, parser):
+        if not rule.get("css"): continue
+        if targets is None: css[mask] = rule["css"]
+        else: css[np.ix_(mask, targets)] = rule["css"]
+    return css
+
+@profiled("transform")
+def kpi_row_labels(df, rules, parser="float"):
+    # Label per baris (mis. kategori warna): label dari aturan pertama yang cocok, lewat np.select
+    hits = [(mask, rule["label"]) for mask, _, rule in kpi_rule_hits(df, rules, parser) if rule.get("label") is not None]
+    if not hits: return np.full(len(df), None, dtype=object)
+    return np.select([mask for mask, _ in hits], np.array([label for _, label in hits], dtype=object), default=None)
+
+def kpi_styler(styler, css):
+    # Pasang matriks CSS ke Styler (df.style) untuk preview
+    return styler.apply(lambda d: pd.DataFrame(css, index=d.index, columns=d.columns), axis=None)
+
+# --- Meta: CPAS & WhatsApp Ads ---
+META_BASE_RULES = [
+    kpi_cell_rule("CPM (Biaya Per 1.000 Tayangan)", ">", 15000, KPI_BAD_CSS),
+    kpi_cell_rule("CTR (Rasio Klik Tayang Tautan)", "<", 0.5, KPI_BAD_CSS),
+    kpi_cell_rule("Frekuensi", ">", 3, KPI_BAD_CSS),
+]
+META_CPAS_RULES = META_BASE_RULES + [
+    kpi_cell_rule("ROAS Pembelian Khusus untuk Item Bersama", ">=", 10, KPI_GOOD_CSS),
+    kpi_cell_rule("ROAS pembelian khusus untuk item bersama", ">=", 10, KPI_GOOD_CSS),
+]
+META_WA_RULES = META_BASE_RULES + [
+    # Kampanye "visit" punya batas Biaya per hasil yang jauh lebih rendah
+    kpi_cell_rule("Biaya per hasil", ">", 500, KPI_BAD_CSS, ("~kampanye|campaign", "contains", "visit")),
+    kpi_cell_rule("Biaya per hasil", ">", 5000, KPI_BAD_CSS, ("~kampanye|campaign", "!contains", "visit")),
+]
+
+# --- Shopee Ads: warna DATA_IKLAN & kategori RINGKASAN_IKLAN ---
+SHOPEE_SKIP_RULES = [
+    {"when": [("Produk Terjual", "isna", None)], "stop": True},
+    {"when": [("Biaya", "isna", None)], "stop": True},
+]
+SHOPEE_IKLAN_STYLE_RULES = SHOPEE_SKIP_RULES + [
+    {"when": [("Biaya", "==", 0), ("Produk Terjual", ">", 0)], "css": "color: #006400", "stop": True},
+    {"when": [("Produk Terjual", "==", 0), ("Biaya", ">=", 10000)], "css": "color: #FF0000", "stop": True},
+    {"when": [("Produk Terjual", "==", 0), ("Biaya", "<", 10000)], "stop": True},
+    {"when": [("Efektifitas Iklan", "<", 8)], "css": "background-color: red"},
+    {"when": [("Efektifitas Iklan", ">=", 8), ("Efektifitas Iklan", "<", 10)], "css": "background-color: yellow"},
+    {"when": [("Efektifitas Iklan", ">=", 10)], "css": "background-color: lightgreen"},
+    # Terjual tapi GMV langsung kosong/0 -> tandai nama iklan & GMV
+    {"when": [("Produk Terjual", ">", 0), ("Penjualan Langsung (GMV Langsung)", "!>", 0), ("Penjualan Langsung (GMV Langsung)", "!<", 0)],
+     "cols": ["Nama Iklan", "Penjualan Langsung (GMV Langsung)"], "css": "background-color: lightblue"},
+]
+SHOPEE_KATEGORI_SKIP_RULES = SHOPEE_SKIP_RULES + [
+    {"when": [("Biaya", "==", 0), ("Produk Terjual", ">", 0)], "stop": True},
+    {"when": [("Produk Terjual", "==", 0)], "stop": True},
+]
+SHOPEE_KATEGORI_ROAS_RULES = [
+    {"when": [("Efektifitas Iklan", "!>=", 8)], "label": "MERAH", "stop": True},
+    {"when": [("Efektifitas Iklan", "<", 10)], "label": "KUNING", "stop": True},
+    {"when": [], "label": "HIJAU", "stop": True},
+]
+SHOPEE_KATEGORI_RULES = {
+    "CSV Keseluruhan (Normal)": SHOPEE_KATEGORI_SKIP_RULES + SHOPEE_KATEGORI_ROAS_RULES,
+    # Iklan grup tanpa ROAS tetap HIJAU selama ada penjualan
+    "CSV Grup Iklan (hanya iklan produk)": SHOPEE_KATEGORI_SKIP_RULES + [
+        {"when": [("Efektifitas Iklan", "isna", None), ("Produk Terjual", ">", 0)], "label": "HIJAU", "stop": True},
+        {"when": [("Efektifitas Iklan", "isna", None)], "stop": True},
+    ] + SHOPEE_KATEGORI_ROAS_RULES,
+}
+
+# --- TikTok: pewarnaan ROI (nama kolom mengikuti file yang diupload) ---
+def tiktok_roi_rules(col_biaya, col_pendapatan, col_roi, col_status):
+    rules = []
+    if col_status is not None:
+        rules += [
+            {"when": [(col_status, "is", "perlu otorisasi")], "css": "background-color: #98f073"},
+            {"when": [(col_status, "is", "perlu otorisasi")], "cols": [col_status], "css": "background-color: #ff7979", "stop": True},
+        ]
+    return rules + [
+        {"when": [(col_roi, "isna", None)], "stop": True},
+        {"when": [(col_biaya, "!>", 0), (col_pendapatan, "!>", 0)], "stop": True},
+        {"when": [(col_roi, "==", 0)], "stop": True},
+        {"when": [(col_roi, ">=", 10)], "css": "background-color: #00ff00"},
+        {"when": [(col_roi, "<", 10)], "css": "background-color: #ffff00"},
+    ]
@@ -0,0 +1,99 @@
+# processing/meta.py
+# META Ads KPI Highlight: laporan CPAS (header baris 1) & WhatsApp Ads (header baris 3)
+# dibaca, diwarnai dengan aturan KPI dan ditulis ulang ke Excel.
+
+import io
+
+import numpy as np
+import pandas as pd
+from openpyxl.utils import get_column_letter
+
+from processing.kpi import META_CPAS_RULES, META_WA_RULES, float_like_series, kpi_style_matrix
+from processing.profiling import profiled
+from processing.xlsx import css_matrix_to_xlsx, streaming_workbook, workbook_bytes, write_frame
+
+
+KEEP_DECIMAL_COLS = ["Frekuensi", "Tingkat klik tayang outbound"]
+
+def to_number_matrix(df):
+    # Nilai angka per sel (NaN = bukan angka), dihitung sekali per upload
+    num = np.full(df.shape, np.nan)
+    for i in range(df.shape[1]):
+        num[:, i] = float_like_series(df.iloc[:, i]).to_numpy()
+    return num
+
+def write_kpi_sheet(ws, df, css):
+    # Sel angka ditulis sebagai float (%ATC dinormalkan ke pecahan), sel lain apa adanya
+    num = to_number_matrix(df)
+    is_num = ~np.isnan(num)
+    pct_cols = np.array(["%ATC" in str(c) for c in df.columns], dtype=bool)
+    dec_cols = np.array([c in KEEP_DECIMAL_COLS for c in df.columns], dtype=bool)
+    values = np.where(pct_cols & (num > 1), num / 100.0, num).astype(object)
+    out = pd.DataFrame(np.where(is_num, values, df.to_numpy(dtype=object)), columns=df.columns)
+    col_formats = np.where(pct_cols, "0.00%", np.where(dec_cols, "0.##", "0")).astype(object)
+
+    fills, _ = css_matrix_to_xlsx(css)
+    write_frame(ws, out, fills=fills, number_formats=np.where(is_num, col_formats, None))
+
+def format_cell_for_preview(val, column):
+    if pd.isna(val): return ""
+    try: v = float(val)
+    except: return val
+
+    if "%ATC" in str(column):
+        if v <= 1: v = v * 100
+        return f"{v:.2f}%"
+
+    if column in KEEP_DECIMAL_COLS:
+        return f"{v:.2f}"
+    return f"{v:.0f}"
+
+def _finish_report(df: pd.DataFrame):
+    # Tanggal "Awal pelaporan" (untuk nama file) diambil sebelum angka kosong diisi 0
+    tgl_awal = ""
+    if "Awal pelaporan" in df.columns and not df["Awal pelaporan"].dropna().empty:
+        raw_tgl = df["Awal pelaporan"].dropna().iloc[0]
+        if pd.notna(raw_tgl):
+            # Jika format datetime, ubah jadi string YYYY-MM-DD. Jika bukan, ambil teksnya & hilangkan karakter ilegal /
+            tgl_awal = raw_tgl.strftime("%Y-%m-%d") if hasattr(raw_tgl, 'strftime') else str(raw_tgl).replace("/", "-")
+
+    num_cols = df.select_dtypes(include="number").columns
+    df[num_cols] = df[num_cols].fillna(0)
+    return df, tgl_awal
+
+@profiled("parse")
+def read_cpas_report(data: bytes):
+    # Return (DataFrame siap diwarnai, tanggal awal pelaporan atau "")
+    return _finish_report(pd.read_excel(io.BytesIO(data), header=0))
+
+@profiled("parse")
+def read_wa_report(data: bytes):
+    # Header tabel di baris ke-3; kolom tanpa nama (Unnamed/kosong) dibuang
+    df = pd.read_excel(io.BytesIO(data), header=2)
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed', na=False)]
+    df = df.loc[:, df.columns.notna()]
+    df = df.loc[:, df.columns != ""]
+    return _finish_report(df)
+
+def report_filename(base_name: str, tgl_awal: str) -> str:
+    return f"{base_name}_{tgl_awal}_sorted.xlsx" if tgl_awal else f"{base_name}_sorted.xlsx"
+
+@profiled("write")
+def _kpi_workbook(df, css, sheet_name, blank_rows=0) -> bytes:
+    wb = streaming_workbook()
+    ws = wb.create_sheet(sheet_name)
+
+    for i, col in enumerate(df.columns, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = min(max(15, len(str(col)) + 2), 50)
+    for _ in range(blank_rows): ws.append([])
+    write_kpi_sheet(ws, df, css)
+    return workbook_bytes(wb)
+
+def excel_highlight_cpas(df, css=None) -> bytes:
+    if css is None: css = kpi_style_matrix(df, META_CPAS_RULES)
+    return _kpi_workbook(df, css, "KPI Highlight")
+
+def excel_highlight_wa(df, css=None) -> bytes:
+    # Header di baris ke-3, sama seperti format file sumbernya
+    if css is None: css = kpi_style_matrix(df, META_WA_RULES)
+    return _kpi_workbook(df, css, "KPI Highlight Custom", blank_rows=2)
@@ -0,0 +1,66 @@
+# processing/numbers.py
+# Parsing angka: satu parser vektor untuk Shopee, TikTok & aturan KPI.
+
+import numpy as np
+import pandas as pd
+
+
+def parse_numeric(s, decimal=".", percent="fraction", numbers_as_percent=False) -> pd.Series:
+    """Ubah kolom campuran teks/angka menjadi angka dengan operasi .str & to_numeric (tanpa apply per sel).
+
+    decimal: "." untuk 1,234.5 (koma = ribuan) atau "," untuk 1.234,5 (format Indonesia, titik = ribuan).
+    percent: "fraction" -> teks berisi "%" dibagi 100; "strip" -> tanda "%" hanya dibuang.
+    numbers_as_percent: sel angka (bukan teks) > 1 dianggap skala 0-100 lalu dibagi 100.
+    Teks "(x)" dibaca negatif dan spasi diabaikan. Teks kosong/"-"/tidak terbaca, tanggal & objek lain -> NaN.
+    Seperti pd.to_numeric, hasil bertipe int64 bila semua sel bilangan bulat tanpa NaN, selain itu float64.
+    Setiap nilai unik hanya diparse sekali (factorize), lalu hasilnya disebar ke semua baris.
+
+        teks          decimal="."   decimal=","
+        "1,234.5"     1234.5        1.2345
+        "1.234,5"     1.2345        1234.5
+        "12,5%"       1.25          0.125      (percent="strip": 125.0 / 12.5)
+        "(1,000)"     -1000         -1
+        " 1 000 "     1000          1000
+        "", "-", "x"  NaN           NaN
+    """
+    s = s if isinstance(s, pd.Series) else pd.Series(s)
+    if pd.api.types.is_datetime64_any_dtype(s) or pd.api.types.is_timedelta64_dtype(s):
+        return pd.Series(np.nan, index=s.index, name=s.name)
+    if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+        if not numbers_as_percent: return pd.to_numeric(s)
+        values = s.astype(float)
+        return values.where(~(values > 1), values / 100)
+
+    codes, uniques = pd.factorize(s)
+    uniques = pd.Series(np.asarray(uniques, dtype=object))
+    if pd.api.types.infer_dtype(uniques, skipna=False) == "string":
+        is_text, is_number, number_types = np.ones(len(uniques), dtype=bool), np.zeros(len(uniques), dtype=bool), []
+    else:
+        types = uniques.map(type)
+        number_types = [t for t in types.unique() if issubclass(t, (int, float, np.number))]
+        is_number = types.isin(number_types).to_numpy()
+        is_text = types.eq(str).to_numpy()
+    out = np.full(len(uniques), np.nan)
+    integral = all(issubclass(t, (int, np.integer)) for t in number_types) and not numbers_as_percent
+
+    if is_number.any():
+        numbers = uniques[is_number].to_numpy(dtype=float)
+        out[is_number] = np.where(numbers > 1, numbers / 100, numbers) if numbers_as_percent else numbers
+
+    if is_text.any():
+        text = uniques[is_text].astype(str).str.strip()
+        has_pct = text.str.contains("%", regex=False).to_numpy()
+        negative = (text.str.startswith("(") & text.str.endswith(")")).to_numpy()
+        text = text.mask(negative, text.str[1:-1]).str.replace("%", "", regex=False).str.replace(" ", "", regex=False)
+        if decimal == ",": text = text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        else: text = text.str.replace(",", "", regex=False)
+        parsed = pd.to_numeric(text, errors="coerce")
+        integral = integral and pd.api.types.is_integer_dtype(parsed) and not (percent == "fraction" and has_pct.any())
+        values = parsed.to_numpy(dtype=float, na_value=np.nan)
+        values = np.where(negative, -values, values)
+        out[is_text] = np.where(has_pct, values / 100, values) if percent == "fraction" else values
+
+    out = np.append(out, np.nan)[codes]  # kode -1 (NaN/None) -> NaN
+    if integral and len(out) and not np.isnan(out).any():
+        return pd.Series(out.astype(np.int64), index=s.index, name=s.name)
+    return pd.Series(out, index=s.index, name=s.name)
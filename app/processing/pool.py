@@ -0,0 +1,31 @@
+# processing/pool.py
+# Process pool untuk app Streamlit, sekaligus modul entry worker-nya.
+# Worker tidak di-fork langsung dari server Streamlit: server itu multi-thread, dan proses hasil fork bisa
+# mewarisi lock yang sedang dipegang thread lain. Worker dibuat lewat forkserver (fork dari proses server
+# kecil yang satu thread), atau spawn bila forkserver tidak ada (mis. Windows).
+# Proses anak forkserver/spawn mengimpor modul __main__ induknya. Di Streamlit itu app.py (modul "__main__"
+# buatan script runner), jadi app.py menyetel __spec__-nya ke WORKER_MAIN_SPEC: worker mengimpor modul
+# kecil ini sebagai __mp_main__, bukan menjalankan ulang app.py.
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+# Modul yang diimpor sekali oleh forkserver lalu diwarisi setiap worker (pandas/openpyxl tidak diimpor ulang)
+POOL_PRELOAD = ["processing.tiktok_daily", "processing.jobs"]
+
+WORKER_MAIN_SPEC = __spec__
+
+# Worker menerima sys.path induk saat dibuat. Streamlit memasang folder app di sys.path hanya selama skrip
+# berjalan (lalu membuangnya), jadi satu salinan ditambahkan permanen agar paket processing tetap bisa
+# diimpor worker yang dibuat di luar script run (mis. dari thread dispatcher job).
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(APP_DIR)
+
+def process_pool(workers: int, initializer=None) -> ProcessPoolExecutor:
+    ctx = multiprocessing.get_context(POOL_START_METHOD)
+    if POOL_START_METHOD == "forkserver": ctx.set_forkserver_preload(POOL_PRELOAD)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=initializer)
@@ -0,0 +1,196 @@
+# processing/profiling.py
+# Profil tahap pengolahan: wall time, CPU time, puncak memori (tracemalloc) & jumlah baris per tahap.
+# Perekaman hanya aktif di dalam profile_session(); di luar sesi, fungsi @profiled hanya membaca satu
+# ContextVar lalu langsung memanggil fungsi aslinya, jadi biayanya bisa diabaikan.
+# Sesi dibawa ContextVar: sesi Streamlit yang berjalan bersamaan (thread berbeda) tidak tercampur, dan
+# thread pool di dalam sesi perlu contextvars.copy_context() agar tahapnya ikut terekam. CPU time dihitung
+# per thread. tracemalloc berlaku untuk seluruh proses, jadi angka memori hanya akurat bila satu sesi
+# yang mengukur memori pada satu waktu.
+# Tiap tahap yang selesai juga ditulis sebagai satu baris JSON ke logger "processing.profile" (INFO).
+
+import contextvars
+import itertools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+
+PROFILE_LOGGER = logging.getLogger("processing.profile")
+STAGES = ["parse", "transform", "style", "write", "store"]
+
+# (trace, frame induk) selama sesi aktif; None = tidak merekam
+_active = contextvars.ContextVar("processing_profile", default=None)
+_span_ids = itertools.count(1)
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_state = {"users": 0, "owned": False}
+
+def new_trace(label: str, memory: bool = False) -> dict:
+    """Hasil sesi: "spans" = tahap sesuai urutan mulai (id, parent, depth, stage, name, wall_s, cpu_s, peak_mb, rows).
+
+    parallel=True: tahap berjalan di thread lain dari induknya (mis. process_variasi_modes).
+    """
+    return {"label": label, "memory": memory, "spans": [], "wall_s": 0.0, "cpu_s": 0.0, "peak_mb": None}
+
+def _tracemalloc_acquire():
+    with _tracemalloc_lock:
+        if _tracemalloc_state["users"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_state["owned"] = True
+        _tracemalloc_state["users"] += 1
+
+def _tracemalloc_release():
+    with _tracemalloc_lock:
+        _tracemalloc_state["users"] -= 1
+        if _tracemalloc_state["users"] == 0 and _tracemalloc_state["owned"]:
+            tracemalloc.stop()
+            _tracemalloc_state["owned"] = False
+
+def _log(event: str, **fields):
+    if PROFILE_LOGGER.isEnabledFor(logging.INFO):
+        PROFILE_LOGGER.info(json.dumps({"event": event, **fields}, default=str))
+
+def _mb(nbytes) -> float:
+    return round(nbytes / 2**20, 3)
+
+@contextmanager
+def profile_session(label: str, memory: bool = False, trace: dict = None):
+    """Rekam semua tahap yang berjalan di blok ini (thread & context yang sama). Yield dict trace.
+
+    trace: lanjutkan trace yang sudah ada (mis. beberapa blok dalam satu rerun), angka total dijumlahkan.
+    """
+    trace = trace if trace is not None else new_trace(label, memory)
+    memory = memory and trace["memory"]
+    if memory:
+        _tracemalloc_acquire()
+        mem0 = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    root = {"id": None, "depth": -1, "parent": None, "peak": mem0 if memory else 0, "thread": threading.get_ident()}
+    token = _active.set((trace, root))
+    wall0, cpu0 = time.perf_counter(), time.thread_time()
+    try:
+        yield trace
+    finally:
+        _active.reset(token)
+        trace["wall_s"] += time.perf_counter() - wall0
+        trace["cpu_s"] += time.thread_time() - cpu0
+        if memory:
+            root["peak"] = max(root["peak"], tracemalloc.get_traced_memory()[1])
+            trace["peak_mb"] = max(trace["peak_mb"] or 0.0, _mb(root["peak"] - mem0))
+            _tracemalloc_release()
+        _log("session", label=trace["label"], wall_s=round(trace["wall_s"], 4), cpu_s=round(trace["cpu_s"], 4),
+             peak_mb=trace["peak_mb"], spans=len(trace["spans"]))
+
+@contextmanager
+def profile_stage(stage: str, name: str = None, rows: int = None):
+    """Satu tahap (stage = parse/transform/style/write/store). Yield dict span; isi span["rows"] bila perlu.
+
+    Di luar profile_session yang di-yield dict kosong dan tidak ada yang diukur.
+    """
+    state = _active.get()
+    if state is None:
+        yield {}
+        return
+    trace, parent = state
+    memory = trace["memory"] and tracemalloc.is_tracing()
+    span = {"id": next(_span_ids), "parent": parent["id"], "depth": parent["depth"] + 1, "stage": stage,
+            "name": name or stage, "wall_s": None, "cpu_s": None, "peak_mb": None, "rows": rows,
+            "parallel": threading.get_ident() != parent["thread"]}
+    trace["spans"].append(span)
+    frame = {"id": span["id"], "depth": span["depth"], "parent": parent, "peak": 0, "mem0": 0, "thread": threading.get_ident()}
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        parent["peak"] = max(parent["peak"], peak)
+        tracemalloc.reset_peak()
+        frame["mem0"] = frame["peak"] = current
+    token = _active.set((trace, frame))
+    wall0, cpu0 = time.perf_counter(), time.thread_time()
+    try:
+        yield span
+    finally:
+        span["wall_s"] = time.perf_counter() - wall0
+        span["cpu_s"] = time.thread_time() - cpu0
+        _active.reset(token)
+        if memory:
+            # Puncak tahap termasuk tahap di dalamnya (sama seperti wall time)
+            frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            span["peak_mb"] = _mb(frame["peak"] - frame["mem0"])
+            parent["peak"] = max(parent["peak"], frame["peak"])
+            tracemalloc.reset_peak()
+        _log("stage", label=trace["label"], stage=stage, name=span["name"], depth=span["depth"],
+             wall_s=round(span["wall_s"], 4), cpu_s=round(span["cpu_s"], 4), peak_mb=span["peak_mb"], rows=span["rows"])
+
+def _frame_rows(result, args):
+    # Jumlah baris: DataFrame hasil (atau elemen pertama tuple hasil), kalau tidak ada DataFrame argumen pertama
+    candidates = result if isinstance(result, tuple) else (result,)
+    for value in (*candidates, *args):
+        if isinstance(value, pd.DataFrame): return len(value)
+    return None
+
+def profiled(stage: str, name: str = None):
+    """Decorator: catat setiap panggilan sebagai tahap `stage` (nama = nama fungsi) selama sesi aktif."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None: return func(*args, **kwargs)
+            with profile_stage(stage, label) as span:
+                result = func(*args, **kwargs)
+                span["rows"] = _frame_rows(result, args)
+                return result
+        return wrapper
+    return decorate
+
+def reset_in_worker():
+    # Initializer process pool: proses hasil fork tidak ikut merekam sesi (& tracemalloc) milik induknya
+    _active.set(None)
+    if tracemalloc.is_tracing(): tracemalloc.stop()
+
+# -----------------------------
+# RINGKASAN
+# -----------------------------
+
+def stage_totals(trace: dict) -> dict:
+    """Waktu eksklusif per stage (tahap luar tidak ikut menghitung tahap di dalamnya) + "other" = di luar tahap.
+
+    Return {stage: {"wall_s", "cpu_s", "calls", "peak_mb"}}; peak_mb = puncak tertinggi tahap stage itu.
+    Tahap paralel tidak dikurangkan dari induknya (induk menunggu), jadi jumlahnya bisa melebihi total.
+    """
+    child_wall, child_cpu = {}, {}
+    for span in trace["spans"]:
+        if span["wall_s"] is None or span["parallel"]: continue
+        child_wall[span["parent"]] = child_wall.get(span["parent"], 0.0) + span["wall_s"]
+        child_cpu[span["parent"]] = child_cpu.get(span["parent"], 0.0) + span["cpu_s"]
+    totals = {}
+    for span in trace["spans"]:
+        if span["wall_s"] is None: continue
+        t = totals.setdefault(span["stage"], {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0, "peak_mb": None})
+        t["wall_s"] += span["wall_s"] - child_wall.get(span["id"], 0.0)
+        t["cpu_s"] += span["cpu_s"] - child_cpu.get(span["id"], 0.0)
+        t["calls"] += 1
+        if span["peak_mb"] is not None: t["peak_mb"] = max(t["peak_mb"] or 0.0, span["peak_mb"])
+    ordered = {s: totals.pop(s) for s in STAGES if s in totals}
+    ordered.update(totals)
+    ordered["other"] = {
+        "wall_s": trace["wall_s"] - child_wall.get(None, 0.0), "cpu_s": trace["cpu_s"] - child_cpu.get(None, 0.0),
+        "calls": 1, "peak_mb": None,
+    }
+    return ordered
+
+def profile_table(trace: dict) -> pd.DataFrame:
+    # Tabel untuk panel debug: satu baris per tahap, nama diindentasi sesuai kedalaman (∥ = thread paralel)
+    rows = [{
+        "Tahap": span["stage"],
+        "Fungsi": "· " * span["depth"] + span["name"] + (" ∥" if span["parallel"] else ""),
+        "Waktu (ms)": None if span["wall_s"] is None else round(span["wall_s"] * 1000, 1),
+        "CPU (ms)": None if span["cpu_s"] is None else round(span["cpu_s"] * 1000, 1),
+        "Puncak memori (MiB)": span["peak_mb"],
+        "Baris": span["rows"],
+    } for span in trace["spans"]]
+    return pd.DataFrame(rows, columns=["Tahap", "Fungsi", "Waktu (ms)", "CPU (ms)", "Puncak memori (MiB)", "Baris"])
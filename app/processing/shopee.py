@@ -0,0 +1,697 @@
+# processing/shopee.py
+# Pengolahan file Shopee: Out Platform (convert titik/koma -> sort -> filter), Analitik Produk
+# per variasi, laporan CSV Shopee Ads & pembersih link UTM. Bytes masuk, DataFrame/bytes keluar.
+
+import contextvars
+import io
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles import PatternFill, Font, Alignment
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from processing.excel_io import read_sheet_rows, rows_to_frame
+from processing.kpi import SHOPEE_IKLAN_STYLE_RULES, SHOPEE_KATEGORI_RULES, kpi_row_labels, kpi_style_matrix
+from processing.numbers import parse_numeric
+from processing.profiling import profiled
+from processing.shortener import shorten_many
+from processing.xlsx import css_matrix_to_xlsx, streaming_workbook, workbook_bytes, write_frame, xlsx_cell
+
+SHOPEE_ADS_MODES = list(SHOPEE_KATEGORI_RULES)
+
+# -----------------------------
+# OUT PLATFORM: CONVERT -> SORT -> FILTER
+# -----------------------------
+
+@profiled("write")
+def to_excel_bytes_from_sheets(sheets: dict) -> bytes:
+    wb = streaming_workbook()
+    for sheet_name, df in sheets.items():
+        ws = wb.create_sheet(sheet_name)
+        alignments = None
+        if "Ringkasan" in sheet_name:
+            for col_idx in range(1, len(df.columns) + 1):
+                ws.column_dimensions[get_column_letter(col_idx)].width = 40
+            alignments = np.full(df.shape, None, dtype=object)
+            alignments[:1] = Alignment(wrap_text=True, vertical="top")
+        write_frame(ws, df, alignments=alignments)
+
+    return workbook_bytes(wb)
+
+# Tukar titik <-> koma dalam satu langkah (tanpa placeholder sementara)
+DOT_COMMA_SWAP = str.maketrans({".": ",", ",": "."})
+# Teks yang oleh pd.read_excel dianggap kosong (na_values bawaan pandas)
+EXCEL_NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
+def swap_dot_comma_df(df: pd.DataFrame) -> pd.DataFrame:
+    def swap_cell(x):
+        if isinstance(x, str):
+            return x.translate(DOT_COMMA_SWAP)
+        return x
+    if hasattr(df, 'map'):
+        return df.map(swap_cell)
+    return df.applymap(swap_cell)
+
+def dot_comma_cell(value):
+    # Sama dengan read_excel(dtype=str) + tukar titik/koma; nilai kosong -> sel kosong
+    if isinstance(value, float) and np.isnan(value): return None
+    text = str(value)
+    if text in EXCEL_NA_STRINGS: return None
+    return text.translate(DOT_COMMA_SWAP)
+
+@profiled("transform")
+def convert_workbook_dot_comma(data: bytes):
+    """Baca workbook sekali (read-only), tulis versi titik/koma tertukar (write-only).
+
+    Sheet "Performa Produk" (atau sheet pertama) ikut dikembalikan sebagai DataFrame
+    seperti pd.read_excel, supaya tahap sort/filter tidak mem-parse ulang file.
+    """
+    wb_in = load_workbook(io.BytesIO(data), read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet_names = wb_in.sheetnames
+        target_sheet = "Performa Produk" if "Performa Produk" in sheet_names else sheet_names[0]
+        wb_out = streaming_workbook()
+        df_target = pd.DataFrame()
+        for ws_in in wb_in.worksheets:
+            rows = read_sheet_rows(ws_in)
+            ws_out = wb_out.create_sheet(ws_in.title)
+            if rows:
+                ws_out.append(list(rows_to_frame(rows[:1]).columns))
+                for row in rows[1:]:
+                    ws_out.append([dot_comma_cell(v) for v in row])
+            else:
+                ws_out.append([])
+            if ws_in.title == target_sheet:
+                df_target = rows_to_frame(rows)
+    finally:
+        wb_in.close()
+
+    return workbook_bytes(wb_out), target_sheet, df_target
+
+@profiled("transform")
+def generate_ringkasan(df_source) -> pd.DataFrame:
+    # Nama produk (disingkat) per platform iklan, dipisah koma dalam satu sel
+    res = {"Sales": [], "Traffic": [], "Instagram": []}
+    if not df_source.empty:
+        ch = df_source["Channel"].astype(str).str.lower()
+        kanal = np.select(
+            [ch.str.contains("sales", regex=False, na=False).to_numpy(dtype=bool),
+             ch.str.contains("traffic", regex=False, na=False).to_numpy(dtype=bool),
+             ch.str.contains("ig|instagram", regex=True, na=False).to_numpy(dtype=bool)],
+            ["Sales", "Traffic", "Instagram"], default="Sales",
+        )
+        prod_short = shorten_many(df_source["Produk"], max_words=2).to_numpy(dtype=object)
+        for k in res:
+            res[k] = prod_short[kanal == k].tolist()
+
+    final_dict = {}
+    for k in ["Sales", "Traffic", "Instagram"]:
+        unique_items = list(dict.fromkeys(res[k]))
+        if unique_items:
+            final_dict[k] = " ".join([f"{n}," for n in unique_items])
+        else:
+            final_dict[k] = ""
+    return pd.DataFrame([final_dict])
+
+@profiled("transform")
+def out_platform_report(data: bytes) -> dict:
+    """Satu file Excel -> {"converted": bytes, "filtered": bytes, "sorted": DataFrame, "warnings": [str]}.
+
+    converted: seluruh sheet dengan titik & koma ditukar. filtered: sheet "Performa Produk" (atau sheet
+    pertama) yang diurutkan, produk Terjual & ATC, serta ringkasannya per platform.
+    """
+    warnings = []
+    # TAHAP 1 (+ parsing sheet untuk TAHAP 2 dalam satu kali baca)
+    if zipfile.is_zipfile(io.BytesIO(data)):
+        excel_bytes_convert, target_sheet_sort, df_raw_sort = convert_workbook_dot_comma(data)
+    else:
+        # .xls lama tidak bisa dibaca openpyxl -> lewat pandas per sheet
+        xls = pd.ExcelFile(io.BytesIO(data))
+        sheets_convert = {}
+        for sheet_name in xls.sheet_names:
+            df_c = pd.read_excel(xls, sheet_name=sheet_name, dtype=str)
+            df_c = swap_dot_comma_df(df_c)
+            sheets_convert[sheet_name] = df_c
+        excel_bytes_convert = to_excel_bytes_from_sheets(sheets_convert)
+        target_sheet_sort = "Performa Produk" if "Performa Produk" in xls.sheet_names else xls.sheet_names[0]
+        df_raw_sort = pd.read_excel(xls, sheet_name=target_sheet_sort)
+
+    # TAHAP 2
+    req_sort = ["Channel", "Kode Produk"]
+    missing_sort = [c for c in req_sort if c not in df_raw_sort.columns]
+
+    if not missing_sort:
+        df_sorted = df_raw_sort.sort_values(by=["Channel", "Kode Produk"], ascending=[True, True])
+    else:
+        warnings.append(f"⚠️ Kolom Sort tidak lengkap {missing_sort} di sheet '{target_sheet_sort}'. Menggunakan data tanpa sort.")
+        df_sorted = df_raw_sort.copy()
+
+    # TAHAP 3
+    df_terjual = df_atc = df_ringkasan_terjual = df_ringkasan_atc = pd.DataFrame()
+    req_filter = ["Channel", "Produk", "Produk.1", "Produk Ditambahkan ke Keranjang"]
+    missing_filter = [c for c in req_filter if c not in df_sorted.columns]
+
+    if not missing_filter:
+        df_filter = df_sorted.copy()
+        df_filter["Produk.1"] = pd.to_numeric(df_filter["Produk.1"], errors="coerce").fillna(0)
+        df_filter["Produk Ditambahkan ke Keranjang"] = pd.to_numeric(df_filter["Produk Ditambahkan ke Keranjang"], errors="coerce").fillna(0)
+
+        df_terjual = df_filter[df_filter["Produk.1"] > 0][["Channel", "Produk"]].drop_duplicates().sort_values(by=["Channel", "Produk"]).reset_index(drop=True)
+        df_atc = df_filter[df_filter["Produk Ditambahkan ke Keranjang"] > 0][["Channel", "Produk"]].drop_duplicates().sort_values(by=["Channel", "Produk"]).reset_index(drop=True)
+        df_ringkasan_terjual = generate_ringkasan(df_terjual)
+        df_ringkasan_atc = generate_ringkasan(df_atc)
+    else:
+        warnings.append(f"⚠️ Kolom Filter tidak lengkap {missing_filter}. Tahap Filter dilewati.")
+
+    # SUSUN EXCEL 2
+    sheets_sort_filter = {"1_Data_Sorted": df_sorted}
+    if not df_terjual.empty: sheets_sort_filter["2_Produk_Terjual"] = df_terjual
+    if not df_atc.empty: sheets_sort_filter["3_Nama_Produk_ATC"] = df_atc
+    if not df_ringkasan_terjual.empty: sheets_sort_filter["4_Ringkasan_Terjual"] = df_ringkasan_terjual
+    if not df_ringkasan_atc.empty: sheets_sort_filter["5_Ringkasan_ATC"] = df_ringkasan_atc
+
+    return {
+        "converted": excel_bytes_convert, "filtered": to_excel_bytes_from_sheets(sheets_sort_filter),
+        "sorted": df_sorted, "warnings": warnings,
+    }
+
+# -----------------------------
+# ANALITIK PRODUK (PRODUK & VARIASI)
+# -----------------------------
+
+def normalize_cols(df):
+    return df.rename(columns=lambda c: re.sub(r"\s+", " ", str(c).strip()))
+
+def drop_kode_variasi_cols(df):
+    cols_to_drop = [c for c in df.columns if c.strip().lower() == "kode variasi"]
+    return df.drop(columns=cols_to_drop, errors="ignore")
+
+def extract_variation_base(name):
+    if pd.isna(name): return ""
+    s = str(name).strip()
+    if s == "" or s == "-": return ""
+    if "," in s:
+        parts = s.rsplit(",", 1)
+        base = parts[0].strip()
+    else:
+        base = s
+    return base
+
+def extract_size(name):
+    # Ekstrak ukuran (mengambil string setelah koma atau strip)
+    val_str = str(name)
+    if "," in val_str:
+        return val_str.split(",")[-1].strip()
+    elif "-" in val_str:
+        return val_str.split("-")[-1].strip()
+    return val_str.strip()
+
+def safe_div(a, b):
+    try:
+        a, b = float(a), float(b)
+        return 0.0 if b == 0 else a / b
+    except Exception: return 0.0
+
+def format_percentage(val):
+    return f"{val * 100:.2f}%".replace('.', ',')
+
+@profiled("write")
+def to_excel_bytes_with_styling(df, product_merge_col="Kode Produk", total_mask=None):
+    # Ditulis sekali jalan (write-only): nilai, warna, format, merge & dropdown tanpa reload workbook
+    wb = streaming_workbook()
+    ws = wb.create_sheet("Sheet1")
+
+    header = [str(c) for c in df.columns]
+    n_rows, last_col_idx = df.shape
+    prod_col_idx = header.index(product_merge_col) + 1 if product_merge_col in header else None
+    idr_col_indices = [i + 1 for i, col_name in enumerate(header) if "IDR" in col_name.upper()]
+
+    yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+    total_dropdown_fill = PatternFill(start_color="BDE2F5", end_color="BDE2F5", fill_type="solid")
+    var_dropdown_fill = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
+    grand_total_fill = PatternFill(start_color="D9EAD3", end_color="D9EAD3", fill_type="solid")
+    bold_font = Font(bold=True)
+    rupiah_format = '_-"Rp"* #,##0_-;-"Rp"* #,##0_-;_-"Rp"* "-"_-;_-@_-'
+    last_col_letter = get_column_letter(last_col_idx)
+
+    # --- KELAS BARIS: 0 = polos, 1 = total produk, 2 = variasi, 3 = grand total ---
+    row_class = np.zeros(n_rows, dtype=np.int8)
+    if total_mask is not None:
+        is_grand = (df["Kode Produk"] == "Total").to_numpy() if "Kode Produk" in df.columns else np.zeros(n_rows, dtype=bool)
+        row_class = np.select([is_grand, np.asarray(total_mask, dtype=bool)], [3, 1], default=2).astype(np.int8)
+
+    # Fill per kolom untuk tiap kelas baris (None = tanpa fill), lalu diindeks per baris
+    n_inner = last_col_idx - 1
+    class_fills = np.array([
+        [None] * last_col_idx,
+        [yellow_fill] * n_inner + [total_dropdown_fill],
+        [None] * n_inner + [var_dropdown_fill],
+        [grand_total_fill] * last_col_idx,
+    ], dtype=object)
+    class_fonts = np.array([[None] * last_col_idx] * 3 + [[bold_font] * last_col_idx], dtype=object)
+
+    # --- MERGE KODE PRODUK: blok baris berurutan dengan kode sama, berhenti di baris "Total" ---
+    merged_away = np.zeros(n_rows, dtype=bool)
+    merge_ranges = []
+    if prod_col_idx and n_rows:
+        prod = df[product_merge_col]
+        prod = prod.where(prod.ne("") & prod.notna())
+        stop = int(np.argmax(prod.eq("Total").to_numpy())) if prod.eq("Total").any() else n_rows
+        prod = prod.iloc[:stop].reset_index(drop=True)
+        run_id = prod.ne(prod.shift()).cumsum().to_numpy()
+        pos = pd.Series(np.arange(stop))
+        starts = pos.groupby(run_id).min().to_numpy()
+        ends = pos.groupby(run_id).max().to_numpy()
+        keep = (ends > starts) & prod.iloc[starts].notna().to_numpy()
+        prod_letter = get_column_letter(prod_col_idx)
+        for s, e in zip(starts[keep], ends[keep]):
+            merge_ranges.append(f"{prod_letter}{s + 2}:{prod_letter}{e + 2}")
+            merged_away[s + 1:e + 1] = True
+        # Sel yang tertutup merge dikosongkan, seperti hasil ws.merge_cells
+        df = df.assign(**{product_merge_col: df[product_merge_col].mask(merged_away)})
+
+    for col_idx in idr_col_indices:
+        ws.column_dimensions[get_column_letter(col_idx)].width = 20
+
+    write_frame(
+        ws, df,
+        fills=class_fills[row_class],
+        fonts=class_fonts[row_class],
+        number_formats={col_idx - 1: rupiah_format for col_idx in idr_col_indices},
+    )
+
+    for rng in merge_ranges:
+        ws.merged_cells.add(rng)
+
+    dv = DataValidation(type="list", formula1='"Total,~"', allow_blank=True)
+    ws.data_validations.append(dv)
+    if n_rows + 1 > 2:
+        dv.add(f"{last_col_letter}2:{last_col_letter}{n_rows}")
+
+    out = io.BytesIO()
+    wb.save(out)
+    out.seek(0)
+    return out
+
+@profiled("parse")
+def read_analitik_file(data: bytes, name: str) -> pd.DataFrame:
+    # .xlsx/.xls atau .csv, semua sel sebagai object; nama kolom dirapikan
+    if name.lower().endswith((".xlsx", ".xls")): df_raw = pd.read_excel(io.BytesIO(data), dtype=object)
+    else: df_raw = pd.read_csv(io.BytesIO(data), dtype=object)
+    return normalize_cols(df_raw)
+
+NUMERIC_COLS_GUESS = [
+    "Pengunjung Produk (Kunjungan)", "Halaman Produk Dilihat", "Pengunjung Melihat Tanpa Membeli",
+    "Klik Pencarian", "Suka", "Pengunjung Produk (Menambahkan Produk ke Keranjang)",
+    "Dimasukkan ke Keranjang (Produk)", "Total Pembeli (Pesanan Dibuat)", "Produk (Pesanan Dibuat)",
+    "Total Penjualan (Pesanan Dibuat) (IDR)", "Total Pembeli (Pesanan Siap Dikirim)",
+    "Produk (Pesanan Siap Dikirim)", "Penjualan (Pesanan Siap Dikirim) (IDR)"
+]
+RATE_COLS_CONFIG = {
+    "Tingkat Pengunjung Melihat Tanpa Membeli": ("Pengunjung Melihat Tanpa Membeli", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi Produk Dimasukkan ke Keranjang": ("Pengunjung Produk (Menambahkan Produk ke Keranjang)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan yang Dibuat)": ("Total Pembeli (Pesanan Dibuat)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan Siap Dikirim)": ("Total Pembeli (Pesanan Siap Dikirim)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan Siap Dikirim dibagi Pesanan Dibuat)": ("Total Pembeli (Pesanan Siap Dikirim)", "Total Pembeli (Pesanan Dibuat)")
+}
+# Kolom kunci pengelompokan per mode, dihitung sekali di prepare_variasi_base
+MODE_KEY_COLS = {"warna": "__BaseWarna", "ukuran": "__BaseUkuran"}
+# Normalisasi sekali (copy, buang Kode Variasi, parsing angka, urutan produk) untuk kedua mode
+@profiled("transform")
+def prepare_variasi_base(df_input):
+    df = drop_kode_variasi_cols(df_input.copy())
+    if "Kode Produk" not in df.columns or "Nama Variasi" not in df.columns:
+        return None
+
+    df["__BaseWarna"] = df["Nama Variasi"].apply(extract_variation_base)
+    df["__BaseUkuran"] = df["Nama Variasi"].apply(extract_size)
+
+    agg_numeric = {}
+    for c in df.columns:
+        if c in NUMERIC_COLS_GUESS:
+            df[c] = parse_numeric(df[c], decimal=",", percent="strip").fillna(0)
+            agg_numeric[c] = "sum"
+
+    # Urutan produk = urutan kemunculan pertama; Kode Produk kosong tidak pernah ikut hasil.
+    kp_codes, kp_uniques = pd.factorize(df["Kode Produk"])
+    valid = kp_codes >= 0
+    valid_pos = pd.Series(np.arange(int(valid.sum()))).groupby(kp_codes[valid], sort=True).first()
+    first_rows = df[valid].iloc[valid_pos.to_numpy()].set_axis(valid_pos.index)
+    return {
+        "df": df, "agg_numeric": agg_numeric, "kp_codes": kp_codes,
+        "kp_uniques": kp_uniques, "valid": valid, "first_rows": first_rows,
+    }
+
+@profiled("transform")
+def process_dataframe(base, mode="warna"):
+    if base is None:
+        return None, None, None, "File harus berisi kolom 'Kode Produk' dan 'Nama Variasi'."
+
+    df = base["df"]
+    agg_numeric = base["agg_numeric"]
+    kp_codes, kp_uniques = base["kp_codes"], base["kp_uniques"]
+    valid, first_rows = base["valid"], base["first_rows"]
+
+    # --- LOGIKA PENENTU PENGELOMPOKAN ---
+    variation_base = df[MODE_KEY_COLS[mode]].rename("NamaVariasiBase")
+    total_mask = variation_base.fillna("").eq("")
+    variation_mask = ~total_mask
+    # ------------------------------------
+
+    other_keep = ["SKU Induk", "Produk"] + list(RATE_COLS_CONFIG.keys())
+    agg_other = {c: "first" for c in other_keep if c in df.columns}
+
+    group_keys = ["Kode Produk", variation_base[variation_mask]]
+    if variation_mask.any():
+        grouped = df[variation_mask].groupby(group_keys, dropna=False, as_index=False).agg({**agg_numeric, **agg_other})
+        grouped = grouped.rename(columns={"NamaVariasiBase": "Nama Variasi"})
+    else:
+        grouped = pd.DataFrame(columns=["Kode Produk", "Nama Variasi"] + list(agg_numeric.keys()) + list(agg_other.keys()))
+
+    # --- BARIS TOTAL PER PRODUK (satu kali groupby, tanpa loop per produk) ---
+    is_total = total_mask.to_numpy() & valid
+    numeric_keys = list(agg_numeric.keys())
+    other_present = [c for c in df.columns if c in other_keep]
+
+    # Produk yang punya baris total asli: ambil baris total pertama + jumlahkan semua baris totalnya
+    # (posisi baris total pertama per kode, diindeks kode: urutan baris total tidak harus urut kode)
+    tot_codes = kp_codes[is_total]
+    first_pos = pd.Series(np.arange(len(tot_codes))).groupby(tot_codes, sort=True).first()
+    from_total = df[is_total].iloc[first_pos.to_numpy()][other_present].set_axis(first_pos.index)
+    from_total[numeric_keys] = df.loc[is_total, numeric_keys].astype(float).groupby(tot_codes, sort=True).sum()
+
+    # Produk tanpa baris total: jumlah dari baris variasinya, atribut dari baris pertama produk tsb
+    var_codes = kp_uniques.get_indexer(grouped["Kode Produk"]) if len(grouped) else np.array([], dtype=int)
+    var_sums = grouped.loc[var_codes >= 0, numeric_keys].groupby(var_codes[var_codes >= 0], sort=True).sum()
+    var_sums = var_sums.loc[~var_sums.index.isin(from_total.index)]
+    from_vars = var_sums.copy()
+    for c in other_keep:
+        from_vars[c] = first_rows[c].reindex(var_sums.index) if c in first_rows.columns else None
+
+    tot_cols = ["Kode Produk"] + other_present + numeric_keys + ["Nama Variasi"]
+    if len(from_vars):
+        if len(from_total) and from_total.index.min() < from_vars.index.min():
+            tot_cols += [c for c in other_keep if c not in tot_cols]
+        else:
+            tot_cols = ["Kode Produk", "Nama Variasi"] + numeric_keys + other_keep
+    totals_df = pd.concat([from_total, from_vars]).sort_index()
+    totals_df["Kode Produk"] = kp_uniques.take(totals_df.index).astype(object)
+    totals_df["Nama Variasi"] = ""
+    totals_df = totals_df.reindex(columns=tot_cols)
+
+    # --- URUTAN AKHIR: total (urut penjualan) lalu variasinya (urut penjualan) ---
+    sort_col_induk = "Penjualan (Pesanan Siap Dikirim) (IDR)"
+    if sort_col_induk in totals_df.columns:
+        totals_df[sort_col_induk] = pd.to_numeric(totals_df[sort_col_induk], errors="coerce").fillna(0)
+        totals_df = totals_df.sort_values(by=sort_col_induk, ascending=False, kind="stable")
+    product_rank = pd.Series(np.arange(len(totals_df)), index=totals_df.index)
+
+    var_rows = grouped[var_codes >= 0] if len(grouped) else grouped
+    var_rank = product_rank.reindex(var_codes[var_codes >= 0]).to_numpy() if len(grouped) else np.array([])
+    var_rows = var_rows.assign(__rank=var_rank, __sub=1)
+    var_rows = var_rows[var_rows["__rank"].notna()]
+    if sort_col_induk in var_rows.columns:
+        var_rows[sort_col_induk] = pd.to_numeric(var_rows[sort_col_induk], errors="coerce").fillna(0)
+        var_rows = var_rows.sort_values(by=sort_col_induk, ascending=False, kind="stable")
+
+    df_final = pd.concat([totals_df.assign(__rank=product_rank, __sub=0), var_rows], ignore_index=True)
+    df_final = df_final.sort_values(by=["__rank", "__sub"], kind="stable").drop(columns=["__rank", "__sub"])
+    df_final = df_final.reset_index(drop=True).infer_objects().fillna("")
+
+    for rate_col, (num_col, den_col) in RATE_COLS_CONFIG.items():
+        if num_col in df_final.columns and den_col in df_final.columns:
+            num = pd.to_numeric(df_final[num_col], errors="coerce")
+            den = pd.to_numeric(df_final[den_col], errors="coerce")
+            ratio = (num / den.where(den != 0)).fillna(0.0)
+            df_final[rate_col] = ratio.map(format_percentage)
+
+    df_final["Nama Variasi"] = df_final["Nama Variasi"].replace({"": "-"})
+
+    final_cols = []
+    for c in df.columns:
+        if c == "Nama Variasi": continue 
+        if c in df_final.columns:
+            final_cols.append(c)
+            if c == "Produk": final_cols.append("Nama Variasi")
+
+    if "Nama Variasi" not in final_cols:
+        if "Kode Produk" in final_cols:
+            idx = final_cols.index("Kode Produk") + 1
+            final_cols.insert(idx, "Nama Variasi")
+        else:
+            final_cols.insert(0, "Nama Variasi")
+
+    for c in df_final.columns:
+        if c not in final_cols and not c.startswith("__"): final_cols.append(c)
+
+    if "Tipe Baris" in final_cols: final_cols.remove("Tipe Baris")
+
+    nama_variasi = df_final["Nama Variasi"]
+    df_final["Tipe Baris"] = np.where(nama_variasi.eq("-") | nama_variasi.astype(str).str.strip().eq(""), "Total", "~")
+    final_cols.append("Tipe Baris")
+    df_final = df_final[final_cols]
+
+    total_rows_only = df_final[df_final["Tipe Baris"] == "Total"]
+    grand_total_data = {}
+    for c in final_cols:
+        if c == "Kode Produk": grand_total_data[c] = "Total"
+        elif c in NUMERIC_COLS_GUESS: grand_total_data[c] = pd.to_numeric(total_rows_only[c], errors="coerce").fillna(0).sum()
+        else: grand_total_data[c] = "-"
+
+    df_final = pd.concat([df_final, pd.DataFrame([grand_total_data])], ignore_index=True)
+
+    excel_b = to_excel_bytes_with_styling(df_final, product_merge_col="Kode Produk", total_mask=df_final["Tipe Baris"].eq("Total"))
+
+    c_buf = io.BytesIO()
+    c_buf.write(df_final.to_csv(index=False).encode("utf-8"))
+    c_buf.seek(0)
+
+    return df_final, excel_b, c_buf, None
+
+@profiled("transform")
+def process_variasi_modes(df_raw: pd.DataFrame, modes=("warna", "ukuran")) -> dict:
+    """Proses semua mode sekaligus: {mode: (df_final, excel BytesIO, csv BytesIO, pesan error atau None)}."""
+    base_variasi = prepare_variasi_base(df_raw)
+    # Semua mode hanya membaca base_variasi, jadi aman dijalankan paralel; context disalin per thread
+    # agar tahapnya ikut terekam bila profil aktif (lihat processing/profiling.py)
+    with ThreadPoolExecutor(max_workers=len(modes)) as pool:
+        futures = {
+            mode: pool.submit(contextvars.copy_context().run, process_dataframe, base_variasi, mode) for mode in modes
+        }
+        return {mode: future.result() for mode, future in futures.items()}
+
+# -----------------------------
+# SHOPEE ADS: CSV IKLAN -> EXCEL BERWARNA
+# -----------------------------
+
+CSV_HEADER_KEYS = [b"Nama Iklan", b"Nama Iklan/Produk"]
+CSV_HEADER_SCAN_LINES = 30
+# Akhir baris: \r\n, \n, atau \r saja (CSV yang disimpan ulang di Mac/Excel lama)
+_CSV_LINE_END_RE = re.compile(rb"\r\n?|\n")
+
+@profiled("parse")
+def load_uploaded_csv_bytes(file_bytes: bytes) -> pd.DataFrame:
+    if file_bytes is None:
+        raise ValueError("No file bytes provided")
+
+    # Cari baris header langsung di bytes (tanpa decode/splitlines seluruh file)
+    header_start = header_end = None
+    pos = 0
+    for _ in range(CSV_HEADER_SCAN_LINES):
+        if pos >= len(file_bytes): break
+        line_end = _CSV_LINE_END_RE.search(file_bytes, pos)
+        end = line_end.start() if line_end else len(file_bytes)
+        if any(k in file_bytes[pos:end] for k in CSV_HEADER_KEYS):
+            header_start, header_end = pos, end
+            break
+        pos = line_end.end() if line_end else len(file_bytes)
+    if header_start is None:
+        raise ValueError("Header Nama Iklan tidak ditemukan")
+
+    header_line = file_bytes[header_start:header_end]
+    delimiter = ";" if header_line.count(b";") > header_line.count(b",") else ","
+
+    # BytesIO berbagi buffer dengan file_bytes; parser C membaca mulai dari offset header
+    buffer = io.BytesIO(file_bytes)
+    buffer.seek(header_start)
+    df = pd.read_csv(
+        buffer, sep=delimiter, engine="c", on_bad_lines="skip",
+        encoding="utf-8-sig", encoding_errors="ignore", float_precision="round_trip",
+    )
+    df.columns = df.columns.str.strip()
+    return df
+
+def normalize_nama_iklan_column(df: pd.DataFrame) -> pd.DataFrame:
+    for col in ["Nama Iklan", "Nama Iklan/Produk"]:
+        if col in df.columns:
+            return df.rename(columns={col: "Nama Iklan"})
+    raise ValueError("Kolom Nama Iklan tidak ditemukan")
+
+@profiled("transform")
+def build_ads_report(df: pd.DataFrame, csv_mode: str = SHOPEE_ADS_MODES[0], include_merah=True,
+                     include_kuning=True, include_hijau=True, include_biru=True) -> bytes:
+    """CSV iklan (hasil load_uploaded_csv_bytes) -> Excel laporan: DATA_IKLAN berwarna, RINGKASAN_IKLAN,
+    >10K_TANPA_KONVERSI & SALES_0_BIAYA. Filter include_* hanya berlaku untuk RINGKASAN_IKLAN.
+    """
+    df = normalize_nama_iklan_column(df)
+
+    df["IS_AGGREGATE"] = df["Nama Iklan"].astype(str).str.lower().str.match(r'^\s*grup\b')
+
+    for col in ["Efektifitas Iklan", "Produk Terjual", "Penjualan Langsung (GMV Langsung)", "Biaya"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df["IS_HIJAU_TIPE_A"] = (df.get("Biaya").notna() & (df.get("Biaya") == 0) & (df.get("Produk Terjual") > 0))
+    df["IS_BIRU"] = ((df.get("Produk Terjual", 0) > 0) & (df.get("Penjualan Langsung (GMV Langsung)", 0) == 0))
+    df["Nama Ringkasan"] = df["Nama Iklan"].where(df["IS_AGGREGATE"], shorten_many(df["Nama Iklan"]))
+    df["Kategori"] = kpi_row_labels(df, SHOPEE_KATEGORI_RULES[csv_mode])
+
+    if csv_mode == "CSV Grup Iklan (hanya iklan produk)":
+        df_agg = df[df["IS_AGGREGATE"]].copy()
+        df_non_agg = df[~df["IS_AGGREGATE"]].copy()
+        df = pd.concat([df_non_agg, df_agg], ignore_index=True)
+
+        urutan_col = None
+        for c in df.columns:
+            if str(c).strip().lower() in ["urutan", "no", "no."]:
+                urutan_col = c
+                break
+
+        if urutan_col:
+            new_vals = list(range(1, len(df_non_agg) + 1)) + [""] * len(df_agg)
+            df[urutan_col] = new_vals
+
+    if csv_mode == "CSV Grup Iklan (hanya iklan produk)":
+        df_nonagg = df[~df["IS_AGGREGATE"]].copy()
+    else:
+        df_nonagg = df.copy()
+
+    df_nonagg = df_nonagg[~df_nonagg["IS_HIJAU_TIPE_A"]].copy()
+
+    # Urutan ringkasan: per baris, kategori warna dulu lalu BIRU (bila ada)
+    pos = np.arange(len(df_nonagg))
+    kat = df_nonagg["Kategori"].to_numpy(dtype=object)
+    has_kat = pd.notna(kat)
+    is_biru = df_nonagg["IS_BIRU"].to_numpy(dtype=bool)
+    nama_ringkasan = df_nonagg["Nama Ringkasan"].to_numpy(dtype=object)
+    order = np.argsort(np.concatenate([pos[has_kat] * 2, pos[is_biru] * 2 + 1]), kind="stable")
+    ordered_for_numbering = [
+        {"nama": nama, "kategori": kategori}
+        for nama, kategori in zip(
+            np.concatenate([nama_ringkasan[has_kat], nama_ringkasan[is_biru]])[order],
+            np.concatenate([kat[has_kat], np.full(is_biru.sum(), "BIRU", dtype=object)])[order],
+        )
+    ]
+
+    per_col = {"MERAH": [], "KUNING": [], "HIJAU": [], "BIRU": []}
+    if csv_mode != "CSV Keseluruhan (Normal)":
+        for kat in ["MERAH", "KUNING", "HIJAU"]:
+            names = df_nonagg[df_nonagg["Kategori"] == kat]["Nama Ringkasan"].tolist()
+            names = list(dict.fromkeys(names)) 
+            per_col[kat] = [f"{n}," for n in names]
+
+        names_biru = df_nonagg[df_nonagg["IS_BIRU"]]["Nama Ringkasan"].tolist()
+        names_biru = list(dict.fromkeys(names_biru))
+        per_col["BIRU"] = [f"{n}," for n in names_biru]
+
+    tanpa_konversi_df = (
+        df_nonagg[(df_nonagg.get("Produk Terjual", 0) == 0) & (df_nonagg.get("Biaya", 0) >= 10000)]
+        [["Nama Ringkasan", "Biaya"]]
+        .rename(columns={"Nama Ringkasan": "Nama Iklan"})
+        .sort_values("Biaya", ascending=False)
+    )
+
+    hijau_cols = ["Nama Ringkasan", "Produk Terjual", "Efektifitas Iklan", "Biaya"]
+    available_cols = [c for c in hijau_cols if c in df.columns]
+    hijau_tipe_a_df = df[(df.get("Biaya").notna()) & (df.get("Biaya") == 0) & (df.get("Produk Terjual", 0) > 0)][available_cols].copy()
+    if "Nama Ringkasan" in hijau_tipe_a_df.columns:
+        hijau_tipe_a_df = hijau_tipe_a_df.rename(columns={"Nama Ringkasan": "Nama Iklan"})
+
+    filtered_per_col = {"MERAH": [], "KUNING": [], "HIJAU": [], "BIRU": []}
+    if include_merah: filtered_per_col["MERAH"] = per_col["MERAH"]
+    if include_kuning: filtered_per_col["KUNING"] = per_col["KUNING"]
+    if include_hijau: filtered_per_col["HIJAU"] = per_col["HIJAU"]
+    if include_biru: filtered_per_col["BIRU"] = per_col["BIRU"]
+
+    # EXPORT
+    wb = streaming_workbook()
+    ws_data = wb.create_sheet("DATA_IKLAN")
+    data_fills = data_fonts = None
+    try:
+        data_fills, data_fonts = css_matrix_to_xlsx(kpi_style_matrix(df, SHOPEE_IKLAN_STYLE_RULES))
+    except Exception:
+        data_fills = data_fonts = None
+    write_frame(ws_data, df, fills=data_fills, fonts=data_fonts)
+
+    ws_ring = wb.create_sheet("RINGKASAN_IKLAN")
+    bold_font = Font(bold=True)
+    wrap_top = Alignment(wrap_text=True, vertical="top")
+
+    if csv_mode == "CSV Keseluruhan (Normal)":
+        ws_ring.column_dimensions["A"].width = 60
+        ws_ring.append([xlsx_cell(ws_ring, "DAFTAR IKLAN (URUT)", font=bold_font)])
+
+        semua_nama = []
+        for item in ordered_for_numbering:
+            kat = item["kategori"]
+            if (kat == "MERAH" and include_merah) or \
+               (kat == "KUNING" and include_kuning) or \
+               (kat == "HIJAU" and include_hijau) or \
+               (kat == "BIRU" and include_biru):
+                semua_nama.append(item["nama"])
+
+        semua_nama = list(dict.fromkeys(semua_nama))
+
+        if semua_nama:
+            text_gabungan = "\n".join([f"{i+1}. {nama}" for i, nama in enumerate(semua_nama)])
+            ws_ring.append([xlsx_cell(ws_ring, text_gabungan, font=Font(color="000000"), alignment=wrap_top)])
+
+    else:
+        headers = ["MERAH", "KUNING", "HIJAU", "BIRU"]
+        color_fonts = {"MERAH": Font(color="FF0000"), "KUNING": Font(color="000000"), "HIJAU": Font(color="00AA00"), "BIRU": Font(color="0066CC")}
+
+        for i in range(1, 5):
+            col_letter = get_column_letter(i)
+            ws_ring.column_dimensions[col_letter].width = 40
+
+        ws_ring.append([xlsx_cell(ws_ring, h, font=bold_font) for h in headers])
+
+        ring_row = []
+        for key in headers:
+            items = filtered_per_col.get(key, [])
+            if items:
+                joined = " ".join(items)
+                if not joined.strip().endswith(","): joined = joined + ","
+                ring_row.append(xlsx_cell(ws_ring, joined, font=color_fonts[key], alignment=wrap_top))
+            else:
+                ring_row.append("")
+        ws_ring.append(ring_row)
+
+    ws_tc = wb.create_sheet(">10K_TANPA_KONVERSI")
+    write_frame(ws_tc, tanpa_konversi_df, fonts=np.full(tanpa_konversi_df.shape, Font(color="FF0000"), dtype=object))
+
+    ws_hi = wb.create_sheet("SALES_0_BIAYA")
+    write_frame(ws_hi, hijau_tipe_a_df, fonts=np.full(hijau_tipe_a_df.shape, Font(color="006400"), dtype=object))
+
+    return workbook_bytes(wb)
+
+# -----------------------------
+# UTM LINK CLEANER
+# -----------------------------
+
+_SHOPEE_PRODUCT_ID_RE = re.compile(r'-i\.(\d+)\.(\d+)')
+
+def clean_shopee_link(url: str):
+    # Pola -i.[ShopID].[ItemID] -> link produk pendek; None jika tidak ditemukan
+    match = _SHOPEE_PRODUCT_ID_RE.search(url)
+    if not match: return None
+    shop_id, item_id = match.group(1), match.group(2)
+    return f"https://shopee.co.id/product/{shop_id}/{item_id}"
@@ -0,0 +1,87 @@
+# processing/shortener.py
+# Penyingkat nama iklan / produk.
+# Blacklist & pola regex dibuat sekali saat import; hasil di-memo per nama mentah karena
+# nama iklan yang sama berulang di banyak baris & ekspor harian. Modul ini diimpor sekali per
+# proses (bukan dieksekusi ulang tiap rerun seperti app.py), jadi lru_cache biasa cukup.
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+SHORT_NAME_FEATURE_BLACKLIST = frozenset({"gamis", "busui","friendly","bahan","soft","ultimate","ultimates","motif","size","ukuran","promo","diskon","broad","testing","rayon","katun","cotton","silk","sustra","viscose","linen","polyester","jersey","crepe","chiffon","woolpeach","baloteli","babyterry","pink","hitam","black","putih","white","navy","biru","blue","merah","red","hijau","green","coklat","brown","abu","abu-abu","grey","gray","cream","krem","beige","maroon","ungu","purple","tosca","olive","sage", "sale", "couple"})
+SHORT_NAME_STORE_BLACKLIST = frozenset({"official","shop","store","boutique","fashion","my","zahir","myzahir","by","original","premium"})
+SHORT_NAME_CONTEXT_BLACKLIST = frozenset({"terbaru","new","update","launch","launching","viral","hits","best","seller","bestseller","kondangan","ramadhan","ramadan","harian","pesta","formal","casual","trend","trending","populer","2024","2025","2026","2027", "2028", "2029", "2030"})
+SHORT_NAME_BLACKLIST = SHORT_NAME_FEATURE_BLACKLIST | SHORT_NAME_STORE_BLACKLIST | SHORT_NAME_CONTEXT_BLACKLIST
+SHORT_NAME_PRODUCT_KEYWORDS = frozenset({"dress", "set", "reject", "lebaran", "tunik", "abaya", "blouse", "khimar", "rok", "pashmina", "hijab", "outer"})
+
+_SHORT_NAME_BRACKET_RE = re.compile(r"\[.*?\]")
+_SHORT_NAME_PART_RE = re.compile(r"\s*[-|,/]\s*")
+_SHORT_NAME_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+SHORT_NAME_CACHE_SIZE = 65536
+
+def _short_nama_iklan_uncached(text, max_words):
+    text = text.strip()
+    if text.lower().startswith("grup"): return text.split(" - ")[0]
+    text = _SHORT_NAME_BRACKET_RE.sub("", text).strip()
+
+    # Tiap kata dibersihkan sekali: (kata asli, kata kecil alfanumerik)
+    def tokens(words):
+        return [(w, _SHORT_NAME_NON_ALNUM_RE.sub("", w.lower())) for w in words]
+
+    def has_keyword(cand):
+        return any(clean in SHORT_NAME_PRODUCT_KEYWORDS for _, clean in cand)
+
+    candidates = []
+    for part in _SHORT_NAME_PART_RE.split(text):
+        valid_words = [(w, clean) for w, clean in tokens(part.split()) if clean and clean not in SHORT_NAME_BLACKLIST]
+        if valid_words: candidates.append(valid_words)
+
+    best_candidate = []
+    for cand in candidates:
+        if len(cand) >= 2 and has_keyword(cand):
+            best_candidate = cand
+
+    if not best_candidate:
+        best_candidate = next((cand for cand in candidates if has_keyword(cand)), [])
+    if not best_candidate:
+        best_candidate = next((cand for cand in candidates if len(cand) >= 2), [])
+    if not best_candidate and candidates: best_candidate = candidates[0]
+    if not best_candidate: best_candidate = tokens(text.split())
+
+    if len(best_candidate) > max_words:
+        kw_idx = next((i for i, (_, clean) in enumerate(best_candidate) if clean in SHORT_NAME_PRODUCT_KEYWORDS), -1)
+        if kw_idx != -1:
+            start_idx = max(0, kw_idx - max_words + 1)
+            if start_idx + max_words > len(best_candidate):
+                start_idx = max(0, len(best_candidate) - max_words)
+            best_candidate = best_candidate[start_idx : start_idx + max_words]
+        else:
+            best_candidate = best_candidate[:max_words]
+
+    return " ".join(w for w, _ in best_candidate).title()
+
+_short_nama_iklan_text = lru_cache(maxsize=SHORT_NAME_CACHE_SIZE)(_short_nama_iklan_uncached)
+
+def short_nama_iklan(nama, max_words=2):
+    if pd.isna(nama): return nama
+    return _short_nama_iklan_text(str(nama), max_words)
+
+def shorten_many(names, max_words=2):
+    # Versi batch: hanya nama unik yang disingkat, hasilnya disebar balik ke semua baris
+    names = names if isinstance(names, pd.Series) else pd.Series(names)
+    codes, uniques = pd.factorize(names)
+    shortened = np.array([short_nama_iklan(u, max_words) for u in uniques] + [np.nan], dtype=object)
+    return pd.Series(shortened[codes], index=names.index, name=names.name)
+
+def short_name_cache_stats():
+    # Isi & hit rate cache penyingkat (untuk memantau apakah SHORT_NAME_CACHE_SIZE cukup)
+    info = _short_nama_iklan_text.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "size": info.currsize, "maxsize": info.maxsize, "hits": info.hits, "misses": info.misses,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
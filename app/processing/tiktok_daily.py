@@ -0,0 +1,219 @@
+# processing/tiktok_daily.py
+# Parsing file harian TikTok (tanggal di A1, header baris 3) & ingest banyak file sekaligus,
+# plus tabel & Excel perbandingan harian dari ringkasan di daily_store.
+# Fungsi di sini murni (bytes masuk, DataFrame keluar) dan ada di level modul agar bisa
+# dijalankan di process pool; penyimpanan ke store tetap dilakukan oleh pemanggil.
+
+import io
+from datetime import datetime, date
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.chart import LineChart, Reference
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import PatternFill
+from openpyxl.utils import get_column_letter
+from pandas.io.formats.style import Styler
+
+from processing.excel_io import read_sheet_rows, rows_to_frame
+from processing.numbers import parse_numeric
+from processing.profiling import profiled
+from processing.xlsx import streaming_workbook, workbook_bytes, write_frame
+
+
+ALLOWED_METRICS = [
+    "ID", "Produk", "Status", "GMV", "Produk terjual", "Pesanan", "GMV tab Toko",
+    "Impresi daftar produk tab Toko", "Rasio klik-tayang shop tab", "GMV dari LIVE",
+    "Impresi dari LIVE", "Rasio klik-tayang dari LIVE", "GMV dari video",
+    "Impresi dari video", "Rasio klik-tayang dari video", "Impresi dari kartu produk",
+    "Tayangan halaman dari kartu produk", "Tayangan halaman unik dari kartu produk",
+    "Pembeli unik dari kartu produk", "Rasio klik-tayang dari kartu produk",
+    "Persentase konversi dari kartu produk",
+]
+PERCENT_NAME_KEYWORDS = ["rasio", "rasio klik", "persentase", "konversi", "ctr", "ratio"]
+TEXT_COLUMNS = ("ID", "Produk", "Status")
+
+ERROR_DATE = "Gagal ekstrak tanggal dari file"
+ERROR_TABLE = "Gagal baca data tabel"
+
+def date_from_a1(raw) -> date:
+    try:
+        if isinstance(raw, datetime): return raw.date()
+        if isinstance(raw, date): return raw
+        if isinstance(raw, (int, float)):
+            try: return datetime.fromordinal(datetime(1900, 1, 1).toordinal() + int(raw) - 2).date()
+            except Exception: return raw
+        if isinstance(raw, str):
+            for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y", "%Y/%m/%d"):
+                try: return datetime.strptime(raw.strip(), fmt).date()
+                except Exception: pass
+            return raw.strip()
+        return raw
+    except Exception:
+        return None
+
+@profiled("parse")
+def read_daily_upload(data: bytes):
+    """Buka workbook sekali (read-only): tanggal dari A1 + tabel dengan header di baris 3.
+
+    Hanya kolom ALLOWED_METRICS yang ikut diparse; hasil tabel sama dengan pd.read_excel(header=2).
+    Return (tanggal atau None, DataFrame; kosong jika gagal dibaca).
+    """
+    try:
+        wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True, keep_links=False)
+    except Exception:
+        return None, pd.DataFrame()
+    try:
+        ws = wb.worksheets[0]
+        rows = read_sheet_rows(ws)
+        raw_a1 = rows[0][0] if rows and rows[0] and rows[0][0] != "" else None
+        if wb.active is not None and wb.active.title != ws.title: raw_a1 = wb.active["A1"].value
+        date_val = date_from_a1(raw_a1)
+        if len(rows) < 3: return date_val, pd.DataFrame()
+        # Kolom pertama per nama metrik (duplikat setelah strip diabaikan, seperti reindex sebelumnya)
+        keep, seen = [], set()
+        for pos, name in enumerate(rows[2]):
+            name = str(name).strip()
+            if name in ALLOWED_METRICS and name not in seen:
+                keep.append(pos); seen.add(name)
+        if not keep: return date_val, pd.DataFrame()
+        return date_val, rows_to_frame([[r[i] for i in keep] for r in rows[2:]])
+    except Exception:
+        return None, pd.DataFrame()
+    finally:
+        wb.close()
+
+@profiled("transform")
+def normalize_and_filter_df(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [str(c).strip() for c in df.columns]
+    df = df.reindex(columns=[c for c in ALLOWED_METRICS if c in df.columns])
+    for s in TEXT_COLUMNS:
+        if s in df.columns: df[s] = df[s].astype(str)
+    for col in df.columns:
+        if col in TEXT_COLUMNS: continue
+        is_percent = any(k in col.lower() for k in PERCENT_NAME_KEYWORDS)
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]) or is_percent:
+            df[col] = parse_numeric(df[col], numbers_as_percent=is_percent)
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+def ingest_daily_file(name: str, data: bytes) -> dict:
+    # Satu file -> {"name", "date", "df", "error"}; error berisi pesan untuk UI, None jika berhasil
+    date_val, df_raw = read_daily_upload(data)
+    if not date_val: return {"name": name, "date": None, "df": None, "error": ERROR_DATE}
+    if df_raw.empty: return {"name": name, "date": date_val, "df": None, "error": ERROR_TABLE}
+    return {"name": name, "date": date_val, "df": normalize_and_filter_df(df_raw), "error": None}
+
+def sort_daily_results(results: list) -> list:
+    # Urut tanggal laporan, file gagal di akhir; urutan upload dipertahankan untuk tanggal yang sama
+    return sorted(results, key=lambda r: (r["error"] is not None, str(r["date"])))
+
+@profiled("parse")
+def ingest_daily_files(files: list, executor=None) -> list:
+    """Parse banyak file harian [(nama, bytes), ...]; dengan executor tiap file dikerjakan di proses terpisah.
+
+    Return satu hasil per file (lihat ingest_daily_file) + "index" = posisi di input, diurutkan
+    menurut tanggal laporan; file yang gagal di urutan terakhir. Kegagalan satu file (termasuk
+    worker yang mati) hanya menjadi error file itu, file lain tetap diproses.
+    """
+    if executor is None or len(files) < 2:
+        results = [ingest_daily_file(name, data) for name, data in files]
+    else:
+        futures = [executor.submit(ingest_daily_file, name, data) for name, data in files]
+        results = []
+        for (name, _), future in zip(files, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"name": name, "date": None, "df": None, "error": f"{ERROR_TABLE} ({type(e).__name__})"})
+    for i, result in enumerate(results): result["index"] = i
+    return sort_daily_results(results)
+
+# -----------------------------
+# PERBANDINGAN HARIAN (dari daily_totals & daily_product_totals)
+# -----------------------------
+
+def daily_numeric_metrics(totals: pd.DataFrame) -> list:
+    # Metrik yang punya nilai di rentang ini, dalam urutan ALLOWED_METRICS
+    return [c for c in ALLOWED_METRICS if c not in TEXT_COLUMNS and c in totals.columns and totals[c].notna().any()]
+
+def daily_compare_filename(valid_dates: list) -> str:
+    if not valid_dates: return "dailycompare_report.xlsx"
+    return f"dailycompare_{valid_dates[0].strftime('%Y%m%d')}_to_{valid_dates[-1].strftime('%Y%m%d')}.xlsx"
+
+@profiled("transform")
+def build_daily_aggregate(totals: pd.DataFrame, numeric_metrics: list) -> pd.DataFrame:
+    # Total per tanggal sudah dihitung saat file disimpan (daily_totals), tinggal disusun
+    if totals.empty: return pd.DataFrame()
+    agg = totals[numeric_metrics].set_axis(pd.to_datetime(totals["report_date"]).dt.date.to_numpy())
+    return agg.sort_index()
+
+@profiled("style")
+def style_daily_aggregate(df: pd.DataFrame) -> Styler:
+    if df.empty: return df
+    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    # Naik = hijau, turun = merah, sama = putih, tanpa pembanding (NaN) = polos; sekali jalan untuk seluruh frame
+    diffs = df[numeric_cols].diff().to_numpy(dtype=float)
+    styles = pd.DataFrame('', index=df.index, columns=df.columns)
+    styles[numeric_cols] = np.where(
+        diffs > 0, 'background-color: #b6f2c2',
+        np.where(diffs < 0, 'background-color: #f5b7b1', np.where(diffs == 0, 'background-color: white', '')),
+    )
+
+    def fmt(x, col=None):
+        if pd.isna(x): return ""
+        if col and any(k in col.lower() for k in PERCENT_NAME_KEYWORDS):
+            try: return f"{x:.2%}"
+            except Exception: return x
+        else:
+            try: return f"{int(x):,}" if float(x).is_integer() else f"{x:,.2f}"
+            except Exception: return x
+
+    return df.style.format({c: (lambda v, col=c: fmt(v, col)) for c in df.columns}).apply(lambda _: styles, axis=None)
+
+@profiled("write")
+def build_product_sheets(product_totals: pd.DataFrame, numeric_metrics: list, progress=None) -> bytes:
+    # Dari total per (produk, tanggal) di store, tanpa menggabungkan ulang baris mentah.
+    # progress (opsional) diisi {"done", "total"} per produk agar bisa dipantau dari job latar.
+    if product_totals.empty: return None
+    concat = product_totals.assign(date=pd.to_datetime(product_totals["report_date"]))
+
+    green_fill = PatternFill(start_color="B6F2C2", end_color="B6F2C2", fill_type="solid")
+    red_fill = PatternFill(start_color="F5B7B1", end_color="F5B7B1", fill_type="solid")
+    # Format angka per posisi kolom: tanggal di kolom A, persen/angka sesuai nama metrik
+    number_formats = {0: 'yyyy-mm-dd'}
+    for pos, col_name in enumerate(numeric_metrics, start=1):
+        number_formats[pos] = '0.00%' if any(k in col_name.lower() for k in PERCENT_NAME_KEYWORDS) else '#,##0'
+
+    wb = streaming_workbook()
+    product_groups = concat.groupby('produk')
+    if progress is not None: progress["total"] = product_groups.ngroups
+    for product_name, grp in product_groups:
+        row = grp.groupby('date')[numeric_metrics].sum().reset_index().sort_values('date')
+        safe_sheet_name = str(product_name)[:31] if product_name else 'Unknown'
+        ws = wb.create_sheet(safe_sheet_name)
+        ws.column_dimensions['A'].width = 15
+        write_frame(ws, row, number_formats=number_formats)
+
+        max_row, max_column = len(row) + 1, row.shape[1]
+        for col_idx in range(2, max_column + 1):
+            col_letter = get_column_letter(col_idx)
+            if max_row >= 3:
+                cf_range = f"{col_letter}3:{col_letter}{max_row}"
+                ws.conditional_formatting.add(cf_range, FormulaRule(formula=[f"{col_letter}3>{col_letter}2"], fill=green_fill))
+                ws.conditional_formatting.add(cf_range, FormulaRule(formula=[f"{col_letter}3<{col_letter}2"], fill=red_fill))
+
+        if max_row >= 2:
+            start_chart_row, chart_idx = max_row + 3, 0
+            for col_idx in range(2, max_column + 1):
+                chart = LineChart()
+                chart.title = str(row.columns[col_idx - 1])
+                chart.style, chart.width, chart.height, chart.legend = 13, 16, 8, None
+                chart.add_data(Reference(ws, min_col=col_idx, min_row=1, max_row=max_row), titles_from_data=True)
+                chart.set_categories(Reference(ws, min_col=1, min_row=2, max_row=max_row))
+                ws.add_chart(chart, f"{'A' if chart_idx % 2 == 0 else 'I'}{start_chart_row + (chart_idx // 2) * 16}")
+                chart_idx += 1
+        if progress is not None: progress["done"] += 1
+
+    return workbook_bytes(wb)
@@ -0,0 +1,161 @@
+# processing/tiktok_fixer.py
+# Excel Fixer TikTok: kolom ID diamankan sebagai teks & angka berkoma desimal diubah ke titik.
+# Export: hanya fixer, atau fixer + pewarnaan ROI (aturan tiktok_roi_rules).
+
+import io
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+
+from processing.excel_io import read_sheet_rows, rows_to_frame
+from processing.kpi import kpi_style_matrix, tiktok_roi_rules
+from processing.numbers import parse_numeric
+from processing.profiling import profiled
+from processing.xlsx import css_matrix_to_xlsx, streaming_workbook, workbook_bytes, write_frame
+
+TIKTOK_PERCENT_COLS = [
+    'Tingkat klik iklan produk', 'Rasio konversi iklan', 'Rasio tayang video iklan 2 detik',
+    'Rasio tayang video iklan 6 detik', 'Rasio tayang video iklan 25%', 'Rasio tayang video iklan 50%',
+    'Rasio tayang video iklan 75%', 'Rasio tayang video iklan 100%'
+]
+BONUS_KEYWORDS = ["bonus", "komisi", "tunjangan", "insentif", "incentive"]
+
+def find_id_column(columns):
+    # Kolom pertama yang namanya mengandung "id" (mis. "ID Campaign")
+    return next((c for c in columns if "id" in str(c).lower()), None)
+
+@profiled("transform")
+def fix_decimal_commas(df: pd.DataFrame, skip=()) -> pd.DataFrame:
+    """Kolom teks: koma -> titik. Kolom yang seluruh isinya lalu terbaca angka menjadi numerik,
+    selain itu tetap teks (dengan titik). Semua kolom diparse sekaligus dalam satu array.
+    """
+    cols = [c for c in df.columns if c not in skip and (df[c].dtype == object or pd.api.types.is_string_dtype(df[c]))]
+    if not cols or df.empty: return df
+    flat = df[cols].to_numpy(dtype=object).ravel(order="F")  # per kolom berurutan
+    present = pd.notna(flat)
+    text = pd.Series(flat[present], dtype=object).astype(str).str.replace(",", ".", regex=False)
+    numbers = np.full(len(flat), np.nan)
+    numbers[present] = pd.to_numeric(text, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    fixed = flat.copy()
+    fixed[present] = text.to_numpy(dtype=object)
+
+    n_rows = len(df)
+    convertible = (~present | ~np.isnan(numbers)).reshape(len(cols), n_rows).all(axis=1)
+    df = df.copy()
+    for i, c in enumerate(cols):
+        part = slice(i * n_rows, (i + 1) * n_rows)
+        if not convertible[i]:
+            df[c] = pd.Series(fixed[part], index=df.index, dtype=df[c].dtype)
+        elif present[part].all() and np.all(numbers[part] == np.trunc(numbers[part])):
+            # Bilangan bulat diparse ulang dari teks agar dtype sama dengan to_numeric (int64 tetap presisi)
+            df[c] = pd.to_numeric(pd.Series(fixed[part], index=df.index))
+        else:
+            df[c] = numbers[part]
+    return df
+
+@profiled("parse")
+def read_fixer_workbook(data: bytes, sheet_name=0):
+    """Baca sheet sekali (read-only): kolom "id" dideteksi dari baris header lalu diparse sebagai teks.
+
+    Return (DataFrame yang sudah dirapikan fix_decimal_commas, nama kolom id atau None).
+    """
+    wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        rows = read_sheet_rows(ws)
+    finally:
+        wb.close()
+    if not rows: return pd.DataFrame(), None
+    target_col = find_id_column(rows_to_frame(rows[:1]).columns)
+    df = rows_to_frame(rows, dtype={target_col: str} if target_col is not None else None)
+    return fix_decimal_commas(df, skip=(target_col,)), target_col
+
+def find_column(df, keywords):
+    kws = [k.lower() for k in keywords]
+    for col in df.columns:
+        low = str(col).lower()
+        if any(kw in low for kw in kws):
+            return col
+    return None
+
+def roi_columns(df: pd.DataFrame) -> dict:
+    # Kolom biaya/pendapatan/ROI/status dicari per kata kunci; "missing" = kolom wajib yang tidak ada
+    cols = {
+        "biaya": find_column(df, ["biaya", "cost"]),
+        "pendapatan_kotor": find_column(df, ["pendapatan kotor", "pendapatan_kotor", "pendapatan", "gmv", "revenue"]),
+        "pendapatan_bruto": find_column(df, ["pendapatan bruto", "penghasilan bruto", "penghasilan_bruto", "bruto", "gross", "gross revenue"]),
+        "roi": find_column(df, ["roi"]),
+        "status": find_column(df, ["status"]),
+    }
+    cols["missing"] = [m for m, cond in zip(["Biaya", "Pendapatan", "ROI"], [cols["biaya"], cols["pendapatan_kotor"] or cols["pendapatan_bruto"], cols["roi"]]) if not cond]
+    return cols
+
+@profiled("transform")
+def build_roi_workbook(df_hasil: pd.DataFrame):
+    """Fixer + pewarnaan ROI: sheet DATA_COLORED (baris biaya, pendapatan & ROI nol dibuang) dan DATA_ASLI.
+
+    Return (bytes xlsx, DataFrame DATA_COLORED). ValueError jika kolom Biaya/Pendapatan/ROI tidak ada.
+    """
+    cols = roi_columns(df_hasil)
+    if cols["missing"]: raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(cols['missing'])}")
+    col_biaya, col_roi, col_status = cols["biaya"], cols["roi"], cols["status"]
+    col_pendapatan_kotor, col_pendapatan_bruto = cols["pendapatan_kotor"], cols["pendapatan_bruto"]
+
+    col_pendapatan_effective = None
+    pendapatan_computed_name = "__pendapatan_bruto_computed"
+    bruto_was_computed = False
+
+    if col_pendapatan_bruto:
+        col_pendapatan_effective = col_pendapatan_bruto
+    elif col_pendapatan_kotor:
+        if any(any(k in str(c).lower() for k in BONUS_KEYWORDS) for c in df_hasil.columns):
+            col_pendapatan_effective = pendapatan_computed_name
+            bruto_was_computed = True
+        else:
+            col_pendapatan_effective = col_pendapatan_kotor
+
+    biaya_num = parse_numeric(df_hasil[col_biaya])
+    pendapatan_for_deletion = parse_numeric(df_hasil[col_pendapatan_kotor if col_pendapatan_kotor else col_pendapatan_bruto])
+    roi_num = parse_numeric(df_hasil[col_roi])
+
+    delete_mask = (biaya_num == 0) & (pendapatan_for_deletion == 0) & (roi_num == 0)
+    df_colored = df_hasil.loc[~delete_mask].copy()
+
+    pct_present = [c for c in TIKTOK_PERCENT_COLS if c in df_colored.columns]
+    for c in pct_present: df_colored[c] = parse_numeric(df_colored[c])
+
+    if bruto_was_computed:
+        base = parse_numeric(df_colored[col_pendapatan_kotor]).fillna(0)
+        extras = pd.Series(0.0, index=df_colored.index)
+        for bcol in [c for c in df_colored.columns if any(k in str(c).lower() for k in BONUS_KEYWORDS)]:
+            extras += parse_numeric(df_colored[bcol]).fillna(0)
+        df_colored[pendapatan_computed_name] = base + extras
+        col_pendapatan_effective = pendapatan_computed_name
+
+    if col_pendapatan_effective is None: col_pendapatan_effective = col_pendapatan_kotor or col_pendapatan_bruto
+
+    roi_rules = tiktok_roi_rules(col_biaya, col_pendapatan_effective, col_roi, col_status)
+    roi_fills, _ = css_matrix_to_xlsx(kpi_style_matrix(df_colored, roi_rules, parser="percent"))
+
+    wb = streaming_workbook()
+    write_frame(
+        wb.create_sheet("DATA_COLORED"), df_colored,
+        fills=roi_fills,
+        number_formats={df_colored.columns.get_loc(c): '0.00%' for c in pct_present},
+    )
+    write_frame(wb.create_sheet("DATA_ASLI"), df_hasil)
+    return workbook_bytes(wb), df_colored
+
+@profiled("write")
+def build_fixer_workbook(df_hasil: pd.DataFrame) -> bytes:
+    # Hanya fixer: satu sheet, lebar kolom mengikuti isi terpanjang
+    wb = streaming_workbook()
+    worksheet = wb.create_sheet("Sheet1")
+    try:
+        for i, col in enumerate(df_hasil.columns, 1):
+            worksheet.column_dimensions[get_column_letter(i)].width = max(df_hasil[col].astype(str).map(len).max(), len(str(col))) + 2
+    except Exception: pass
+    write_frame(worksheet, df_hasil)
+    return workbook_bytes(wb)
@@ -0,0 +1,110 @@
+# processing/xlsx.py
+# Streaming XLSX writer (dipakai semua exporter).
+# Workbook write-only menulis baris langsung ke file sementara, jadi memori tidak membengkak
+# seiring jumlah baris. Lebar kolom harus di-set sebelum baris pertama; merge (ws.merged_cells),
+# data validation (ws.data_validations), conditional format dan chart dipasang sebelum save.
+
+import io
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Font
+
+from processing.profiling import profiled
+
+
+XLSX_CHUNK_ROWS = 5000
+
+def streaming_workbook() -> Workbook:
+    return Workbook(write_only=True)
+
+def xlsx_cell(ws, value=None, fill=None, font=None, number_format=None, alignment=None):
+    # Style lewat atribut publik sel; objek style dipakai bersama oleh banyak sel (dibuat sekali oleh pemanggil).
+    # Sel tanggal tanpa number_format tetap memakai format tanggal bawaan openpyxl.
+    cell = WriteOnlyCell(ws, value=value)
+    if fill is not None: cell.fill = fill
+    if font is not None: cell.font = font
+    if number_format is not None: cell.number_format = number_format
+    if alignment is not None: cell.alignment = alignment
+    return cell
+
+# Warna CSS bernama yang dipakai highlighter Styler di app ini
+CSS_NAMED_COLORS = {"red": "FF0000", "yellow": "FFFF00", "lightgreen": "90EE90", "lightblue": "ADD8E6", "white": "FFFFFF"}
+
+@lru_cache(maxsize=256)
+def css_to_xlsx_style(css):
+    # "background-color: x; color: y" (keluaran fungsi highlight Styler) -> (fill, font) openpyxl
+    fill = font = None
+    for decl in str(css).split(";"):
+        if ":" not in decl: continue
+        prop, val = (p.strip().lower() for p in decl.split(":", 1))
+        color = CSS_NAMED_COLORS.get(val, val.lstrip("#").upper())
+        if prop == "background-color": fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+        elif prop == "color": font = Font(color=color)
+    return fill, font
+
+@profiled("write")
+def write_frame(ws, df, header=True, fills=None, fonts=None, alignments=None, number_formats=None):
+    """Tulis DataFrame ke worksheet write-only per potongan XLSX_CHUNK_ROWS baris.
+
+    fills/fonts/alignments: array 2D (baris x kolom) berisi objek style atau None.
+    number_formats: {posisi kolom: format}, hanya dipasang pada sel angka/tanggal;
+    atau array 2D format per sel (None = tanpa format).
+    Pada mode dict, kolom datetime tanpa format memakai format bawaan pandas.to_excel.
+    """
+    cell_formats = None
+    if number_formats is not None and not isinstance(number_formats, dict):
+        cell_formats, number_formats = number_formats, {}
+    number_formats = dict(number_formats or {})
+    for c, dtype in enumerate(df.dtypes):
+        if cell_formats is None and c not in number_formats and pd.api.types.is_datetime64_any_dtype(dtype):
+            number_formats[c] = "YYYY-MM-DD HH:MM:SS"
+    if header:
+        ws.append(list(df.columns))
+    for start in range(0, len(df), XLSX_CHUNK_ROWS):
+        chunk = df.iloc[start:start + XLSX_CHUNK_ROWS]
+        rows = slice(start, start + len(chunk))
+        values = chunk.astype(object).where(chunk.notna(), None).to_numpy()
+
+        fmts = np.full(values.shape, None, dtype=object) if cell_formats is None else np.array(cell_formats[rows], dtype=object)
+        for c, fmt in number_formats.items():
+            fmts[[v is not None and not isinstance(v, str) for v in values[:, c]], c] = fmt
+        styled = pd.notna(fmts)
+        for arr in (fills, fonts, alignments):
+            if arr is not None: styled |= pd.notna(arr[rows])
+        chunk_fills = fills[rows] if fills is not None else None
+        chunk_fonts = fonts[rows] if fonts is not None else None
+        chunk_aligns = alignments[rows] if alignments is not None else None
+
+        for r, row_vals in enumerate(values):
+            row = row_vals.tolist()
+            for c in np.flatnonzero(styled[r]):
+                row[c] = xlsx_cell(
+                    ws, row[c],
+                    fill=chunk_fills[r, c] if chunk_fills is not None else None,
+                    font=chunk_fonts[r, c] if chunk_fonts is not None else None,
+                    number_format=fmts[r, c],
+                    alignment=chunk_aligns[r, c] if chunk_aligns is not None else None,
+                )
+            ws.append(row)
+
+@profiled("style")
+def css_matrix_to_xlsx(css):
+    # Tiap kombinasi CSS diterjemahkan sekali, lalu disebar ke seluruh matriks (baris x kolom)
+    css = np.asarray(css, dtype=object).astype(str)
+    uniq_css, inverse = np.unique(css, return_inverse=True)
+    fill_lut = np.empty(len(uniq_css), dtype=object)
+    font_lut = np.empty(len(uniq_css), dtype=object)
+    for i, c in enumerate(uniq_css):
+        fill_lut[i], font_lut[i] = css_to_xlsx_style(c)
+    inverse = inverse.reshape(css.shape)
+    return fill_lut[inverse], font_lut[inverse]
+
+@profiled("write")
+def workbook_bytes(wb) -> bytes:
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
@@ -0,0 +1,8 @@
+# tests/conftest.py
+# Tes dijalankan dari folder app/ (python -m pytest); folder app/ dimasukkan ke sys.path agar modulnya
+# bisa diimpor juga saat pytest dipanggil langsung.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
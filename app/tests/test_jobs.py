@@ -0,0 +1,77 @@
+# tests/test_jobs.py
+# Store job (processing/jobs.py) tanpa dispatcher: pemakaian ulang job dengan kunci sama (juga saat diajukan
+# bersamaan), job selesai yang folder hasilnya sudah terhapus, dan job berjalan milik dispatcher yang berhenti.
+
+import os
+import pickle
+import shutil
+import time
+from contextlib import closing
+
+from processing import jobs
+from processing.jobs import find_job, job_file, job_result, job_status, jobs_connect, submit_job
+
+# -----------------------------
+# HELPER
+# -----------------------------
+
+def _finish_job(root: str, job_id: str):
+    # Tulis hasil seperti worker, lalu tandai selesai seperti dispatcher
+    job_dir = os.path.join(root, job_id)
+    with open(os.path.join(job_dir, "file_excel"), "wb") as f:
+        f.write(b"xlsx")
+    result = {"files": {"excel": "out.xlsx"}, "previews": {}, "warnings": [], "error": None, "profile": None, "cached": False}
+    with open(os.path.join(job_dir, "result.pkl"), "wb") as f:
+        pickle.dump(result, f)
+    with closing(jobs_connect(root)) as conn, conn:
+        conn.execute("UPDATE jobs SET status = 'done' WHERE id = ?", (job_id,))
+
+def _submit(tmp_path, owner: str = "sesi-a") -> str:
+    return submit_job("meta-excel", (None, None, "out.xlsx", "cpas"), key="k1", owner=owner,
+                      root=str(tmp_path / "jobs"), artifact_root=str(tmp_path / "art"))
+
+# -----------------------------
+# TES
+# -----------------------------
+
+def test_same_key_reuses_queued_job(tmp_path):
+    assert _submit(tmp_path, "sesi-a") == _submit(tmp_path, "sesi-b")
+
+def test_done_job_reused_while_result_exists(tmp_path):
+    root = str(tmp_path / "jobs")
+    job_id = _submit(tmp_path)
+    _finish_job(root, job_id)
+    assert find_job("k1", "sesi-a", root) == job_id
+    assert job_status(job_id, root)["has_result"]
+    assert job_file(job_id, "excel", root) == b"xlsx"
+
+def test_done_job_without_folder_is_not_reused(tmp_path):
+    root = str(tmp_path / "jobs")
+    job_id = _submit(tmp_path)
+    _finish_job(root, job_id)
+    shutil.rmtree(os.path.join(root, job_id))
+    assert not job_status(job_id, root)["has_result"]
+    assert job_result(job_id, root) is None
+    assert job_file(job_id, "excel", root) is None
+    assert find_job("k1", "sesi-a", root) is None
+    assert _submit(tmp_path) != job_id
+
+def test_submit_rechecks_key_inside_transaction(tmp_path, monkeypatch):
+    # Pengajuan kedua yang lolos cek pertama (seolah bersamaan) tetap mendapat job yang sama
+    first = _submit(tmp_path)
+    monkeypatch.setattr(jobs, "find_job", lambda *args, **kwargs: None)
+    assert _submit(tmp_path, "sesi-b") == first
+    root = str(tmp_path / "jobs")
+    with closing(jobs_connect(root)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 1
+    assert [name for name in os.listdir(root) if not name.startswith("jobs.sqlite")] == [first]
+
+def test_requeue_only_jobs_of_stopped_dispatchers(tmp_path):
+    root = str(tmp_path / "jobs")
+    with closing(jobs_connect(root)) as conn, conn:
+        jobs._heartbeat(conn, "hidup")
+        conn.execute("INSERT INTO runners (id, seen) VALUES ('mati', ?)", (time.time() - jobs.RUNNER_STALE - 1,))
+        for job_id, runner in (("a", "hidup"), ("b", "mati"), ("c", None)):
+            conn.execute("INSERT INTO jobs (id, kind, status, created, runner) VALUES (?, 'meta-excel', 'running', 0, ?)", (job_id, runner))
+        assert jobs._requeue_orphans(conn) == 2
+    assert [job_status(job_id, root)["status"] for job_id in "abc"] == ["running", "queued", "queued"]
@@ -0,0 +1,171 @@
+# tests/test_numbers.py
+# parse_numeric dibandingkan dengan tiga parser lama yang digantikannya (disalin dari app.py sebelum
+# penggantian): clean_idr_number (Shopee variasi), series_to_numeric_like (TikTok & aturan KPI "percent")
+# dan try_parse (TikTok harian). Perbedaan yang disengaja diuji terpisah dengan nilai barunya.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from processing.numbers import parse_numeric
+
+# -----------------------------
+# PARSER LAMA (referensi)
+# -----------------------------
+
+def old_clean_idr_number(x):
+    if isinstance(x, str):
+        x = x.strip()
+        if not x or x == '-': return 0.0
+        x = x.replace('%', '')
+        if ',' in x: x = x.replace('.', '').replace(',', '.')
+        else: x = x.replace('.', '')
+        return x
+    return x
+
+def old_shopee(col: pd.Series) -> pd.Series:
+    return pd.to_numeric(col.apply(old_clean_idr_number), errors="coerce").fillna(0)
+
+def new_shopee(col: pd.Series) -> pd.Series:
+    return parse_numeric(col, decimal=",", percent="strip").fillna(0)
+
+def old_series_to_numeric_like(df_col):
+    s_orig = df_col.astype(str).fillna("").str.strip()
+    had_pct = s_orig.str.contains("%")
+    s = s_orig.copy()
+    has_paren = s.str.startswith("(") & s.str.endswith(")")
+    s = s.mask(has_paren, "-" + s.str[1:-1])
+    s = s.str.replace("%", "", regex=False).str.replace(",", "", regex=False).str.replace(" ", "", regex=False).replace("", np.nan)
+    numeric = pd.to_numeric(s, errors="coerce")
+    numeric = numeric.where(~had_pct, numeric / 100.0)
+    return numeric
+
+def old_daily(col: pd.Series, is_percent: bool) -> pd.Series:
+    def try_parse(x):
+        if pd.isna(x): return None
+        if isinstance(x, str):
+            v = x.strip().replace(',', '')
+            if v.endswith('%'):
+                try: return float(v.rstrip('%')) / 100.0
+                except Exception: return None
+            try: return float(v)
+            except Exception: return None
+        if isinstance(x, (int, float)):
+            if is_percent and x > 1: return float(x) / 100.0
+            return float(x)
+        return None
+    return pd.to_numeric(col.apply(try_parse), errors="coerce")
+
+def new_daily(col: pd.Series, is_percent: bool) -> pd.Series:
+    return pd.to_numeric(parse_numeric(col, numbers_as_percent=is_percent), errors="coerce")
+
+def _col(values) -> pd.Series:
+    return pd.Series(values, dtype=object)
+
+# -----------------------------
+# SAMA DENGAN PARSER LAMA (nilai & dtype)
+# -----------------------------
+
+SHOPEE_SAME = [
+    ["1.234", "1.234,5", "12,5%", "0", "1.000.000", " 7 "],
+    ["", "-", "abc", "5"],
+    [12, 3.5, None, "2,25"],
+    ["10", "20", "30"],
+]
+
+TIKTOK_SAME = [
+    ["1,234.5", "12.5%", "(1,000)", "(5%)", "1 000", "3"],
+    ["", "-", "abc", "0.5%"],
+    ["1", "2", "3"],
+    ["100%", "50%"],
+    [2.5, "4", None],
+]
+
+DAILY_SAME = [
+    (["12.5%", "1,234", "45", "", "-", None, "x"], False),
+    (["12.5%", "1,234", "45", "", "-", None, "x"], True),
+    ([45, 0.5, 1, 2.0, "3%"], True),
+    ([45, 0.5, 1, 2.0, "3%"], False),
+]
+
+@pytest.mark.parametrize("values", SHOPEE_SAME)
+def test_shopee_matches_clean_idr_number(values):
+    pd.testing.assert_series_equal(new_shopee(_col(values)), old_shopee(_col(values)))
+
+@pytest.mark.parametrize("values", TIKTOK_SAME)
+def test_tiktok_kpi_matches_series_to_numeric_like(values):
+    pd.testing.assert_series_equal(parse_numeric(_col(values)), old_series_to_numeric_like(_col(values)))
+
+@pytest.mark.parametrize("values, is_percent", DAILY_SAME)
+def test_daily_matches_try_parse(values, is_percent):
+    pd.testing.assert_series_equal(new_daily(_col(values), is_percent), old_daily(_col(values), is_percent))
+
+# -----------------------------
+# PERBEDAAN YANG DISENGAJA
+# -----------------------------
+
+@pytest.mark.parametrize("parse, text, old, new", [
+    # Negatif dalam kurung: dulu 0 (Shopee) / NaN (harian)
+    (lambda c: new_shopee(c), "(1.000)", 0.0, -1000.0),
+    (lambda c: new_daily(c, False), "(1,000)", np.nan, -1000.0),
+    (lambda c: new_daily(c, False), "(5%)", np.nan, -0.05),
+    # Spasi di dalam angka diabaikan
+    (lambda c: new_daily(c, False), " 1 000 ", np.nan, 1000.0),
+    # Pemisah "_" tidak lagi diterima (float("1_000") dulu lolos)
+    (lambda c: new_daily(c, False), "1_000", 1000.0, np.nan),
+])
+def test_intended_differences(parse, text, old, new):
+    result = parse(_col([text])).iloc[0]
+    assert result == pytest.approx(new, nan_ok=True)
+
+def test_intended_differences_old_values():
+    # Nilai lama di tabel test_intended_differences memang keluaran parser lama
+    assert old_shopee(_col(["(1.000)"])).iloc[0] == 0.0
+    assert np.isnan(old_daily(_col(["(1,000)"]), False).iloc[0])
+    assert np.isnan(old_daily(_col(["(5%)"]), False).iloc[0])
+    assert np.isnan(old_daily(_col([" 1 000 "]), False).iloc[0])
+    assert old_daily(_col(["1_000"]), False).iloc[0] == 1000.0
+
+def test_numpy_scalars_in_object_column_are_kept():
+    # Dulu np.int64 di kolom object bukan int Python -> None (np.float64 turunan float, jadi tetap terbaca)
+    col = _col([np.int64(5), np.float64(2.5)])
+    assert old_daily(col, False).isna().tolist() == [True, False]
+    assert new_daily(col, False).tolist() == [5.0, 2.5]
+
+def test_daily_integer_text_keeps_int64():
+    # try_parse selalu menghasilkan float; sekarang teks bilangan bulat tetap int64 seperti kolom angka asli
+    col = _col(["1", "2"])
+    assert old_daily(col, False).dtype == np.float64
+    assert new_daily(col, False).dtype == np.int64
+    assert new_daily(col, False).tolist() == old_daily(col, False).tolist()
+
+# -----------------------------
+# NUMBERS_AS_PERCENT & DTYPE
+# -----------------------------
+
+def test_numbers_as_percent_scales_only_numbers_above_one():
+    col = _col([45, 0.5, 1, 150, "45", "45%"])
+    assert parse_numeric(col, numbers_as_percent=True).tolist() == pytest.approx([0.45, 0.5, 1.0, 1.5, 45.0, 0.45])
+    numeric = pd.Series([45, 1, 0], dtype="int64")
+    result = parse_numeric(numeric, numbers_as_percent=True)
+    assert result.dtype == np.float64 and result.tolist() == [0.45, 1.0, 0.0]
+
+@pytest.mark.parametrize("values, kwargs, dtype", [
+    (["1", "2", "3"], {}, np.int64),
+    (["1.000", "2.000"], {"decimal": ","}, np.int64),
+    ([1, 2, "3"], {}, np.int64),
+    (["1", "2.5"], {}, np.float64),
+    (["1", None], {}, np.float64),
+    (["1", "x"], {}, np.float64),
+    (["50%", "20%"], {}, np.float64),
+    (["50%", "20%"], {"percent": "strip"}, np.int64),
+    ([1, 2], {"numbers_as_percent": True}, np.float64),
+])
+def test_dtype_follows_to_numeric(values, kwargs, dtype):
+    assert parse_numeric(_col(values), **kwargs).dtype == dtype
+
+def test_dtype_matches_to_numeric_on_clean_text():
+    for values in (["1", "2"], ["1", "2.5"], ["-3", "4"]):
+        assert parse_numeric(_col(values)).dtype == pd.to_numeric(_col(values)).dtype
+    numeric = pd.Series([1, 2], dtype="int64")
+    assert parse_numeric(numeric).dtype == np.int64
@@ -0,0 +1,205 @@
+# tests/test_shopee.py
+# Analitik Produk: process_dataframe (versi vektor) dibandingkan dengan implementasi lama berbasis loop
+# per produk (disalin dari app.py sebelum vektorisasi) pada input sintetis yang baris produknya acak.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.generators import SHOPEE_ADS_COLUMNS, shopee_ads_csv
+from processing.shopee import load_uploaded_csv_bytes, prepare_variasi_base, process_dataframe
+
+SALES_COL = "Penjualan (Pesanan Siap Dikirim) (IDR)"
+
+# -----------------------------
+# IMPLEMENTASI LAMA (referensi)
+# -----------------------------
+
+NUMERIC_COLS_GUESS = [
+    "Pengunjung Produk (Kunjungan)", "Halaman Produk Dilihat", "Pengunjung Melihat Tanpa Membeli",
+    "Klik Pencarian", "Suka", "Pengunjung Produk (Menambahkan Produk ke Keranjang)",
+    "Dimasukkan ke Keranjang (Produk)", "Total Pembeli (Pesanan Dibuat)", "Produk (Pesanan Dibuat)",
+    "Total Penjualan (Pesanan Dibuat) (IDR)", "Total Pembeli (Pesanan Siap Dikirim)",
+    "Produk (Pesanan Siap Dikirim)", "Penjualan (Pesanan Siap Dikirim) (IDR)"
+]
+RATE_COLS_CONFIG = {
+    "Tingkat Pengunjung Melihat Tanpa Membeli": ("Pengunjung Melihat Tanpa Membeli", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi Produk Dimasukkan ke Keranjang": ("Pengunjung Produk (Menambahkan Produk ke Keranjang)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan yang Dibuat)": ("Total Pembeli (Pesanan Dibuat)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan Siap Dikirim)": ("Total Pembeli (Pesanan Siap Dikirim)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan Siap Dikirim dibagi Pesanan Dibuat)": ("Total Pembeli (Pesanan Siap Dikirim)", "Total Pembeli (Pesanan Dibuat)")
+}
+
+def drop_kode_variasi_cols(df):
+    cols_to_drop = [c for c in df.columns if c.strip().lower() == "kode variasi"]
+    return df.drop(columns=cols_to_drop, errors="ignore")
+
+def extract_variation_base(name):
+    if pd.isna(name): return ""
+    s = str(name).strip()
+    if s == "" or s == "-": return ""
+    return s.rsplit(",", 1)[0].strip() if "," in s else s
+
+def extract_size(val):
+    val_str = str(val)
+    if "," in val_str: return val_str.split(",")[-1].strip()
+    elif "-" in val_str: return val_str.split("-")[-1].strip()
+    return val_str.strip()
+
+def safe_div(a, b):
+    try:
+        a, b = float(a), float(b)
+        return 0.0 if b == 0 else a / b
+    except Exception: return 0.0
+
+def format_percentage(val):
+    return f"{val * 100:.2f}%".replace('.', ',')
+
+def _clean_idr_number(x):
+    if isinstance(x, str):
+        x = x.strip()
+        if not x or x == '-': return 0.0
+        x = x.replace('%', '')
+        if ',' in x: x = x.replace('.', '').replace(',', '.')
+        else: x = x.replace('.', '')
+        return x
+    return x
+
+def reference_process_dataframe(df_input, mode="warna"):
+    df = drop_kode_variasi_cols(df_input.copy())
+    df["NamaVariasiBase"] = df["Nama Variasi"].apply(extract_variation_base if mode == "warna" else extract_size)
+    df["__is_total_row"] = df["NamaVariasiBase"].fillna("").apply(lambda s: s == "")
+
+    product_order = []
+    for kp in df["Kode Produk"]:
+        if kp not in product_order: product_order.append(kp)
+
+    variation_mask = ~df["__is_total_row"]
+    agg_numeric = {}
+    for c in df.columns:
+        if c in NUMERIC_COLS_GUESS:
+            df[c] = pd.to_numeric(df[c].apply(_clean_idr_number), errors="coerce").fillna(0)
+            agg_numeric[c] = "sum"
+
+    other_keep = ["SKU Induk", "Produk"] + list(RATE_COLS_CONFIG.keys())
+    agg_other = {c: "first" for c in other_keep if c in df.columns}
+    grouped = df[variation_mask].groupby(["Kode Produk", "NamaVariasiBase"], dropna=False, as_index=False).agg({**agg_numeric, **agg_other})
+    grouped = grouped.rename(columns={"NamaVariasiBase": "Nama Variasi"})
+
+    totals = []
+    for kp in product_order:
+        totals_rows = df[(df["Kode Produk"] == kp) & (df["__is_total_row"])]
+        if not totals_rows.empty:
+            tot = {"Kode Produk": kp}
+            for c in df.columns:
+                if c in other_keep: tot[c] = totals_rows.iloc[0].get(c)
+            for c in agg_numeric: tot[c] = totals_rows[c].astype(float).sum()
+            tot["Nama Variasi"] = ""
+        else:
+            gi = grouped[grouped["Kode Produk"] == kp]
+            tot = {"Kode Produk": kp, "Nama Variasi": ""}
+            for c in agg_numeric: tot[c] = gi[c].sum()
+            for c in other_keep: tot[c] = df[df["Kode Produk"] == kp].iloc[0].get(c)
+        totals.append(pd.Series(tot))
+
+    totals_df = pd.DataFrame(totals).reset_index(drop=True)
+    totals_df[SALES_COL] = pd.to_numeric(totals_df[SALES_COL], errors="coerce").fillna(0)
+    totals_df = totals_df.sort_values(by=SALES_COL, ascending=False)
+
+    final_rows = []
+    for kp in totals_df["Kode Produk"]:
+        final_rows.append(totals_df[totals_df["Kode Produk"] == kp].iloc[0].to_dict())
+        var_rows = grouped[grouped["Kode Produk"] == kp].sort_values(by=SALES_COL, ascending=False)
+        final_rows.extend(vr.to_dict() for _, vr in var_rows.iterrows())
+    df_final = pd.DataFrame(final_rows).fillna("")
+
+    for rate_col, (num_col, den_col) in RATE_COLS_CONFIG.items():
+        if num_col in df_final.columns and den_col in df_final.columns:
+            df_final[rate_col] = df_final.apply(lambda r: format_percentage(safe_div(r.get(num_col, 0), r.get(den_col, 0))), axis=1)
+    df_final["Nama Variasi"] = df_final["Nama Variasi"].replace({"": "-"})
+
+    final_cols = []
+    for c in df.columns:
+        if c == "Nama Variasi": continue
+        if c in df_final.columns:
+            final_cols.append(c)
+            if c == "Produk": final_cols.append("Nama Variasi")
+    for c in df_final.columns:
+        if c not in final_cols and not c.startswith("__"): final_cols.append(c)
+    df_final["Tipe Baris"] = df_final["Nama Variasi"].map(lambda nv: "Total" if nv == "-" or str(nv).strip() == "" else "~")
+    final_cols.append("Tipe Baris")
+    df_final = df_final[final_cols]
+
+    total_rows_only = df_final[df_final["Tipe Baris"] == "Total"]
+    grand_total = {}
+    for c in final_cols:
+        if c == "Kode Produk": grand_total[c] = "Total"
+        elif c in NUMERIC_COLS_GUESS: grand_total[c] = pd.to_numeric(total_rows_only[c], errors="coerce").fillna(0).sum()
+        else: grand_total[c] = "-"
+    return pd.concat([df_final, pd.DataFrame([grand_total])], ignore_index=True)
+
+# -----------------------------
+# INPUT SINTETIS
+# -----------------------------
+
+def synthetic_analitik(seed: int, products: int = 6) -> pd.DataFrame:
+    """Export Analitik Produk mini: tiap produk punya beberapa variasi "Warna,Ukuran", sebagian punya baris
+    total ("-"); urutan baris diacak sehingga baris satu produk tidak berdekatan."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for p in range(products):
+        code, name = f"KP{p:03d}", f"Produk {chr(65 + p)}"
+        variations = [f"{w},{u}" for w in rng.choice(["Hitam", "Putih", "Navy", "Merah"], 2, replace=False)
+                      for u in rng.choice(["S", "M", "L", "XL"], 2, replace=False)]
+        labels = variations + (["-"] if p % 3 != 2 else [])
+        for label in labels:
+            rows.append({
+                "Kode Produk": code, "Produk": f"{name} ({label})" if label != "-" else name,
+                "Nama Variasi": label, "Kode Variasi": f"{code}-{label}", "SKU Induk": f"SKU-{p}-{label}",
+                "Pengunjung Produk (Kunjungan)": str(rng.integers(1, 5000)),
+                "Pengunjung Melihat Tanpa Membeli": str(rng.integers(0, 500)),
+                "Total Pembeli (Pesanan Dibuat)": str(rng.integers(0, 300)),
+                "Total Pembeli (Pesanan Siap Dikirim)": str(rng.integers(0, 300)),
+                "Tingkat Konversi (Pesanan Siap Dikirim)": "1,00%",
+                SALES_COL: f"{rng.integers(1_000, 9_000_000):,}".replace(",", "."),
+            })
+    df = pd.DataFrame(rows, dtype=object)
+    return df.iloc[rng.permutation(len(df))].reset_index(drop=True)
+
+def _normalized(df: pd.DataFrame) -> pd.DataFrame:
+    # Angka dibandingkan sebagai float (dtype kolom bisa berbeda antar implementasi), sisanya sebagai teks
+    def cell(v):
+        if isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool): return float(v)
+        return str(v)
+    return df.reset_index(drop=True).map(cell)
+
+@pytest.mark.parametrize("mode", ["warna", "ukuran"])
+@pytest.mark.parametrize("seed", range(5))
+def test_process_dataframe_matches_loop_implementation(mode, seed):
+    df_raw = synthetic_analitik(seed)
+    df_new, _, _, error = process_dataframe(prepare_variasi_base(df_raw), mode)
+    assert error is None
+    pd.testing.assert_frame_equal(_normalized(df_new), _normalized(reference_process_dataframe(df_raw, mode)))
+
+def test_total_row_attributes_stay_with_their_product():
+    # Baris total pertama tidak urut kode: A (variasi), B (total), A (total)
+    df_raw = pd.DataFrame({
+        "Kode Produk": ["A", "B", "A"], "Produk": ["Gamis A", "Dress B", "Gamis A"],
+        "Nama Variasi": ["Hitam,S", "-", "-"], SALES_COL: ["10", "20", "30"],
+    }, dtype=object)
+    for mode in ("warna", "ukuran"):
+        df_new, _, _, _ = process_dataframe(prepare_variasi_base(df_raw), mode)
+        totals = df_new[(df_new["Tipe Baris"] == "Total") & (df_new["Kode Produk"] != "Total")]
+        assert dict(zip(totals["Kode Produk"], totals["Produk"])) == {"A": "Gamis A", "B": "Dress B"}
+
+# -----------------------------
+# CSV SHOPEE ADS
+# -----------------------------
+
+@pytest.mark.parametrize("line_end", [b"\r\n", b"\r"])
+def test_ads_csv_header_found_with_any_line_ending(line_end):
+    # Baris metadata sebelum header dilewati apa pun akhir barisnya (\n, \r\n, atau \r saja)
+    (_, data), = shopee_ads_csv(50)
+    expected = load_uploaded_csv_bytes(data)
+    assert expected.shape == (50, len(SHOPEE_ADS_COLUMNS))
+    pd.testing.assert_frame_equal(load_uploaded_csv_bytes(data.replace(b"\n", line_end)), expected)